@@ -370,6 +370,11 @@ class ConsciousnessIntelligenceModule(IntelligenceModule):
             logger.error(f"❌ Consciousness module initialization failed: {e}")
             return False
             
+    def is_cacheable(self, request: MIAPRequest) -> bool:
+        """Archetype activation, awareness updates and consciousness analysis change state, so they bypass the cache"""
+        action = request.input_data.get('action', 'status') if isinstance(request.input_data, dict) else 'status'
+        return action not in ('activate_archetype', 'update_awareness', 'consciousness_analysis')
+        
     async def process(self, request: MIAPRequest) -> MIAPResponse:
         """Process consciousness-related requests"""
         try:
@@ -14,9 +14,19 @@ Version: 1.0.0 - True Intelligence Genesis
 """
 
 import asyncio
+import copy
+import hashlib
+import heapq
+import json
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+import math
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Set, Tuple, Awaitable
+from dataclasses import dataclass, replace
+from datetime import date, datetime
 from pathlib import Path
 import sys
 
@@ -57,9 +67,11 @@ class MIAPRequest:
     module_target: str
     input_data: Any
     context: Dict[str, Any]
-    priority: int = 5
+    priority: int = 5  # Lower values are served first by MIAPScheduler
     timeout: float = 30.0
 
+DEFAULT_PRIORITY = MIAPRequest.priority
+
 @dataclass  
 class MIAPResponse:
     """Standardized response format from intelligence modules"""
@@ -70,12 +82,32 @@ class MIAPResponse:
     processing_time: float
     metadata: Dict[str, Any]
 
+def _has_ip(input_data: Any) -> bool:
+    return isinstance(input_data, dict) and bool(input_data.get('ip') or input_data.get('ip_address'))
+
+def _has_message(input_data: Any) -> bool:
+    if isinstance(input_data, dict):
+        return bool(input_data.get('message'))
+    return isinstance(input_data, str) and bool(input_data.strip())
+
+# Input predicates modules can declare; a module is only routed queries satisfying all of its predicates
+INPUT_PREDICATES: Dict[str, Callable[[Any], bool]] = {
+    "needs_ip": _has_ip,
+    "needs_message": _has_message,
+}
+
+def classify_query(input_data: Any) -> Set[str]:
+    """Cheap pre-classification: names of all input predicates the query satisfies"""
+    return {name for name, predicate in INPUT_PREDICATES.items() if predicate(input_data)}
+
 class IntelligenceModule:
     """Base class for all MIGI intelligence modules"""
     
-    def __init__(self, module_id: str, capabilities: List[str]):
+    def __init__(self, module_id: str, capabilities: List[str],
+                 input_predicates: Optional[List[str]] = None):
         self.module_id = module_id
         self.capabilities = capabilities
+        self.input_predicates = input_predicates or []
         self.active = False
         
     async def initialize(self) -> bool:
@@ -88,6 +120,10 @@ class IntelligenceModule:
         """Process intelligence request - override in subclasses"""
         raise NotImplementedError("Subclasses must implement process method")
         
+    async def process_batch(self, requests: List[MIAPRequest]) -> List[MIAPResponse]:
+        """Process several requests in one call - override for vectorized processing"""
+        return [await self.process(request) for request in requests]
+        
     async def shutdown(self) -> None:
         """Gracefully shutdown the module"""
         logger.info(f"🔌 Shutting down module: {self.module_id}")
@@ -97,14 +133,638 @@ class IntelligenceModule:
         """Return list of module capabilities"""
         return self.capabilities
         
+    def is_cacheable(self, request: MIAPRequest) -> bool:
+        """Whether a response to this request may be served from the response cache"""
+        return True
+        
+    def get_input_predicates(self) -> List[str]:
+        """Return input predicates a query must satisfy to be routed to this module"""
+        return self.input_predicates
+        
     def get_confidence(self) -> float:
         """Return current confidence level of module"""
         return 0.85  # Default confidence
 
+# ============================================================================
+# ⚙️ PROCESS OFFLOAD - CPU-bound Modules
+# ============================================================================
+
+WIRE_TAG = "__miap__"
+
+def _to_wire(value: Any) -> Any:
+    """Make a value JSON-native, tagging the types JSON would otherwise lose"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, list):
+        return [_to_wire(item) for item in value]
+    if isinstance(value, dict):
+        if WIRE_TAG not in value and all(isinstance(key, str) for key in value):
+            return {key: _to_wire(item) for key, item in value.items()}
+        return {WIRE_TAG: 'dict', 'items': [[_to_wire(key), _to_wire(item)] for key, item in value.items()]}
+    if isinstance(value, tuple):
+        return {WIRE_TAG: 'tuple', 'items': [_to_wire(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {WIRE_TAG: type(value).__name__, 'items': [_to_wire(item) for item in value]}
+    if isinstance(value, datetime):
+        return {WIRE_TAG: 'datetime', 'value': value.isoformat()}
+    if isinstance(value, date):
+        return {WIRE_TAG: 'date', 'value': value.isoformat()}
+    return str(value)
+
+def _from_wire(obj: Dict[str, Any]) -> Any:
+    """json object_hook reversing the tags of _to_wire"""
+    tag = obj.get(WIRE_TAG)
+    if tag is None:
+        return obj
+    if tag == 'dict':
+        return {key: item for key, item in obj['items']}
+    if tag == 'tuple':
+        return tuple(obj['items'])
+    if tag == 'set':
+        return set(obj['items'])
+    if tag == 'frozenset':
+        return frozenset(obj['items'])
+    if tag == 'datetime':
+        return datetime.fromisoformat(obj['value'])
+    return date.fromisoformat(obj['value'])
+
+def _encode_message(message: Dict[str, Any]) -> bytes:
+    """JSON wire format between the event loop and module worker processes"""
+    return json.dumps(_to_wire(message), separators=(',', ':')).encode('utf-8')
+
+def _decode_message(data: bytes) -> Dict[str, Any]:
+    return json.loads(data, object_hook=_from_wire)
+
+def _offloaded_module_worker(module: IntelligenceModule, conn) -> None:
+    """Worker process of a ProcessOffloadedModule: serves JSON-encoded requests until shutdown"""
+    loop = asyncio.new_event_loop()
+    try:
+        try:
+            ready = bool(loop.run_until_complete(module.initialize()))
+        except Exception as e:
+            conn.send_bytes(_encode_message({'id': 0, 'error': str(e)}))
+            return
+        conn.send_bytes(_encode_message({'id': 0, 'success': ready}))
+        if not ready:
+            return
+            
+        while True:
+            try:
+                message = _decode_message(conn.recv_bytes())
+            except EOFError:
+                break
+            if message['op'] == 'shutdown':
+                loop.run_until_complete(module.shutdown())
+                conn.send_bytes(_encode_message({'id': message['id'], 'responses': []}))
+                break
+                
+            requests = [MIAPRequest(**request) for request in message['requests']]
+            try:
+                if message['op'] == 'batch':
+                    responses = loop.run_until_complete(module.process_batch(requests))
+                else:
+                    responses = [loop.run_until_complete(module.process(requests[0]))]
+                reply = {'id': message['id'], 'responses': [vars(response) for response in responses]}
+            except Exception as e:
+                reply = {'id': message['id'], 'error': str(e)}
+            conn.send_bytes(_encode_message(reply))
+    finally:
+        loop.close()
+        conn.close()
+
+class ProcessOffloadedModule(IntelligenceModule):
+    """
+    Runs a CPU-bound module in a dedicated worker process, so its processing never
+    blocks the event loop.
+
+    The wrapped module is handed to the worker once at start-up and initialized
+    there. Requests and responses then cross the process boundary as JSON over a
+    multiprocessing Pipe (no pickling). Tuples, sets, datetimes, dates and dicts
+    with non-string keys are tagged and restored on the other side; any other
+    non-JSON value (e.g. a dataclass instance) arrives as its ``str()``, so
+    offloaded modules should return JSON-native output plus those types.
+    The worker serves one call at a time; when a caller times out the worker
+    still finishes the request, and its response is discarded.
+    """
+    
+    def __init__(self, module: IntelligenceModule, mp_context: Optional[str] = None,
+                 join_timeout: float = 5.0):
+        super().__init__(module.module_id, module.get_capabilities(), module.get_input_predicates())
+        self.module = module
+        self.mp_context = multiprocessing.get_context(mp_context)
+        self.join_timeout = join_timeout
+        self.worker = None
+        self.conn = None
+        self.reader: Optional[threading.Thread] = None
+        self.pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0  # id 0 is the worker's ready message
+        self._send_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+    async def initialize(self) -> bool:
+        """Start the worker process and wait until it has initialized the module"""
+        logger.info(f"⚙️ Starting worker process for module: {self.module_id}")
+        self._loop = asyncio.get_running_loop()
+        parent_conn, child_conn = self.mp_context.Pipe()
+        worker = self.mp_context.Process(target=_offloaded_module_worker, args=(self.module, child_conn),
+                                         name=f"migi-{self.module_id}", daemon=True)
+        try:
+            worker.start()
+        except Exception:
+            parent_conn.close()
+            raise
+        finally:
+            child_conn.close()
+        self.worker = worker
+        self.conn = parent_conn
+        
+        ready = self._loop.create_future()
+        self.pending[0] = ready
+        self.reader = threading.Thread(target=self._read_replies, args=(parent_conn,),
+                                       name=f"migi-{self.module_id}-reader", daemon=True)
+        self.reader.start()
+        
+        try:
+            reply = await ready
+            if 'error' in reply:
+                raise RuntimeError(reply['error'])
+            self.active = bool(reply['success'])
+        except asyncio.CancelledError:
+            self._abandon_worker()
+            raise
+        except Exception:
+            await self._stop_worker()
+            raise
+        if not self.active:
+            await self._stop_worker()
+        return self.active
+        
+    def _read_replies(self, conn) -> None:
+        """Reader thread: hand worker replies to the event loop"""
+        while True:
+            try:
+                reply = _decode_message(conn.recv_bytes())
+            except (EOFError, OSError):
+                break
+            self._call_soon(self._resolve, reply)
+        self._call_soon(self._worker_exited)
+        
+    def _call_soon(self, callback: Callable, *args) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:  # Event loop already closed
+            pass
+            
+    def _resolve(self, reply: Dict[str, Any]) -> None:
+        future = self.pending.pop(reply['id'], None)
+        if future is not None and not future.done():
+            future.set_result(reply)
+            
+    def _worker_exited(self) -> None:
+        self.active = False
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError(f"Worker process of module {self.module_id} exited"))
+        self.pending.clear()
+        
+    def _send(self, conn, payload: bytes) -> None:
+        with self._send_lock:  # Large messages are written in chunks that must not interleave
+            conn.send_bytes(payload)
+            
+    async def _call(self, op: str, requests: List[MIAPRequest]) -> List[MIAPResponse]:
+        if self.conn is None or not self.worker.is_alive():
+            raise RuntimeError(f"Worker process of module {self.module_id} is not running")
+        self._next_id += 1
+        call_id = self._next_id
+        future = self._loop.create_future()
+        self.pending[call_id] = future
+        try:
+            payload = _encode_message({'op': op, 'id': call_id, 'requests': [vars(request) for request in requests]})
+            # A busy worker leaves the pipe full, so sending may block - keep it off the event loop
+            await self._loop.run_in_executor(None, self._send, self.conn, payload)
+            reply = await future
+        finally:
+            self.pending.pop(call_id, None)
+        if 'error' in reply:
+            raise RuntimeError(reply['error'])
+        return [MIAPResponse(**response) for response in reply['responses']]
+        
+    async def process(self, request: MIAPRequest) -> MIAPResponse:
+        """Process a request in the worker process"""
+        return (await self._call('process', [request]))[0]
+        
+    async def process_batch(self, requests: List[MIAPRequest]) -> List[MIAPResponse]:
+        """Process a batch in the worker process with the wrapped module's process_batch"""
+        return await self._call('batch', requests)
+        
+    async def _stop_worker(self) -> None:
+        """Wait for the worker to exit (terminating it if it does not), then release the pipe"""
+        loop = asyncio.get_running_loop()
+        worker, reader, conn = self.worker, self.reader, self.conn
+        try:
+            await loop.run_in_executor(None, worker.join, self.join_timeout)
+            if worker.is_alive():
+                worker.terminate()
+                await loop.run_in_executor(None, worker.join, self.join_timeout)
+            await loop.run_in_executor(None, reader.join, self.join_timeout)
+            conn.close()
+        except asyncio.CancelledError:
+            self._abandon_worker()
+            raise
+        self.worker = self.reader = self.conn = None
+        
+    def _abandon_worker(self) -> None:
+        """Terminate the worker without waiting (e.g. past a shutdown deadline); the reader thread ends on EOF"""
+        if self.worker is not None and self.worker.is_alive():
+            self.worker.terminate()
+        self.worker = self.reader = self.conn = None
+        
+    async def shutdown(self) -> None:
+        """Shut down the wrapped module and stop the worker process"""
+        logger.info(f"🔌 Shutting down module: {self.module_id}")
+        self.active = False
+        if self.worker is None:
+            return
+        try:
+            if self.reader.is_alive():  # The reader stops once the worker has exited
+                await self._call('shutdown', [])
+        except (RuntimeError, OSError) as e:
+            logger.warning(f"⚠️ Worker of module {self.module_id} did not shut down cleanly: {e}")
+        except asyncio.CancelledError:
+            self._abandon_worker()
+            raise
+        await self._stop_worker()
+            
+    def is_cacheable(self, request: MIAPRequest) -> bool:
+        return self.module.is_cacheable(request)
+        
+    def get_confidence(self) -> float:
+        return self.module.get_confidence()
+
 # ============================================================================
 # 🧠 INTELLIGENCE REGISTRY - Central Module Management
 # ============================================================================
 
+class ResponseCache:
+    """
+    LRU cache of MIAP responses keyed by module and a canonical hash of the input.
+
+    Entries expire after a per-module TTL (a TTL of 0 disables caching for that
+    module). Modules opt out of caching individual requests through
+    ``IntelligenceModule.is_cacheable``; such requests may change module state, so
+    the registry drops that module's entries after running one. Identical requests
+    arriving while one is being computed share the same in-flight task instead of
+    recomputing. Every caller gets its own copy of the response.
+    """
+    
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 30.0,
+                 module_ttls: Optional[Dict[str, float]] = None,
+                 context_keys: Optional[Dict[str, List[str]]] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.module_ttls = module_ttls or {}
+        self.context_keys = context_keys or {}
+        self.entries: "OrderedDict[Tuple[str, str], Tuple[float, MIAPResponse]]" = OrderedDict()
+        self.inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.generations: Dict[str, int] = {}  # bumped by invalidate; stale computations are not stored
+        self.stats = {'hits': 0, 'misses': 0, 'inflight_joins': 0, 'evictions': 0}
+        
+    def ttl_for(self, module_id: str) -> float:
+        return self.module_ttls.get(module_id, self.default_ttl)
+        
+    def make_key(self, request: MIAPRequest) -> Tuple[str, str]:
+        """(module, sha256 of canonical JSON of input_data and the module's relevant context keys)"""
+        context = request.context or {}
+        relevant_context = {key: context.get(key) for key in self.context_keys.get(request.module_target, [])}
+        canonical = json.dumps({'input': request.input_data, 'context': relevant_context},
+                               sort_keys=True, separators=(',', ':'), default=str)
+        return request.module_target, hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        
+    async def get_or_compute(self, request: MIAPRequest,
+                             compute: Callable[[], Awaitable[MIAPResponse]]) -> MIAPResponse:
+        """Return a cached response, join an identical in-flight request, or compute and store"""
+        key = self.make_key(request)
+        loop = asyncio.get_running_loop()
+        
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > loop.time():
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._for_request(response, request, 'hit')
+            del self.entries[key]
+            
+        task = self.inflight.get(key)
+        if task is not None:
+            self.stats['inflight_joins'] += 1
+            timeout = request.timeout if request.timeout and request.timeout > 0 else None
+            try:
+                response = await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ Module {request.module_target} timed out after {request.timeout:.2f}s")
+                return MIAPResponse(
+                    request_id=request.id,
+                    success=False,
+                    output_data=f"Module {request.module_target} timed out after {request.timeout:.2f}s",
+                    confidence=0.0,
+                    processing_time=timeout,
+                    metadata={"error": "TIMEOUT", 'cache': 'shared'}
+                )
+            return self._for_request(response, request, 'shared')
+            
+        self.stats['misses'] += 1
+        task = asyncio.ensure_future(self._compute_and_store(key, request.module_target, compute))
+        self.inflight[key] = task
+        return self._for_request(await asyncio.shield(task), request)
+        
+    async def _compute_and_store(self, key: Tuple[str, str], module_id: str,
+                                 compute: Callable[[], Awaitable[MIAPResponse]]) -> MIAPResponse:
+        """Compute a response; the returned snapshot is private to the cache and only handed out as copies"""
+        generation = self.generations.get(module_id, 0)
+        try:
+            response = copy.deepcopy(await compute())
+            if response.success and self.generations.get(module_id, 0) == generation:
+                self.entries[key] = (asyncio.get_running_loop().time() + self.ttl_for(module_id), response)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+            return response
+        finally:
+            self.inflight.pop(key, None)
+            
+    @staticmethod
+    def _for_request(response: MIAPResponse, request: MIAPRequest, source: Optional[str] = None) -> MIAPResponse:
+        """Copy of a cached response addressed to this request"""
+        metadata = copy.deepcopy(response.metadata)
+        if source is not None:
+            metadata['cache'] = source
+        return replace(response, request_id=request.id, output_data=copy.deepcopy(response.output_data),
+                       metadata=metadata)
+        
+    def invalidate(self, module_id: Optional[str] = None) -> None:
+        """Drop cached responses (of one module or all)"""
+        if module_id is None:
+            self.entries.clear()
+            for cached_module in set(self.generations) | {key[0] for key in self.inflight}:
+                self.generations[cached_module] = self.generations.get(cached_module, 0) + 1
+        else:
+            self.generations[module_id] = self.generations.get(module_id, 0) + 1
+            for key in [key for key in self.entries if key[0] == module_id]:
+                del self.entries[key]
+                
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, 'entries': len(self.entries), 'inflight': len(self.inflight)}
+
+class MicroBatcher:
+    """
+    Collects requests for the same module over a short window and hands them to
+    ``IntelligenceModule.process_batch`` together.
+
+    A module's batch is flushed ``window_ms`` milliseconds after its first request
+    arrives, or as soon as it holds ``max_batch`` requests. ``modules`` limits
+    batching to the given module ids (all modules when omitted). Requests whose
+    caller gave up (e.g. on timeout) before the flush are dropped from the batch.
+    """
+    
+    def __init__(self, window_ms: float = 2.0, max_batch: int = 64,
+                 modules: Optional[List[str]] = None):
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.modules = set(modules) if modules else None
+        self.pending: Dict[str, List[Tuple[MIAPRequest, asyncio.Future]]] = {}
+        self.timers: Dict[str, asyncio.TimerHandle] = {}
+        self.tasks: Set[asyncio.Task] = set()
+        self.stats = {'batches': 0, 'batched_requests': 0, 'max_batch_size': 0}
+        
+    def applies_to(self, module_id: str) -> bool:
+        return self.modules is None or module_id in self.modules
+        
+    def submit(self, module: IntelligenceModule, request: MIAPRequest) -> asyncio.Future:
+        """Add a request to the module's pending batch; the future resolves to its response"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self.pending.setdefault(module.module_id, [])
+        batch.append((request, future))
+        if len(batch) >= self.max_batch:
+            self._flush(module)
+        elif len(batch) == 1:
+            self.timers[module.module_id] = loop.call_later(self.window, self._flush, module)
+        return future
+        
+    def _flush(self, module: IntelligenceModule) -> None:
+        timer = self.timers.pop(module.module_id, None)
+        if timer is not None:
+            timer.cancel()
+        batch = [(request, future) for request, future in self.pending.pop(module.module_id, [])
+                 if not future.done()]
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run_batch(module, batch))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        
+    async def _run_batch(self, module: IntelligenceModule,
+                         batch: List[Tuple[MIAPRequest, asyncio.Future]]) -> None:
+        self.stats['batches'] += 1
+        self.stats['batched_requests'] += len(batch)
+        self.stats['max_batch_size'] = max(self.stats['max_batch_size'], len(batch))
+        try:
+            responses = await module.process_batch([request for request, _ in batch])
+            if len(responses) != len(batch):
+                raise RuntimeError(f"process_batch returned {len(responses)} responses for {len(batch)} requests")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+                
+    async def close(self) -> None:
+        """Cancel pending requests and wait for running batches"""
+        for timer in self.timers.values():
+            timer.cancel()
+        self.timers.clear()
+        for batch in self.pending.values():
+            for _, future in batch:
+                future.cancel()
+        self.pending.clear()
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            
+    def get_stats(self) -> Dict[str, float]:
+        batches = self.stats['batches'] or 1
+        return {
+            **self.stats,
+            'average_batch_size': self.stats['batched_requests'] / batches,
+            'pending': sum(len(batch) for batch in self.pending.values())
+        }
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram (HDR-style).
+
+    Bucket bounds grow geometrically by ``2 ** (1 / buckets_per_doubling)``, so a
+    percentile is reported with a bounded relative error (about 9% for the
+    default 8 buckets per doubling) at constant memory, whatever the latency range.
+    """
+    
+    def __init__(self, min_value: float = 1e-6, max_value: float = 600.0,
+                 buckets_per_doubling: int = 8):
+        self.min_value = min_value
+        self.buckets_per_doubling = buckets_per_doubling
+        self.counts = [0] * (math.ceil(math.log2(max_value / min_value) * buckets_per_doubling) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min_seen = math.inf
+        self.max_seen = 0.0
+        
+    def record(self, value: float) -> None:
+        if value <= self.min_value:
+            index = 0
+        else:
+            index = min(len(self.counts) - 1,
+                        math.ceil(math.log2(value / self.min_value) * self.buckets_per_doubling))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min_seen = min(self.min_seen, value)
+        self.max_seen = max(self.max_seen, value)
+        
+    def upper_bound(self, index: int) -> float:
+        return self.min_value * 2 ** (index / self.buckets_per_doubling)
+        
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (0 < q <= 1), clamped to the observed range"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        cumulative = 0
+        top = len(self.counts) - 1
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                if index == top:
+                    return self.max_seen  # The top bucket also holds everything above max_value
+                return min(max(self.upper_bound(index), self.min_seen), self.max_seen)
+        return self.max_seen
+        
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max_seen,
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99)
+        }
+
+class RegistryMetrics:
+    """Per-module latency and queue-wait histograms, outcome and cache-hit counters, in-flight gauges"""
+    
+    OUTCOMES = ('success', 'error', 'timeout', 'rejected')
+    QUANTILES = (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99'))
+    
+    def __init__(self):
+        self.modules: Dict[str, Dict[str, Any]] = {}
+        
+    def _module(self, module_id: str) -> Dict[str, Any]:
+        metrics = self.modules.get(module_id)
+        if metrics is None:
+            metrics = self.modules[module_id] = {
+                'latency': LatencyHistogram(),
+                'queue_wait': LatencyHistogram(),
+                'in_flight': 0,
+                'cache_hits': 0,
+                **{outcome: 0 for outcome in self.OUTCOMES}
+            }
+        return metrics
+        
+    def request_started(self, module_id: str) -> None:
+        self._module(module_id)['in_flight'] += 1
+        
+    def request_finished(self, module_id: str, outcome: str, latency: float,
+                         cache_hit: bool = False) -> None:
+        metrics = self._module(module_id)
+        metrics['in_flight'] -= 1
+        metrics[outcome] += 1
+        metrics['latency'].record(latency)
+        if cache_hit:
+            metrics['cache_hits'] += 1
+            
+    def request_rejected(self, module_id: str) -> None:
+        """Request refused before execution (unknown or inactive module)"""
+        self._module(module_id)['rejected'] += 1
+        
+    def record_queue_wait(self, module_id: str, wait_time: float) -> None:
+        """Time a request spent in the scheduler queue before a worker picked it up"""
+        self._module(module_id)['queue_wait'].record(wait_time)
+        
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters, in-flight gauge and latency percentiles (seconds) per module"""
+        return {
+            module_id: {
+                'requests': sum(metrics[outcome] for outcome in self.OUTCOMES),
+                **{outcome: metrics[outcome] for outcome in self.OUTCOMES},
+                'cache_hits': metrics['cache_hits'],
+                'in_flight': metrics['in_flight'],
+                'latency': metrics['latency'].summary(),
+                'queue_wait': metrics['queue_wait'].summary()
+            }
+            for module_id, metrics in self.modules.items()
+        }
+        
+    def to_prometheus(self, queue_depths: Optional[Dict[str, int]] = None) -> str:
+        """Prometheus text exposition of the metrics (plus scheduler queue depths, if given)"""
+        def label(value: str) -> str:
+            return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            
+        lines = [
+            '# HELP migi_module_requests_total Requests executed by a module, by outcome.',
+            '# TYPE migi_module_requests_total counter'
+        ]
+        for module_id, metrics in self.modules.items():
+            for outcome in self.OUTCOMES:
+                lines.append(f'migi_module_requests_total{{module="{label(module_id)}",outcome="{outcome}"}} {metrics[outcome]}')
+                
+        lines += [
+            '# HELP migi_module_cache_hits_total Requests answered from the response cache (stored or shared in-flight).',
+            '# TYPE migi_module_cache_hits_total counter'
+        ]
+        for module_id, metrics in self.modules.items():
+            lines.append(f'migi_module_cache_hits_total{{module="{label(module_id)}"}} {metrics["cache_hits"]}')
+            
+        for name, key, description in (('migi_module_latency_seconds', 'latency', 'Module request latency.'),
+                                       ('migi_module_queue_wait_seconds', 'queue_wait',
+                                        'Time requests waited in the scheduler queue.')):
+            lines += [f'# HELP {name} {description}', f'# TYPE {name} summary']
+            for module_id, metrics in self.modules.items():
+                histogram = metrics[key]
+                for quantile, _ in self.QUANTILES:
+                    lines.append(f'{name}{{module="{label(module_id)}",quantile="{quantile}"}} '
+                                 f'{histogram.percentile(float(quantile)):.9g}')
+                lines.append(f'{name}_sum{{module="{label(module_id)}"}} {histogram.total:.9g}')
+                lines.append(f'{name}_count{{module="{label(module_id)}"}} {histogram.count}')
+                
+        lines += [
+            '# HELP migi_module_in_flight Requests currently executing in a module.',
+            '# TYPE migi_module_in_flight gauge'
+        ]
+        for module_id, metrics in self.modules.items():
+            lines.append(f'migi_module_in_flight{{module="{label(module_id)}"}} {metrics["in_flight"]}')
+            
+        if queue_depths is not None:
+            lines += [
+                '# HELP migi_module_queue_depth Requests waiting in the scheduler queue of a module.',
+                '# TYPE migi_module_queue_depth gauge'
+            ]
+            for module_id, depth in queue_depths.items():
+                lines.append(f'migi_module_queue_depth{{module="{label(module_id)}"}} {depth}')
+        return '\n'.join(lines) + '\n'
+
 class IntelligenceRegistry:
     """Central registry for all intelligence modules in MIGI system"""
     
@@ -112,39 +772,244 @@ class IntelligenceRegistry:
         self.modules: Dict[str, IntelligenceModule] = {}
         self.dependencies: Dict[str, List[str]] = {}
         self.active_modules: List[str] = []
+        self.capability_index: Dict[str, Set[str]] = {}
+        self.response_cache: Optional[ResponseCache] = None  # disabled by default
+        self.micro_batcher: Optional[MicroBatcher] = None  # disabled by default
+        self.metrics = RegistryMetrics()
+        self.init_times: Dict[str, float] = {}
         
-    def register_module(self, module: IntelligenceModule) -> bool:
-        """Register a new intelligence module"""
+    def register_module(self, module: IntelligenceModule,
+                        dependencies: Optional[List[str]] = None,
+                        cpu_bound: bool = False) -> bool:
+        """
+        Register a new intelligence module, optionally with the ids of modules it depends on.
+        CPU-bound modules are wrapped in a ProcessOffloadedModule and run in their own worker process.
+        """
         try:
+            if cpu_bound and not isinstance(module, ProcessOffloadedModule):
+                module = ProcessOffloadedModule(module)
+            unknown = [name for name in module.get_input_predicates() if name not in INPUT_PREDICATES]
+            if unknown:
+                raise ValueError(f"Unknown input predicates: {', '.join(unknown)}")
             self.modules[module.module_id] = module
+            self.dependencies[module.module_id] = list(dependencies or [])
+            for capability in module.get_capabilities():
+                self.capability_index.setdefault(capability, set()).add(module.module_id)
             logger.info(f"📝 Registered module: {module.module_id}")
             logger.info(f"   Capabilities: {', '.join(module.get_capabilities())}")
+            if dependencies:
+                logger.info(f"   Depends on: {', '.join(dependencies)}")
+            if isinstance(module, ProcessOffloadedModule):
+                logger.info("   CPU-bound: runs in a dedicated worker process")
             return True
         except Exception as e:
             logger.error(f"❌ Failed to register module {module.module_id}: {e}")
             return False
             
+    def _unresolvable_modules(self) -> Dict[str, str]:
+        """Modules whose prerequisites can never be met, with the reason"""
+        resolved: Set[str] = set()
+        pending = list(self.modules)
+        progress = True
+        while progress:
+            progress = False
+            for module_id in list(pending):
+                if all(dependency in resolved for dependency in self.dependencies.get(module_id, [])):
+                    resolved.add(module_id)
+                    pending.remove(module_id)
+                    progress = True
+                    
+        unresolved = set(pending)
+        
+        def on_cycle(module_id: str) -> bool:
+            # A module is on a cycle when it can reach itself through unresolved prerequisites
+            stack = [dependency for dependency in self.dependencies.get(module_id, []) if dependency in unresolved]
+            seen = set()
+            while stack:
+                current = stack.pop()
+                if current == module_id:
+                    return True
+                if current not in seen:
+                    seen.add(current)
+                    stack.extend(dependency for dependency in self.dependencies.get(current, [])
+                                 if dependency in unresolved)
+            return False
+            
+        reasons = {}
+        for module_id in pending:
+            missing = [dependency for dependency in self.dependencies.get(module_id, [])
+                       if dependency not in self.modules]
+            if missing:
+                reasons[module_id] = f"missing dependency: {', '.join(missing)}"
+            elif on_cycle(module_id):
+                reasons[module_id] = "dependency cycle"
+            else:
+                blocked_by = [dependency for dependency in self.dependencies.get(module_id, [])
+                              if dependency in unresolved]
+                reasons[module_id] = f"depends on unresolvable module: {', '.join(blocked_by)}"
+        return reasons
+        
     async def initialize_all_modules(self) -> bool:
-        """Initialize all registered modules"""
+        """
+        Initialize all registered modules concurrently along the dependency DAG.
+        Independent modules start in parallel and each module waits only for its own
+        prerequisites; modules whose prerequisites fail, are missing or form a cycle
+        are not initialized. Per-module init times are kept in ``init_times``.
+        """
         logger.info("🚀 Initializing all MIGI intelligence modules...")
+        loop = asyncio.get_running_loop()
+        started = loop.time()
         
-        for module_id, module in self.modules.items():
+        unresolvable = self._unresolvable_modules()
+        for module_id, reason in unresolvable.items():
+            logger.error(f"❌ Module {module_id} cannot be initialized: {reason}")
+            
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        async def initialize(module_id: str) -> bool:
+            for dependency in self.dependencies.get(module_id, []):
+                if not await tasks[dependency]:
+                    logger.warning(f"⚠️ Module {module_id} not initialized: dependency {dependency} unavailable")
+                    return False
+                    
+            module_started = loop.time()
             try:
-                success = await module.initialize()
-                if success:
-                    self.active_modules.append(module_id)
-                    logger.info(f"✅ Module {module_id} initialized successfully")
-                else:
-                    logger.warning(f"⚠️ Module {module_id} failed to initialize")
+                success = await self.modules[module_id].initialize()
             except Exception as e:
                 logger.error(f"❌ Error initializing module {module_id}: {e}")
-                
-        logger.info(f"🎯 Initialized {len(self.active_modules)}/{len(self.modules)} modules")
+                success = False
+            self.init_times[module_id] = loop.time() - module_started
+            
+            if success:
+                logger.info(f"✅ Module {module_id} initialized successfully ({self.init_times[module_id]:.3f}s)")
+            else:
+                logger.warning(f"⚠️ Module {module_id} failed to initialize")
+            return bool(success)
+            
+        for module_id in self.modules:
+            if module_id not in unresolvable:
+                tasks[module_id] = asyncio.create_task(initialize(module_id), name=f"init-{module_id}")
+        if tasks:
+            await asyncio.gather(*tasks.values())
+            
+        # Keep registration order so routing stays deterministic
+        self.active_modules = [module_id for module_id, task in tasks.items() if task.result()]
+        logger.info(f"🎯 Initialized {len(self.active_modules)}/{len(self.modules)} modules "
+                    f"in {loop.time() - started:.3f}s")
         return len(self.active_modules) > 0
         
+    async def shutdown_all_modules(self, timeout: float = 10.0, cancel_grace: float = 0.5) -> Dict[str, str]:
+        """
+        Shut down all modules concurrently in reverse dependency order: a module is
+        shut down once every module depending on it has finished shutting down.
+        Shutdowns still running when the global ``timeout`` expires are cancelled
+        and given at most ``cancel_grace`` seconds to unwind before being abandoned.
+        Returns the outcome per module ('ok', 'error' or 'timeout').
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        dependents: Dict[str, List[str]] = {module_id: [] for module_id in self.modules}
+        for module_id, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                if dependency in dependents and module_id in self.modules:
+                    dependents[dependency].append(module_id)
+        cyclic = {module_id for module_id, reason in self._unresolvable_modules().items()
+                  if reason == "dependency cycle"}
+        
+        outcomes: Dict[str, str] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        
+        async def shutdown(module_id: str) -> None:
+            if module_id not in cyclic:
+                waiting = [tasks[dependent] for dependent in dependents[module_id]]
+                if waiting:
+                    await asyncio.wait(waiting)  # proceed even if a dependent failed to shut down
+            try:
+                await self.modules[module_id].shutdown()
+                outcomes[module_id] = 'ok'
+            except Exception as e:
+                logger.error(f"❌ Error shutting down module {module_id}: {e}")
+                outcomes[module_id] = 'error'
+                
+        for module_id in self.modules:
+            tasks[module_id] = asyncio.create_task(shutdown(module_id), name=f"shutdown-{module_id}")
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                _, stuck = await asyncio.wait(pending, timeout=cancel_grace)
+                for task in stuck:
+                    logger.warning(f"⚠️ Abandoning {task.get_name()}: it did not stop after cancellation")
+            
+        for module_id in self.modules:
+            if module_id not in outcomes:
+                logger.warning(f"⏱️ Module {module_id} did not shut down within {timeout:.1f}s")
+        outcomes = {module_id: outcomes.get(module_id, 'timeout') for module_id in self.modules}
+        clean = sum(1 for outcome in outcomes.values() if outcome == 'ok')
+        logger.info(f"🔌 Shut down {clean}/{len(self.modules)} modules in {loop.time() - started:.3f}s")
+        return outcomes
+        
+    def enable_response_cache(self, **cache_options) -> ResponseCache:
+        """Serve repeated requests from a ResponseCache"""
+        if self.response_cache is None:
+            self.response_cache = ResponseCache(**cache_options)
+        return self.response_cache
+        
+    def enable_micro_batching(self, **batch_options) -> MicroBatcher:
+        """Dispatch requests to modules in micro-batches through process_batch"""
+        if self.micro_batcher is None:
+            self.micro_batcher = MicroBatcher(**batch_options)
+        return self.micro_batcher
+        
+    def modules_with_capability(self, capability: str) -> List[str]:
+        """Return ids of registered modules offering a capability"""
+        return sorted(self.capability_index.get(capability, ()))
+        
+    def select_modules(self, input_data: Any,
+                       capabilities: Optional[List[str]] = None) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Choose the active modules relevant for a query.
+        A module is routed when it offers at least one of the requested capabilities
+        (if any were requested) and the query satisfies all of its input predicates.
+        Returns the selected module ids and the routing decisions.
+        """
+        query_predicates = classify_query(input_data)
+        candidates = None
+        if capabilities:
+            candidates = set()
+            for capability in capabilities:
+                candidates |= self.capability_index.get(capability, set())
+        
+        selected = []
+        skipped = {}
+        for module_id in self.active_modules:
+            if not self.modules[module_id].active:
+                skipped[module_id] = "inactive"
+                continue
+            if candidates is not None and module_id not in candidates:
+                skipped[module_id] = "no_matching_capability"
+                continue
+            missing = [name for name in self.modules[module_id].get_input_predicates()
+                       if name not in query_predicates]
+            if missing:
+                skipped[module_id] = f"missing_input: {', '.join(missing)}"
+                continue
+            selected.append(module_id)
+        
+        decisions = {
+            'query_predicates': sorted(query_predicates),
+            'requested_capabilities': list(capabilities or []),
+            'routed_modules': selected,
+            'skipped_modules': skipped
+        }
+        return selected, decisions
+            
     async def route_request(self, request: MIAPRequest) -> MIAPResponse:
         """Route request to appropriate intelligence module"""
         if request.module_target not in self.modules:
+            self.metrics.request_rejected(request.module_target)
             return MIAPResponse(
                 request_id=request.id,
                 success=False,
@@ -157,6 +1022,7 @@ class IntelligenceRegistry:
         module = self.modules[request.module_target]
         
         if not module.active:
+            self.metrics.request_rejected(module.module_id)
             return MIAPResponse(
                 request_id=request.id,
                 success=False, 
@@ -166,12 +1032,55 @@ class IntelligenceRegistry:
                 metadata={"error": "MODULE_INACTIVE"}
             )
             
+        # Metrics are recorded here, once per request, so cache hits are counted as well
+        start_time = asyncio.get_event_loop().time()
+        outcome, cache_hit = 'error', False
+        self.metrics.request_started(module.module_id)
+        try:
+            cache = self.response_cache
+            if cache is not None and cache.ttl_for(module.module_id) > 0 and module.is_cacheable(request):
+                response = await cache.get_or_compute(request, lambda: self._execute_request(module, request))
+                cache_hit = response.metadata.get('cache') in ('hit', 'shared')
+            else:
+                response = await self._execute_request(module, request)
+                if cache is not None:
+                    # Uncacheable requests may change module state - drop the module's now stale responses
+                    cache.invalidate(module.module_id)
+            if response.success:
+                outcome = 'success'
+            elif response.metadata.get('error') == 'TIMEOUT':
+                outcome = 'timeout'
+            return response
+        finally:
+            self.metrics.request_finished(module.module_id, outcome,
+                                          asyncio.get_event_loop().time() - start_time, cache_hit)
+        
+    async def _execute_request(self, module: IntelligenceModule, request: MIAPRequest) -> MIAPResponse:
+        """Run a request on a module, enforcing its timeout"""
+        start_time = asyncio.get_event_loop().time()
         try:
-            start_time = asyncio.get_event_loop().time()
-            response = await module.process(request)
+            # wait_for cancels the module task once the request timeout expires
+            timeout = request.timeout if request.timeout and request.timeout > 0 else None
+            batcher = self.micro_batcher
+            if batcher is not None and batcher.applies_to(module.module_id):
+                work = batcher.submit(module, request)
+            else:
+                work = module.process(request)
+            response = await asyncio.wait_for(work, timeout=timeout)
             end_time = asyncio.get_event_loop().time()
             response.processing_time = end_time - start_time
             return response
+        except asyncio.TimeoutError:
+            elapsed = asyncio.get_event_loop().time() - start_time
+            logger.warning(f"⏱️ Module {request.module_target} timed out after {request.timeout:.2f}s")
+            return MIAPResponse(
+                request_id=request.id,
+                success=False,
+                output_data=f"Module {request.module_target} timed out after {request.timeout:.2f}s",
+                confidence=0.0,
+                processing_time=elapsed,
+                metadata={"error": "TIMEOUT"}
+            )
         except Exception as e:
             logger.error(f"❌ Error processing request in module {request.module_target}: {e}")
             return MIAPResponse(
@@ -183,6 +1092,239 @@ class IntelligenceRegistry:
                 metadata={"error": "PROCESSING_ERROR"}
             )
 
+# ============================================================================
+# 🚦 MIAP SCHEDULER - Priority Queues and Worker Pools
+# ============================================================================
+
+class PriorityGate:
+    """Concurrency limit whose free slots go to the waiter with the lowest key, not the first one"""
+    
+    def __init__(self, slots: int):
+        self.free = slots
+        self.waiters: List[Tuple[float, int, asyncio.Future]] = []
+        self._sequence = 0
+        
+    async def acquire(self, key: float) -> None:
+        if self.free > 0 and not self.waiters:
+            self.free -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._sequence += 1
+        heapq.heappush(self.waiters, (key, self._sequence, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # The slot was granted just as the waiter was cancelled
+            raise
+            
+    def release(self) -> None:
+        while self.waiters:
+            _, _, future = heapq.heappop(self.waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.free += 1
+
+class MIAPScheduler:
+    """
+    Priority-aware scheduler in front of the IntelligenceRegistry.
+
+    Each module gets its own asyncio priority queue and worker tasks, so a flood
+    of requests for one module never delays another. Lower ``priority`` values are
+    served first; waiting requests age by ``aging_rate`` priority levels per
+    second, so low-priority work is never starved. ``max_concurrency`` caps the
+    concurrent processing of individual modules, and ``max_in_flight`` caps it
+    across all modules - its free slots go to the most urgent waiting request.
+
+    Security modules (``security_modules``) get ``security_workers`` workers, and
+    their requests that keep the default priority are scheduled at
+    ``security_priority``, so under overload they are served first.
+
+    A request's timeout covers its time in the queue: the caller gets a TIMEOUT
+    response once it expires, and the module only gets the remaining budget.
+    """
+    
+    SECURITY_MODULES = ('intent_analyzer', 'threat_monitor', 'geo_intelligence')
+    
+    def __init__(self, registry: IntelligenceRegistry, workers_per_module: int = 2,
+                 module_workers: Optional[Dict[str, int]] = None,
+                 max_concurrency: Optional[Dict[str, int]] = None,
+                 aging_rate: float = 1.0,
+                 max_in_flight: Optional[int] = None,
+                 security_modules: Tuple[str, ...] = SECURITY_MODULES,
+                 security_workers: int = 4,
+                 security_priority: int = 1):
+        self.registry = registry
+        self.workers_per_module = workers_per_module
+        self.module_workers = {module_id: security_workers for module_id in security_modules}
+        self.module_workers.update(module_workers or {})
+        self.max_concurrency = max_concurrency or {}
+        self.aging_rate = aging_rate
+        self.security_modules = set(security_modules)
+        self.security_priority = security_priority
+        self.gate = PriorityGate(max_in_flight) if max_in_flight else None
+        self.queues: Dict[str, asyncio.PriorityQueue] = {}
+        self.semaphores: Dict[str, Optional[asyncio.Semaphore]] = {}
+        self.workers: Dict[str, List[asyncio.Task]] = {}
+        self.metrics: Dict[str, Dict[str, float]] = {}
+        self._sequence = 0
+        self.running = False
+        
+    async def start(self) -> None:
+        """Start worker tasks for all active modules"""
+        self.running = True
+        for module_id in self.registry.active_modules:
+            self._ensure_module(module_id)
+        logger.info(f"🚦 MIAP scheduler started for {len(self.workers)} modules")
+        
+    def _ensure_module(self, module_id: str) -> None:
+        """Create the queue, semaphore and workers of a module on first use"""
+        if module_id in self.queues:
+            return
+        workers = self.module_workers.get(module_id, self.workers_per_module)
+        self.queues[module_id] = asyncio.PriorityQueue()
+        # Workers already bound a module's concurrency; a semaphore is only needed for a lower limit
+        limit = self.max_concurrency.get(module_id)
+        self.semaphores[module_id] = asyncio.Semaphore(limit) if limit and limit < workers else None
+        self.metrics[module_id] = {
+            'enqueued': 0,
+            'completed': 0,
+            'expired': 0,
+            'wait_samples': 0,  # requests whose queue wait is included in total_wait_time
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0
+        }
+        self.workers[module_id] = [
+            asyncio.create_task(self._worker(module_id), name=f"miap-{module_id}-{i}")
+            for i in range(workers)
+        ]
+        
+    def effective_priority(self, request: MIAPRequest) -> int:
+        """Request priority, with security modules' defaulted requests promoted"""
+        if request.module_target in self.security_modules and request.priority == DEFAULT_PRIORITY:
+            return self.security_priority
+        return request.priority
+        
+    @staticmethod
+    def _timeout_response(request: MIAPRequest, elapsed: float) -> MIAPResponse:
+        logger.warning(f"⏱️ Request {request.id} for {request.module_target} timed out after {request.timeout:.2f}s")
+        return MIAPResponse(
+            request_id=request.id,
+            success=False,
+            output_data=f"Module {request.module_target} timed out after {request.timeout:.2f}s",
+            confidence=0.0,
+            processing_time=elapsed,
+            metadata={"error": "TIMEOUT"}
+        )
+        
+    async def submit(self, request: MIAPRequest) -> MIAPResponse:
+        """Queue a request and wait for its response, at most request.timeout seconds in total"""
+        if not self.running:
+            raise RuntimeError("MIAP scheduler is not running")
+        if request.module_target not in self.registry.modules:
+            return await self.registry.route_request(request)
+            
+        self._ensure_module(request.module_target)
+        loop = asyncio.get_running_loop()
+        enqueued_at = loop.time()
+        future = loop.create_future()
+        
+        # Aging: the key priority + aging_rate * enqueue time orders requests by their aged priority
+        self._sequence += 1
+        key = self.effective_priority(request) + self.aging_rate * enqueued_at
+        await self.queues[request.module_target].put((key, self._sequence, request, future, enqueued_at))
+        self.metrics[request.module_target]['enqueued'] += 1
+        
+        timeout = request.timeout if request.timeout and request.timeout > 0 else None
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return self._timeout_response(request, loop.time() - enqueued_at)
+            
+    async def _worker(self, module_id: str) -> None:
+        """Serve one module's queue"""
+        queue = self.queues[module_id]
+        semaphore = self.semaphores[module_id]
+        metrics = self.metrics[module_id]
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            key, _, request, future, enqueued_at = await queue.get()
+            acquired = False
+            try:
+                if future.done():  # Caller gave up while the request was queued
+                    continue
+                if self.gate is not None:
+                    await self.gate.acquire(key)
+                    acquired = True
+                    
+                wait_time = loop.time() - enqueued_at
+                metrics['wait_samples'] += 1
+                metrics['total_wait_time'] += wait_time
+                metrics['max_wait_time'] = max(metrics['max_wait_time'], wait_time)
+                self.registry.metrics.record_queue_wait(module_id, wait_time)
+                
+                if request.timeout and request.timeout > 0:
+                    remaining = request.timeout - wait_time
+                    if remaining <= 0:
+                        metrics['expired'] += 1
+                        if not future.done():
+                            future.set_result(self._timeout_response(request, wait_time))
+                        continue
+                    request = replace(request, timeout=remaining)  # The module only gets what is left
+                    
+                if semaphore is None:
+                    response = await self.registry.route_request(request)
+                else:
+                    async with semaphore:
+                        response = await self.registry.route_request(request)
+                metrics['completed'] += 1
+                if not future.done():
+                    future.set_result(response)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            finally:
+                if acquired:
+                    self.gate.release()
+                queue.task_done()
+                
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Queue depth and wait-time metrics per module"""
+        report = {}
+        for module_id, metrics in self.metrics.items():
+            sampled = metrics['wait_samples'] or 1
+            report[module_id] = {
+                'queue_depth': self.queues[module_id].qsize(),
+                'workers': len(self.workers[module_id]),
+                'enqueued': metrics['enqueued'],
+                'completed': metrics['completed'],
+                'expired': metrics['expired'],
+                'average_wait_time': metrics['total_wait_time'] / sampled,
+                'max_wait_time': metrics['max_wait_time']
+            }
+        return report
+        
+    async def stop(self) -> None:
+        """Cancel workers and pending requests"""
+        self.running = False
+        tasks = [task for workers in self.workers.values() for task in workers]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for queue in self.queues.values():
+            while not queue.empty():
+                _, _, _, future, _ = queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+        self.workers.clear()
+        self.queues.clear()
+        self.semaphores.clear()
+        logger.info("🚦 MIAP scheduler stopped")
+
 # ============================================================================
 # 🌍 GLOBAL CONTEXT ENGINE - Multi-dimensional Awareness
 # ============================================================================
@@ -250,6 +1392,8 @@ class MIGICore:
         self.context_engine = GlobalContextEngine()
         self.running = False
         self.version = "1.0.0"
+        self.scheduler: Optional[MIAPScheduler] = None
+        self.metrics_server: Optional[asyncio.AbstractServer] = None
         
     async def initialize(self) -> bool:
         """Initialize the complete MIGI system"""
@@ -273,8 +1417,29 @@ class MIGICore:
             logger.error("❌ MIGI Core System initialization failed")
             return False
             
-    async def process_global_query(self, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Process a global intelligence query across multiple modules"""
+    async def enable_scheduler(self, **scheduler_options) -> MIAPScheduler:
+        """Route module requests through a priority-aware MIAPScheduler"""
+        if self.scheduler is None:
+            self.scheduler = MIAPScheduler(self.registry, **scheduler_options)
+            await self.scheduler.start()
+        return self.scheduler
+        
+    async def dispatch(self, request: MIAPRequest) -> MIAPResponse:
+        """Send a request through the scheduler when enabled, directly otherwise"""
+        if self.scheduler is not None:
+            return await self.scheduler.submit(request)
+        return await self.registry.route_request(request)
+        
+    async def process_global_query(self, query: str, context: Dict[str, Any] = None,
+                                   timeout: Optional[float] = None,
+                                   capabilities: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Process a global intelligence query across the relevant modules.
+        The registry routes the query by capabilities and declared input predicates;
+        routed modules run concurrently, each request honours its timeout (``timeout``
+        overrides the MIAPRequest default), and modules that time out are
+        cancelled and reported as partial results.
+        """
         if not self.running:
             return {"error": "MIGI Core not initialized"}
             
@@ -286,41 +1451,118 @@ class MIGICore:
         context.update(self.context_engine.get_current_context())
         
         # Determine which modules should process this query
-        # For now, we'll process with all active modules
-        results = {}
-        
-        for module_id in self.registry.active_modules:
+        module_ids, routing = self.registry.select_modules(query, capabilities)
+        if routing['skipped_modules']:
+            logger.debug(f"🧭 Routing skipped: {routing['skipped_modules']}")
+        requests = []
+        for module_id in module_ids:
             request = MIAPRequest(
                 id=f"global_{asyncio.get_event_loop().time()}",
                 module_target=module_id,
                 input_data=query,
                 context=context
             )
-            
-            response = await self.registry.route_request(request)
+            if timeout is not None:
+                request.timeout = timeout
+            requests.append(request)
+        
+        # Fan out to all modules at once - latency is the slowest module, not the sum
+        responses = await asyncio.gather(*(self.dispatch(request) for request in requests))
+        
+        results = {}
+        timed_out_modules = []
+        for module_id, response in zip(module_ids, responses):
             results[module_id] = {
                 'success': response.success,
                 'output': response.output_data,
                 'confidence': response.confidence,
                 'processing_time': response.processing_time
             }
+            if response.metadata.get('error') == 'TIMEOUT':
+                timed_out_modules.append(module_id)
             
         # Update consciousness based on query complexity and results
         successful_modules = sum(1 for r in results.values() if r['success'])
-        consciousness_delta = (successful_modules / len(results)) * 0.5
-        self.context_engine.update_consciousness(consciousness_delta)
+        if results:
+            consciousness_delta = (successful_modules / len(results)) * 0.5
+            self.context_engine.update_consciousness(consciousness_delta)
         
         return {
             'query': query,
             'results': results,
+            'routing': routing,
             'global_context': self.context_engine.get_current_context(),
             'processing_summary': {
                 'total_modules': len(results),
                 'successful_modules': successful_modules,
-                'average_confidence': sum(r['confidence'] for r in results.values()) / len(results)
+                'average_confidence': sum(r['confidence'] for r in results.values()) / len(results) if results else 0.0,
+                'timed_out_modules': timed_out_modules,
+                'partial': bool(timed_out_modules)
             }
         }
         
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-module request metrics, with the scheduler queue depth when the scheduler is enabled"""
+        metrics = self.registry.metrics.snapshot()
+        if self.scheduler is not None:
+            for module_id, scheduler_metrics in self.scheduler.get_metrics().items():
+                metrics.setdefault(module_id, {})['queue_depth'] = scheduler_metrics['queue_depth']
+        return metrics
+        
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition of the module metrics"""
+        queue_depths = None
+        if self.scheduler is not None:
+            queue_depths = {module_id: scheduler_metrics['queue_depth']
+                            for module_id, scheduler_metrics in self.scheduler.get_metrics().items()}
+        return self.registry.metrics.to_prometheus(queue_depths)
+        
+    def export_prometheus(self, path: str = "migi_metrics.prom") -> None:
+        """Write the Prometheus exposition to a file (e.g. for the node_exporter textfile collector)"""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(temp_path, path)  # scrapers never see a half-written file
+        
+    async def serve_metrics(self, host: str = "127.0.0.1", port: int = 9464,
+                            read_timeout: float = 5.0) -> asyncio.AbstractServer:
+        """Serve the Prometheus exposition over HTTP on a local port"""
+        if self.metrics_server is not None:
+            return self.metrics_server
+            
+        async def read_request_line(reader: asyncio.StreamReader) -> bytes:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # Skip request headers
+            return request_line
+            
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                # A slow or silent client must not hold the connection open forever
+                request_line = await asyncio.wait_for(read_request_line(reader), timeout=read_timeout)
+                parts = request_line.decode('latin-1').split()
+                if len(parts) >= 2 and parts[0] == 'GET' and parts[1].split('?')[0] in ('/', '/metrics'):
+                    status, body = "200 OK", self.render_prometheus().encode('utf-8')
+                else:
+                    status, body = "404 Not Found", b"Not Found\n"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: close\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+            except (ConnectionError, UnicodeDecodeError, ValueError,
+                    asyncio.LimitOverrunError, asyncio.TimeoutError) as e:
+                # ValueError: a request or header line longer than the stream limit
+                logger.debug(f"📊 Metrics request failed: {e!r}")
+            finally:
+                writer.close()
+                
+        self.metrics_server = await asyncio.start_server(handle, host, port)
+        logger.info(f"📊 Serving Prometheus metrics on http://{host}:{port}/metrics")
+        return self.metrics_server
+        
     def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status"""
         return {
@@ -328,18 +1570,32 @@ class MIGICore:
             'running': self.running,
             'registered_modules': len(self.registry.modules),
             'active_modules': len(self.registry.active_modules),
+            'module_init_times': dict(self.registry.init_times),
+            'scheduler': self.scheduler.get_metrics() if self.scheduler else None,
+            'micro_batching': self.registry.micro_batcher.get_stats() if self.registry.micro_batcher else None,
+            'module_metrics': self.get_metrics(),
             'consciousness_level': self.context_engine.consciousness_level,
             'active_archetypes': [arch.value for arch in self.context_engine.active_archetypes],
             'context_depth': len(self.context_engine.context_stack)
         }
         
-    async def shutdown(self) -> None:
-        """Gracefully shutdown MIGI system"""
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Gracefully shutdown MIGI system; module shutdowns share a global deadline of ``timeout`` seconds"""
         logger.info("🔌 MIGI Core System shutdown initiated...")
         
-        # Shutdown all modules
-        for module in self.registry.modules.values():
-            await module.shutdown()
+        if self.scheduler is not None:
+            await self.scheduler.stop()
+            self.scheduler = None
+        if self.registry.micro_batcher is not None:
+            await self.registry.micro_batcher.close()
+            self.registry.micro_batcher = None
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+            await self.metrics_server.wait_closed()
+            self.metrics_server = None
+            
+        # Shutdown all modules, dependents before their prerequisites
+        await self.registry.shutdown_all_modules(timeout)
             
         self.running = False
         logger.info("✅ MIGI Core System shutdown complete")
@@ -354,66 +1610,94 @@ class NaturalLanguageModule(IntelligenceModule):
     def __init__(self):
         super().__init__(
             module_id="nlp_core",
-            capabilities=["text_analysis", "intent_detection", "sentiment_analysis"]
+            capabilities=["text_analysis", "intent_detection", "sentiment_analysis"],
+            input_predicates=["needs_message"]
         )
         
-    async def process(self, request: MIAPRequest) -> MIAPResponse:
-        """Process natural language input"""
-        try:
-            text = str(request.input_data)
-            
-            # Simple intent detection (can be enhanced with ML models)
-            intents = []
-            if any(word in text.lower() for word in ['question', '?', 'what', 'how', 'why']):
-                intents.append('query')
-            if any(word in text.lower() for word in ['create', 'make', 'build', 'generate']):
-                intents.append('creation')
-            if any(word in text.lower() for word in ['analyze', 'examine', 'study']):
-                intents.append('analysis')
-                
-            # Simple sentiment analysis
-            positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful']
-            negative_words = ['bad', 'terrible', 'awful', 'horrible', 'wrong']
+    QUERY_WORDS = ('question', '?', 'what', 'how', 'why')
+    CREATION_WORDS = ('create', 'make', 'build', 'generate')
+    ANALYSIS_WORDS = ('analyze', 'examine', 'study')
+    POSITIVE_WORDS = ('good', 'great', 'excellent', 'amazing', 'wonderful')
+    NEGATIVE_WORDS = ('bad', 'terrible', 'awful', 'horrible', 'wrong')
+        
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """Intent and sentiment analysis of a single text"""
+        lowered = text.lower()
+        
+        # Simple intent detection (can be enhanced with ML models)
+        intents = []
+        if any(word in lowered for word in self.QUERY_WORDS):
+            intents.append('query')
+        if any(word in lowered for word in self.CREATION_WORDS):
+            intents.append('creation')
+        if any(word in lowered for word in self.ANALYSIS_WORDS):
+            intents.append('analysis')
             
-            positive_score = sum(1 for word in positive_words if word in text.lower())
-            negative_score = sum(1 for word in negative_words if word in text.lower())
+        # Simple sentiment analysis
+        positive_score = sum(1 for word in self.POSITIVE_WORDS if word in lowered)
+        negative_score = sum(1 for word in self.NEGATIVE_WORDS if word in lowered)
+        
+        if positive_score > negative_score:
+            sentiment = 'positive'
+        elif negative_score > positive_score:
+            sentiment = 'negative'  
+        else:
+            sentiment = 'neutral'
             
-            if positive_score > negative_score:
-                sentiment = 'positive'
-            elif negative_score > positive_score:
-                sentiment = 'negative'  
-            else:
-                sentiment = 'neutral'
-                
-            result = {
-                'text_length': len(text),
-                'word_count': len(text.split()),
-                'detected_intents': intents,
-                'sentiment': sentiment,
-                'sentiment_scores': {
-                    'positive': positive_score,
-                    'negative': negative_score
-                }
+        return {
+            'text_length': len(text),
+            'word_count': len(text.split()),
+            'detected_intents': intents,
+            'sentiment': sentiment,
+            'sentiment_scores': {
+                'positive': positive_score,
+                'negative': negative_score
             }
-            
-            return MIAPResponse(
-                request_id=request.id,
-                success=True,
-                output_data=result,
-                confidence=0.75,
-                processing_time=0.0,  # Will be set by registry
-                metadata={'module': 'nlp_core', 'version': '1.0'}
-            )
-            
+        }
+        
+    def _response(self, request: MIAPRequest, result: Dict[str, Any]) -> MIAPResponse:
+        return MIAPResponse(
+            request_id=request.id,
+            success=True,
+            output_data=result,
+            confidence=0.75,
+            processing_time=0.0,  # Will be set by registry
+            metadata={'module': 'nlp_core', 'version': '1.0'}
+        )
+        
+    @staticmethod
+    def _error_response(request: MIAPRequest, error: Exception) -> MIAPResponse:
+        return MIAPResponse(
+            request_id=request.id,
+            success=False,
+            output_data=str(error),
+            confidence=0.0,
+            processing_time=0.0,
+            metadata={'error': str(error)}
+        )
+        
+    async def process(self, request: MIAPRequest) -> MIAPResponse:
+        """Process natural language input"""
+        try:
+            return self._response(request, self.analyze_text(str(request.input_data)))
         except Exception as e:
-            return MIAPResponse(
-                request_id=request.id,
-                success=False,
-                output_data=str(e),
-                confidence=0.0,
-                processing_time=0.0,
-                metadata={'error': str(e)}
-            )
+            return self._error_response(request, e)
+            
+    async def process_batch(self, requests: List[MIAPRequest]) -> List[MIAPResponse]:
+        """Process a batch of inputs, analyzing each distinct text once"""
+        analyses: Dict[str, Dict[str, Any]] = {}
+        responses = []
+        for request in requests:
+            try:
+                text = str(request.input_data)
+                result = analyses.get(text)
+                if result is None:
+                    result = analyses[text] = self.analyze_text(text)
+                # Each response owns its output: callers may mutate it
+                responses.append(self._response(request, copy.deepcopy(result)))
+            except Exception as e:
+                responses.append(self._error_response(request, e))
+        return responses
 
 # ============================================================================
 # 🏃‍♂️ MAIN EXECUTION
@@ -18,7 +18,7 @@ import logging
 import time
 import re
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from datetime import datetime
 import socket
 
@@ -76,52 +76,56 @@ class GeoIntelligenceModule(IntelligenceModule):
     def __init__(self):
         super().__init__(
             module_id="geo_intelligence",
-            capabilities=["ip_analysis", "geo_location", "threat_mapping", "risk_assessment"]
+            capabilities=["ip_analysis", "geo_location", "threat_mapping", "risk_assessment"],
+            input_predicates=["needs_ip"]
         )
         self.suspicious_countries = ["CN", "RU", "KP", "IR"]  # Example suspicious countries
         self.known_threat_ips = set()
         
+    def _locate(self, ip_address: str) -> GeoLocation:
+        """Geo lookup of a validated IP address"""
+        # For demo purposes, we'll simulate geo lookup
+        # In production, you'd use services like ipapi.co, MaxMind, etc.
+        
+        # Simulate geo lookup (replace with actual API call)
+        if ip_address.startswith("192.168.") or ip_address.startswith("10.") or ip_address.startswith("172."):
+            # Private IP
+            return GeoLocation(
+                ip=ip_address,
+                country="LOCAL",
+                region="Private Network", 
+                city="Local",
+                latitude=0.0,
+                longitude=0.0,
+                is_suspicious=False,
+                risk_score=0.1
+            )
+            
+        # Simulate public IP analysis
+        # This would normally be an API call to ipapi.co or similar
+        simulated_countries = ["US", "CA", "GB", "DE", "FR", "CN", "RU", "JP"]
+        import random
+        country = random.choice(simulated_countries)
+        
+        return GeoLocation(
+            ip=ip_address,
+            country=country,
+            region="Simulated Region",
+            city="Simulated City", 
+            latitude=40.7128,
+            longitude=-74.0060,
+            is_suspicious=country in self.suspicious_countries,
+            risk_score=0.8 if country in self.suspicious_countries else 0.2
+        )
+        
     async def analyze_ip(self, ip_address: str) -> GeoLocation:
         """Analyze IP address for geographic and threat intelligence"""
         try:
-            # For demo purposes, we'll simulate geo lookup
-            # In production, you'd use services like ipapi.co, MaxMind, etc.
-            
             # Basic IP validation
             if not self._is_valid_ip(ip_address):
                 raise ValueError(f"Invalid IP address: {ip_address}")
                 
-            # Simulate geo lookup (replace with actual API call)
-            if ip_address.startswith("192.168.") or ip_address.startswith("10.") or ip_address.startswith("172."):
-                # Private IP
-                geo_data = GeoLocation(
-                    ip=ip_address,
-                    country="LOCAL",
-                    region="Private Network", 
-                    city="Local",
-                    latitude=0.0,
-                    longitude=0.0,
-                    is_suspicious=False,
-                    risk_score=0.1
-                )
-            else:
-                # Simulate public IP analysis
-                # This would normally be an API call to ipapi.co or similar
-                simulated_countries = ["US", "CA", "GB", "DE", "FR", "CN", "RU", "JP"]
-                import random
-                country = random.choice(simulated_countries)
-                
-                geo_data = GeoLocation(
-                    ip=ip_address,
-                    country=country,
-                    region="Simulated Region",
-                    city="Simulated City", 
-                    latitude=40.7128,
-                    longitude=-74.0060,
-                    is_suspicious=country in self.suspicious_countries,
-                    risk_score=0.8 if country in self.suspicious_countries else 0.2
-                )
-                
+            geo_data = self._locate(ip_address)
             logger.info(f"🌍 Geo analysis for {ip_address}: {geo_data.country} (Risk: {geo_data.risk_score:.2f})")
             return geo_data
             
@@ -137,31 +141,52 @@ class GeoIntelligenceModule(IntelligenceModule):
         except socket.error:
             return False
             
+    @staticmethod
+    def _requested_ip(request: MIAPRequest) -> Optional[str]:
+        """IP address of an analyze_ip request ('ip' or 'ip_address', as in the needs_ip predicate), None otherwise"""
+        if isinstance(request.input_data, dict) and request.input_data.get('action') == 'analyze_ip':
+            return request.input_data.get('ip') or request.input_data.get('ip_address') or None
+        return None
+        
+    @staticmethod
+    def _ip_response(request: MIAPRequest, geo_data: GeoLocation) -> MIAPResponse:
+        return MIAPResponse(
+            request_id=request.id,
+            success=True,
+            output_data={
+                'geo_location': asdict(geo_data),  # a copy per response, never the shared lookup
+                'threat_assessment': {
+                    'is_threat': geo_data.is_suspicious,
+                    'risk_score': geo_data.risk_score,
+                    'recommended_action': 'BLOCK' if geo_data.risk_score > 0.7 else 'MONITOR'
+                }
+            },
+            confidence=0.85,
+            processing_time=0.0,
+            metadata={'module': 'geo_intelligence', 'analysis_type': 'ip_location'}
+        )
+        
+    @staticmethod
+    def _error_response(request: MIAPRequest, error: Exception) -> MIAPResponse:
+        return MIAPResponse(
+            request_id=request.id,
+            success=False,
+            output_data=str(error),
+            confidence=0.0,
+            processing_time=0.0,
+            metadata={'error': str(error)}
+        )
+        
     async def process(self, request: MIAPRequest) -> MIAPResponse:
         """Process geo intelligence requests"""
         try:
             if request.input_data.get('action') == 'analyze_ip':
-                ip_address = request.input_data.get('ip')
+                ip_address = self._requested_ip(request)
                 if not ip_address:
                     raise ValueError("IP address required for analysis")
                     
                 geo_data = await self.analyze_ip(ip_address)
-                
-                return MIAPResponse(
-                    request_id=request.id,
-                    success=True,
-                    output_data={
-                        'geo_location': geo_data.__dict__,
-                        'threat_assessment': {
-                            'is_threat': geo_data.is_suspicious,
-                            'risk_score': geo_data.risk_score,
-                            'recommended_action': 'BLOCK' if geo_data.risk_score > 0.7 else 'MONITOR'
-                        }
-                    },
-                    confidence=0.85,
-                    processing_time=0.0,
-                    metadata={'module': 'geo_intelligence', 'analysis_type': 'ip_location'}
-                )
+                return self._ip_response(request, geo_data)
             else:
                 # Generic geographic analysis
                 result = {
@@ -180,14 +205,32 @@ class GeoIntelligenceModule(IntelligenceModule):
                 )
                 
         except Exception as e:
-            return MIAPResponse(
-                request_id=request.id,
-                success=False,
-                output_data=str(e),
-                confidence=0.0,
-                processing_time=0.0,
-                metadata={'error': str(e)}
-            )
+            return self._error_response(request, e)
+            
+    async def process_batch(self, requests: List[MIAPRequest]) -> List[MIAPResponse]:
+        """Process a batch of requests, looking up each distinct IP address once"""
+        requested_ips = [self._requested_ip(request) for request in requests]
+        lookups: Dict[str, Any] = {}
+        for ip_address in dict.fromkeys(ip for ip in requested_ips if ip):
+            try:
+                if not self._is_valid_ip(ip_address):
+                    raise ValueError(f"Invalid IP address: {ip_address}")
+                lookups[ip_address] = self._locate(ip_address)
+            except Exception as e:
+                logger.error(f"❌ Geo analysis failed for {ip_address}: {e}")
+                lookups[ip_address] = e
+        if lookups:
+            logger.info(f"🌍 Geo batch analysis: {len(lookups)} distinct IPs for {len(requests)} requests")
+            
+        responses = []
+        for request, ip_address in zip(requests, requested_ips):
+            if ip_address is None:
+                responses.append(await self.process(request))
+            elif isinstance(lookups[ip_address], Exception):
+                responses.append(self._error_response(request, lookups[ip_address]))
+            else:
+                responses.append(self._ip_response(request, lookups[ip_address]))
+        return responses
 
 # ============================================================================
 # 🧠 INTENT ANALYSIS MODULE
@@ -199,7 +242,8 @@ class IntentAnalysisModule(IntelligenceModule):
     def __init__(self):
         super().__init__(
             module_id="intent_analyzer",
-            capabilities=["intent_detection", "threat_analysis", "behavioral_analysis", "risk_scoring"]
+            capabilities=["intent_detection", "threat_analysis", "behavioral_analysis", "risk_scoring"],
+            input_predicates=["needs_message"]
         )
         
         # Threat pattern definitions
@@ -226,51 +270,66 @@ class IntentAnalysisModule(IntelligenceModule):
             ]
         }
         
-    async def analyze_intent(self, message: str, context: Dict[str, Any] = None) -> IntentAnalysis:
-        """Perform comprehensive intent analysis on message"""
-        try:
-            message_lower = message.lower()
-            detected_threats = []
-            max_confidence = 0.0
-            highest_risk_type = "UNKNOWN"
-            
-            # Check for threat patterns
-            for threat_type, patterns in self.threat_patterns.items():
+        # Compiled once; the combined pattern lets benign messages skip the per-pattern scan
+        self.compiled_patterns = {
+            threat_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for threat_type, patterns in self.threat_patterns.items()
+        }
+        self.any_threat_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for patterns in self.threat_patterns.values() for pattern in patterns),
+            re.IGNORECASE
+        )
+        
+    def classify_intent(self, message: str) -> IntentAnalysis:
+        """Match a message against the threat patterns"""
+        message_lower = message.lower()
+        detected_threats = []
+        max_confidence = 0.0
+        highest_risk_type = "UNKNOWN"
+        
+        # Check for threat patterns
+        if self.any_threat_pattern.search(message_lower):
+            for threat_type, patterns in self.compiled_patterns.items():
                 for pattern in patterns:
-                    if re.search(pattern, message_lower, re.IGNORECASE):
+                    matches = pattern.findall(message_lower)
+                    if matches:
                         detected_threats.append(threat_type)
-                        confidence = min(0.9, len(re.findall(pattern, message_lower, re.IGNORECASE)) * 0.3)
+                        confidence = min(0.9, len(matches) * 0.3)
                         if confidence > max_confidence:
                             max_confidence = confidence
                             highest_risk_type = threat_type
                             
-            # Determine risk level
-            if max_confidence >= 0.8:
-                risk_level = "CRITICAL"
-                recommended_action = "BLOCK_IMMEDIATELY"
-            elif max_confidence >= 0.6:
-                risk_level = "HIGH"
-                recommended_action = "QUARANTINE_AND_ANALYZE"
-            elif max_confidence >= 0.4:
-                risk_level = "MEDIUM"
-                recommended_action = "MONITOR_CLOSELY"
-            elif max_confidence >= 0.2:
-                risk_level = "LOW"
-                recommended_action = "LOG_AND_CONTINUE"
-            else:
-                risk_level = "MINIMAL"
-                recommended_action = "NORMAL_PROCESSING"
-                
-            # Create analysis result
-            analysis = IntentAnalysis(
-                message=message,
-                intent_type=highest_risk_type if detected_threats else "BENIGN",
-                risk_level=risk_level,
-                suspicious_patterns=detected_threats,
-                confidence=max_confidence,
-                recommended_action=recommended_action
-            )
+        # Determine risk level
+        if max_confidence >= 0.8:
+            risk_level = "CRITICAL"
+            recommended_action = "BLOCK_IMMEDIATELY"
+        elif max_confidence >= 0.6:
+            risk_level = "HIGH"
+            recommended_action = "QUARANTINE_AND_ANALYZE"
+        elif max_confidence >= 0.4:
+            risk_level = "MEDIUM"
+            recommended_action = "MONITOR_CLOSELY"
+        elif max_confidence >= 0.2:
+            risk_level = "LOW"
+            recommended_action = "LOG_AND_CONTINUE"
+        else:
+            risk_level = "MINIMAL"
+            recommended_action = "NORMAL_PROCESSING"
             
+        # Create analysis result
+        return IntentAnalysis(
+            message=message,
+            intent_type=highest_risk_type if detected_threats else "BENIGN",
+            risk_level=risk_level,
+            suspicious_patterns=detected_threats,
+            confidence=max_confidence,
+            recommended_action=recommended_action
+        )
+        
+    async def analyze_intent(self, message: str, context: Dict[str, Any] = None) -> IntentAnalysis:
+        """Perform comprehensive intent analysis on message"""
+        try:
+            analysis = self.classify_intent(message)
             logger.info(f"🧠 Intent analysis: {analysis.intent_type} (Risk: {analysis.risk_level}, Confidence: {analysis.confidence:.2f})")
             return analysis
             
@@ -278,40 +337,70 @@ class IntentAnalysisModule(IntelligenceModule):
             logger.error(f"❌ Intent analysis failed: {e}")
             raise
             
+    @staticmethod
+    def _message_of(request: MIAPRequest) -> str:
+        if isinstance(request.input_data, dict) and 'message' in request.input_data:
+            return request.input_data['message']
+        return str(request.input_data)
+        
+    @staticmethod
+    def _response(request: MIAPRequest, analysis: IntentAnalysis) -> MIAPResponse:
+        return MIAPResponse(
+            request_id=request.id,  
+            success=True,
+            output_data={
+                'intent_analysis': asdict(analysis),  # a copy per response, never the shared analysis
+                'threat_detected': len(analysis.suspicious_patterns) > 0,
+                'security_recommendation': analysis.recommended_action
+            },
+            confidence=analysis.confidence,
+            processing_time=0.0,
+            metadata={'module': 'intent_analyzer', 'patterns_detected': len(analysis.suspicious_patterns)}
+        )
+        
+    @staticmethod
+    def _error_response(request: MIAPRequest, error: Exception) -> MIAPResponse:
+        return MIAPResponse(
+            request_id=request.id,
+            success=False,
+            output_data=str(error),
+            confidence=0.0,
+            processing_time=0.0,
+            metadata={'error': str(error)}
+        )
+        
     async def process(self, request: MIAPRequest) -> MIAPResponse:
         """Process intent analysis requests"""
         try:
             if isinstance(request.input_data, dict) and 'message' in request.input_data:
-                message = request.input_data['message']
                 context = request.input_data.get('context', {})
             else:
-                message = str(request.input_data)
                 context = request.context
                 
-            analysis = await self.analyze_intent(message, context)
-            
-            return MIAPResponse(
-                request_id=request.id,  
-                success=True,
-                output_data={
-                    'intent_analysis': analysis.__dict__,
-                    'threat_detected': len(analysis.suspicious_patterns) > 0,
-                    'security_recommendation': analysis.recommended_action
-                },
-                confidence=analysis.confidence,
-                processing_time=0.0,
-                metadata={'module': 'intent_analyzer', 'patterns_detected': len(analysis.suspicious_patterns)}
-            )
+            analysis = await self.analyze_intent(self._message_of(request), context)
+            return self._response(request, analysis)
             
         except Exception as e:
-            return MIAPResponse(
-                request_id=request.id,
-                success=False,
-                output_data=str(e),
-                confidence=0.0,
-                processing_time=0.0,
-                metadata={'error': str(e)}
-            )
+            return self._error_response(request, e)
+            
+    async def process_batch(self, requests: List[MIAPRequest]) -> List[MIAPResponse]:
+        """Analyze a batch of messages, classifying each distinct message once"""
+        analyses: Dict[str, IntentAnalysis] = {}
+        responses = []
+        for request in requests:
+            try:
+                message = self._message_of(request)
+                analysis = analyses.get(message)
+                if analysis is None:
+                    analysis = analyses[message] = self.classify_intent(message)
+                responses.append(self._response(request, analysis))
+            except Exception as e:
+                logger.error(f"❌ Intent analysis failed: {e}")
+                responses.append(self._error_response(request, e))
+                
+        threats = sum(1 for analysis in analyses.values() if analysis.suspicious_patterns)
+        logger.info(f"🧠 Intent batch analysis: {len(requests)} requests, {len(analyses)} distinct messages, {threats} with threats")
+        return responses
 
 # ============================================================================
 # 🛡️ THREAT MONITORING MODULE
@@ -375,6 +464,11 @@ class ThreatMonitoringModule(IntelligenceModule):
                 
         return correlations
         
+    def is_cacheable(self, request: MIAPRequest) -> bool:
+        """Alert generation records new threats, so it is never served from cache"""
+        action = request.input_data.get('action', 'monitor') if isinstance(request.input_data, dict) else 'monitor'
+        return action != 'generate_alert'
+        
     async def process(self, request: MIAPRequest) -> MIAPResponse:
         """Process threat monitoring requests"""
         try:
@@ -0,0 +1,223 @@
+"""
+🧪 MIGI CORE - Behaviour tests
+
+Run:
+    python -m pytest -q test_migi_core.py
+"""
+
+import asyncio
+import logging
+import os
+from datetime import date, datetime
+
+import pytest
+
+from migi_core import (IntelligenceModule, IntelligenceRegistry, MIAPRequest, MIAPResponse,
+                       ProcessOffloadedModule, ResponseCache, _decode_message, _encode_message)
+
+logging.getLogger("MIGI_CORE").setLevel(logging.WARNING)
+
+class CountingModule(IntelligenceModule):
+    """Echo module that counts calls; requests with context['write'] are not cacheable"""
+
+    def __init__(self, module_id: str = "counter", delay: float = 0.0):
+        super().__init__(module_id=module_id, capabilities=["echo"])
+        self.delay = delay
+        self.calls = 0
+
+    async def process(self, request: MIAPRequest) -> MIAPResponse:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return MIAPResponse(
+            request_id=request.id,
+            success=True,
+            output_data={'echo': request.input_data, 'call': self.calls, 'items': [1, 2]},
+            confidence=1.0,
+            processing_time=0.0,
+            metadata={'module': self.module_id}
+        )
+
+    def is_cacheable(self, request: MIAPRequest) -> bool:
+        return not request.context.get('write')
+
+def make_request(request_id: str, input_data, module_target: str = "counter", **context) -> MIAPRequest:
+    return MIAPRequest(id=request_id, module_target=module_target, input_data=input_data, context=context)
+
+# ============================================================================
+# 🗃️ RESPONSE CACHE (user-046)
+# ============================================================================
+
+def test_cache_hands_out_private_copies():
+    async def scenario():
+        cache, module = ResponseCache(), CountingModule()
+        compute = lambda request: (lambda: module.process(request))
+        first_request, second_request = make_request("r1", "hello"), make_request("r2", "hello")
+
+        first = await cache.get_or_compute(first_request, compute(first_request))
+        first.output_data['items'].append(3)
+        first.metadata['tampered'] = True
+        second = await cache.get_or_compute(second_request, compute(second_request))
+        return module.calls, first, second
+
+    calls, first, second = asyncio.run(scenario())
+    assert calls == 1
+    assert second.request_id == "r2"
+    assert second.output_data['items'] == [1, 2]
+    assert second.metadata == {'module': 'counter', 'cache': 'hit'}
+    assert first.request_id == "r1"
+
+def test_cache_entries_expire_after_their_ttl():
+    async def scenario():
+        cache, module = ResponseCache(module_ttls={"counter": 0.05}), CountingModule()
+        request = make_request("r", "hello")
+        await cache.get_or_compute(request, lambda: module.process(request))
+        await cache.get_or_compute(request, lambda: module.process(request))
+        await asyncio.sleep(0.1)
+        await cache.get_or_compute(request, lambda: module.process(request))
+        return module.calls, cache.stats
+
+    calls, stats = asyncio.run(scenario())
+    assert calls == 2
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+
+def test_identical_inflight_requests_share_one_computation():
+    async def scenario():
+        cache, module = ResponseCache(), CountingModule(delay=0.05)
+        requests = [make_request(f"r{i}", "hello") for i in range(5)]
+        responses = await asyncio.gather(*(
+            cache.get_or_compute(request, lambda request=request: module.process(request))
+            for request in requests
+        ))
+        return module.calls, responses
+
+    calls, responses = asyncio.run(scenario())
+    assert calls == 1
+    assert [response.request_id for response in responses] == [f"r{i}" for i in range(5)]
+    assert sum(response.metadata.get('cache') == 'shared' for response in responses) == 4
+    assert len({id(response.output_data) for response in responses}) == 5
+
+def test_invalidation_during_computation_discards_the_stale_result():
+    async def scenario():
+        cache, module = ResponseCache(), CountingModule(delay=0.05)
+        request = make_request("r", "hello")
+        pending = asyncio.ensure_future(cache.get_or_compute(request, lambda: module.process(request)))
+        await asyncio.sleep(0.01)
+        cache.invalidate("counter")
+        await pending
+        await cache.get_or_compute(request, lambda: module.process(request))
+        return module.calls
+
+    assert asyncio.run(scenario()) == 2
+
+def test_uncacheable_request_invalidates_the_module_cache():
+    async def scenario():
+        registry, module = IntelligenceRegistry(), CountingModule()
+        registry.register_module(module)
+        await registry.initialize_all_modules()
+        registry.enable_response_cache()
+
+        await registry.route_request(make_request("r1", "hello"))
+        await registry.route_request(make_request("r2", "hello"))
+        await registry.route_request(make_request("w", "update", write=True))
+        await registry.route_request(make_request("r3", "hello"))
+        return module.calls
+
+    # r1 computes, r2 hits, the write always runs, r3 recomputes after the write
+    assert asyncio.run(scenario()) == 3
+
+def test_timed_out_joiner_gets_a_timeout_response():
+    async def scenario():
+        cache, module = ResponseCache(), CountingModule(delay=0.2)
+        leader = make_request("leader", "hello")
+        joiner = MIAPRequest(id="joiner", module_target="counter", input_data="hello", context={}, timeout=0.05)
+        leading = asyncio.ensure_future(cache.get_or_compute(leader, lambda: module.process(leader)))
+        await asyncio.sleep(0)
+        joined = await cache.get_or_compute(joiner, lambda: module.process(joiner))
+        return joined, await leading
+
+    joined, led = asyncio.run(scenario())
+    assert not joined.success
+    assert joined.metadata == {'error': 'TIMEOUT', 'cache': 'shared'}
+    assert led.success
+
+# ============================================================================
+# ⚙️ PROCESS OFFLOADING - JSON wire format (user-050)
+# ============================================================================
+
+@pytest.mark.parametrize("value", [
+    {'text': 'hello', 'count': 3, 'ratio': 0.5, 'flag': True, 'nothing': None, 'list': [1, 'a', [2]]},
+    {'tuple': (1, (2, 3)), 'set': {1, 2}, 'frozenset': frozenset({'a', ('b', 1)})},
+    {'when': datetime(2024, 5, 1, 12, 30, 15, 123456), 'day': date(2024, 5, 1)},
+    {1: 'int key', (2, 3): 'tuple key', None: 'none key'},
+    {'__miap__': 'tuple', 'items': [1, 2]},  # looks like a wire tag, must stay a plain dict
+    [{'nested': [{(1, 2): {date(2020, 1, 1)}}]}]
+])
+def test_wire_format_round_trips_values(value):
+    restored = _decode_message(_encode_message({'payload': value}))['payload']
+    assert restored == value
+    assert type(restored) is type(value)
+
+def test_wire_format_restores_nested_types():
+    message = {'payload': {'pair': (1, [2, (3, 4)]), 'seen': {(1, 2)}}}
+
+    restored = _decode_message(_encode_message(message))['payload']
+
+    assert isinstance(restored['pair'], tuple)
+    assert isinstance(restored['pair'][1][1], tuple)
+    assert next(iter(restored['seen'])) == (1, 2)
+
+class TypedOutputModule(IntelligenceModule):
+    """Returns non-JSON-native types and the pid of the process it ran in"""
+
+    def __init__(self, ready: bool = True):
+        super().__init__(module_id="typed", capabilities=["typed"])
+        self.ready = ready
+
+    async def initialize(self) -> bool:
+        self.active = self.ready
+        return self.ready
+
+    async def process(self, request: MIAPRequest) -> MIAPResponse:
+        return MIAPResponse(
+            request_id=request.id,
+            success=True,
+            output_data={'input': request.input_data, 'pid': os.getpid(),
+                         'stamp': datetime(2024, 1, 2, 3, 4, 5), 'tags': {'a', 'b'}},
+            confidence=0.9,
+            processing_time=0.0,
+            metadata={'shape': (2, 3)}
+        )
+
+def test_offloaded_module_runs_in_a_worker_and_keeps_types():
+    async def scenario():
+        module = ProcessOffloadedModule(TypedOutputModule())
+        assert await module.initialize()
+        try:
+            single = await module.process(make_request("one", {'pair': (1, 2)}, module_target="typed"))
+            batch = await module.process_batch([make_request(f"b{i}", i, module_target="typed") for i in range(3)])
+            worker = module.worker
+        finally:
+            await module.shutdown()
+        return single, batch, worker
+
+    single, batch, worker = asyncio.run(scenario())
+    assert single.request_id == "one"
+    assert single.output_data['input'] == {'pair': (1, 2)}
+    assert single.output_data['pid'] != os.getpid()
+    assert single.output_data['stamp'] == datetime(2024, 1, 2, 3, 4, 5)
+    assert single.output_data['tags'] == {'a', 'b'}
+    assert single.metadata == {'shape': (2, 3)}
+    assert [response.output_data['input'] for response in batch] == [0, 1, 2]
+    assert not worker.is_alive()
+
+def test_offloaded_module_cleans_up_when_initialization_fails():
+    async def scenario():
+        module = ProcessOffloadedModule(TypedOutputModule(ready=False))
+        return await module.initialize(), module
+
+    ready, module = asyncio.run(scenario())
+    assert not ready
+    assert not module.active
+    assert module.worker is None and module.conn is None
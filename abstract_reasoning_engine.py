@@ -15,8 +15,15 @@ Implementuje:
 Cel: +16 punktów AGI (4 pkt → 20 pkt jakości rozumowania)
 """
 
+import asyncio
+import functools
+import gc
 import logging
-from typing import Dict, List, Optional, Any, Tuple, Union, Set
+import threading
+from concurrent.futures import (Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor,
+                                FIRST_COMPLETED, wait)
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Any, Tuple, Union, Set, Iterable, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
@@ -26,7 +33,10 @@ import json
 from collections import defaultdict, deque
 import random
 import math
+import sqlite3
+import time
 import networkx as nx
+from heapq import heappush, heappop
 from itertools import combinations, permutations
 
 # Konfiguracja loggingu
@@ -63,6 +73,11 @@ class LogicalStatement:
     confidence: float = 0.5
     source: str = "unknown"
     timestamp: datetime = field(default_factory=datetime.now)
+    
+    @property
+    def parsed(self) -> "ParsedStatement":
+        """Sparsowana postać treści (cache LRU w parse_statement)"""
+        return parse_statement(self.content)
 
 @dataclass
 class ReasoningRule:
@@ -100,6 +115,69 @@ class ReasoningTrace:
     success: bool
     timestamp: datetime = field(default_factory=datetime.now)
 
+@dataclass
+class CompactInference:
+    """Zwięzły wynik wnioskowania wsadowego (reason_many)"""
+    success: bool
+    conclusion: Optional[str] = None
+    confidence: float = 0.0
+    source: Optional[str] = None
+    predicates: List[str] = field(default_factory=list)
+
+class CausalGraph(nx.DiGraph):
+    """
+    Graf przyczynowy z licznikiem wersji struktury
+
+    Wersja rośnie przy każdym dodaniu lub usunięciu węzła albo krawędzi, także
+    wykonanym bezpośrednio na kb.causal_graph, więc indeksy osiągalności bazy
+    wiedzy wykrywają zmiany bez jawnego invalidate_causal_index(). Zmiany atrybutów
+    krawędzi (weight itd.) nie zmieniają struktury i nie podbijają wersji.
+    """
+    
+    def __init__(self, incoming_graph_data=None, **attr):
+        self.version = 0
+        super().__init__(incoming_graph_data, **attr)
+    
+    def add_node(self, node_for_adding, **attr):
+        super().add_node(node_for_adding, **attr)
+        self.version += 1
+    
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        super().add_nodes_from(nodes_for_adding, **attr)
+        self.version += 1
+    
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+        self.version += 1
+    
+    def add_edges_from(self, ebunch_to_add, **attr):
+        super().add_edges_from(ebunch_to_add, **attr)
+        self.version += 1
+    
+    def remove_node(self, n):
+        super().remove_node(n)
+        self.version += 1
+    
+    def remove_nodes_from(self, nodes):
+        super().remove_nodes_from(nodes)
+        self.version += 1
+    
+    def remove_edge(self, u, v):
+        super().remove_edge(u, v)
+        self.version += 1
+    
+    def remove_edges_from(self, ebunch):
+        super().remove_edges_from(ebunch)
+        self.version += 1
+    
+    def clear_edges(self):
+        super().clear_edges()
+        self.version += 1
+    
+    def clear(self):
+        super().clear()
+        self.version += 1
+
 class SymbolicKnowledgeBase:
     """Baza wiedzy symbolicznej"""
     
@@ -108,12 +186,21 @@ class SymbolicKnowledgeBase:
         self.rules: Dict[str, ReasoningRule] = {}
         self.concepts: Dict[str, Dict[str, Any]] = {}
         self.hierarchies: Dict[str, Set[str]] = defaultdict(set)  # parent -> children
-        self.causal_graph = nx.DiGraph()
+        self.causal_graph = CausalGraph()
+
+        # Indeks osiągalności grafu przyczynowego (bitsety przodków), budowany leniwie
+        self._causal_version = 0
+        self._indexed_causal_graph: Optional[nx.DiGraph] = None
+        self._ancestor_index_version: Optional[Tuple[int, Optional[int]]] = None
+        self._causal_node_index: Dict[str, int] = {}
+        self._causal_nodes: List[str] = []
+        self._ancestor_bits: Dict[str, int] = {}
         logger.info("Zainicjalizowano bazę wiedzy symbolicznej")
     
     def add_statement(self, statement: LogicalStatement) -> str:
         """Dodaje stwierdzenie do bazy wiedzy"""
         self.statements[statement.id] = statement
+        statement.parsed  # parsowanie treści raz, przy dodaniu
         
         # Automatyczne wykrywanie konceptów
         for predicate in statement.predicates:
@@ -141,7 +228,80 @@ class SymbolicKnowledgeBase:
             confidence=relation.confidence,
             evidence=relation.evidence_count
         )
-    
+        self.invalidate_causal_index()
+
+    def invalidate_causal_index(self):
+        """Unieważnia indeks przodków po zmianie grafu przyczynowego"""
+        self._causal_version += 1
+
+    def causal_index_key(self) -> Tuple[int, Optional[int]]:
+        """
+        Klucz ważności indeksów zbudowanych na grafie przyczynowym: (wersja bazy,
+        wersja grafu). Podmieniony graf albo graf bez licznika wersji (zwykły
+        nx.DiGraph, którego zmian nie da się wykryć) zawsze daje nowy klucz.
+        """
+        graph = self.causal_graph
+        graph_version = getattr(graph, 'version', None)
+        if graph is not self._indexed_causal_graph or graph_version is None:
+            self._indexed_causal_graph = graph
+            self._causal_version += 1
+        return self._causal_version, graph_version
+
+    def _rebuild_ancestor_index(self):
+        """
+        Buduje bitsety przodków dla wszystkich węzłów grafu przyczynowego.
+        Graf jest kondensowany do DAG-u silnie spójnych składowych, więc cykle
+        są obsługiwane tak samo jak w nx.ancestors (węzeł nie jest swoim przodkiem).
+        """
+        graph = self.causal_graph
+        self._causal_nodes = list(graph.nodes)
+        self._causal_node_index = {node: i for i, node in enumerate(self._causal_nodes)}
+
+        condensed = nx.condensation(graph)
+        members = condensed.graph["mapping"]
+        component_bits = {}
+        for component in condensed.nodes:
+            bits = 0
+            for node in condensed.nodes[component]["members"]:
+                bits |= 1 << self._causal_node_index[node]
+            component_bits[component] = bits
+
+        # Przodkowie składowej = przodkowie i członkowie składowych poprzedzających
+        component_ancestors = {}
+        for component in nx.topological_sort(condensed):
+            bits = 0
+            for predecessor in condensed.predecessors(component):
+                bits |= component_ancestors[predecessor] | component_bits[predecessor]
+            component_ancestors[component] = bits
+
+        ancestor_bits = {}
+        for node, component in members.items():
+            bits = component_ancestors[component]
+            if len(condensed.nodes[component]["members"]) > 1:
+                bits |= component_bits[component] & ~(1 << self._causal_node_index[node])
+            ancestor_bits[node] = bits
+
+        self._ancestor_bits = ancestor_bits
+
+    def get_ancestor_bits(self, node: str) -> int:
+        """Zwraca bitset przodków węzła w grafie przyczynowym (z cache)"""
+        key = self.causal_index_key()
+        if self._ancestor_index_version != key:
+            self._rebuild_ancestor_index()
+            self._ancestor_index_version = key
+        if node not in self._ancestor_bits:
+            raise nx.NetworkXError(f"The node {node} is not in the graph.")
+        return self._ancestor_bits[node]
+
+    def decode_causal_bits(self, bits: int) -> List[str]:
+        """Zamienia bitset na listę węzłów grafu przyczynowego"""
+        nodes = []
+        while bits:
+            lowest = bits & -bits
+            nodes.append(self._causal_nodes[lowest.bit_length() - 1])
+            bits ^= lowest
+        return nodes
+
     def create_concept_hierarchy(self, parent: str, children: List[str]):
         """Tworzy hierarchię konceptów (is-a relationships)"""
         self.hierarchies[parent].update(children)
@@ -162,6 +322,464 @@ class SymbolicKnowledgeBase:
         """Zwraca wszystkich potomków konceptu"""
         return self.hierarchies.get(concept, set())
 
+class PersistentSymbolicKnowledgeBase(SymbolicKnowledgeBase):
+    """
+    Baza wiedzy symbolicznej trwale zapisana w SQLite
+
+    Sekcje (stwierdzenia, reguły, koncepty, hierarchie, graf przyczynowy) ładowane są
+    leniwie przy pierwszym dostępie, a nowe fakty zapisywane od razu do bazy (write-through).
+    Każda operacja otwiera własne połączenie, a plik działa w trybie WAL, więc wiele
+    procesów może współdzielić jedną bazę; obiekt przekazywany do procesu roboczego
+    (pickle) nie zabiera załadowanych sekcji, a zapytania query_* idą wprost do SQL.
+    """
+    
+    _SECTIONS = ("statements", "rules", "concepts", "hierarchies", "causal_graph")
+    
+    def __init__(self, db_path: str = "abstract_reasoning_kb.db"):
+        self.db_path = db_path
+        self._loaded: Set[str] = set()
+        super().__init__()
+        self._unload_sections()
+        self.init_database()
+    
+    def init_database(self):
+        """Inicjalizacja tabel i indeksów bazy SQLite"""
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS statements (
+                    id TEXT PRIMARY KEY,
+                    content TEXT,
+                    variables TEXT,
+                    predicates TEXT,
+                    truth_value INTEGER,
+                    confidence REAL,
+                    source TEXT,
+                    timestamp TEXT
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS statement_predicates (
+                    statement_id TEXT,
+                    predicate TEXT,
+                    PRIMARY KEY (statement_id, predicate)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_statement_predicates ON statement_predicates (predicate)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS rules (
+                    rule_id TEXT PRIMARY KEY,
+                    rule_type TEXT,
+                    premises TEXT,
+                    conclusion TEXT,
+                    confidence REAL,
+                    usage_count INTEGER,
+                    success_rate REAL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS concepts (
+                    name TEXT PRIMARY KEY,
+                    parent TEXT
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS hierarchy_edges (
+                    parent TEXT,
+                    child TEXT,
+                    PRIMARY KEY (parent, child)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_hierarchy_child ON hierarchy_edges (child)')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS causal_edges (
+                    cause TEXT,
+                    effect TEXT,
+                    strength REAL,
+                    delay REAL,
+                    confidence REAL,
+                    evidence INTEGER,
+                    PRIMARY KEY (cause, effect)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_causal_effect ON causal_edges (effect)')
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def _unload_sections(self):
+        """Zapomina załadowane sekcje - zostaną ponownie wczytane przy następnym dostępie"""
+        self._statements = None
+        self._rules = None
+        self._concepts = None
+        self._hierarchies = None
+        self._causal_graph = None
+        self._loaded = set()
+        self._ancestor_bits = {}
+        self._indexed_causal_graph = None
+        self._ancestor_index_version = None
+        self.invalidate_causal_index()
+    
+    def refresh(self):
+        """Odświeża widok bazy (np. po zapisach wykonanych przez inne procesy)"""
+        self._unload_sections()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Do innego procesu trafia tylko ścieżka bazy - sekcje wczyta on sam, gdy będą potrzebne
+        state = self.__dict__.copy()
+        for section in self._SECTIONS:
+            state[f"_{section}"] = None
+        state["_loaded"] = set()
+        state["_ancestor_bits"] = {}
+        state["_indexed_causal_graph"] = None
+        state["_ancestor_index_version"] = None
+        return state
+    
+    # Leniwie ładowane sekcje
+    
+    @property
+    def statements(self) -> Dict[str, LogicalStatement]:
+        if "statements" not in self._loaded:
+            self._load_statements()
+        return self._statements
+    
+    @statements.setter
+    def statements(self, value: Dict[str, LogicalStatement]):
+        self._statements = value
+        self._loaded.add("statements")
+    
+    @property
+    def rules(self) -> Dict[str, ReasoningRule]:
+        if "rules" not in self._loaded:
+            self._load_rules()
+        return self._rules
+    
+    @rules.setter
+    def rules(self, value: Dict[str, ReasoningRule]):
+        self._rules = value
+        self._loaded.add("rules")
+    
+    @property
+    def concepts(self) -> Dict[str, Dict[str, Any]]:
+        if "concepts" not in self._loaded:
+            self._load_concepts()
+        return self._concepts
+    
+    @concepts.setter
+    def concepts(self, value: Dict[str, Dict[str, Any]]):
+        self._concepts = value
+        self._loaded.add("concepts")
+    
+    @property
+    def hierarchies(self) -> Dict[str, Set[str]]:
+        if "hierarchies" not in self._loaded:
+            self._load_hierarchies()
+        return self._hierarchies
+    
+    @hierarchies.setter
+    def hierarchies(self, value: Dict[str, Set[str]]):
+        self._hierarchies = value
+        self._loaded.add("hierarchies")
+    
+    @property
+    def causal_graph(self) -> nx.DiGraph:
+        if "causal_graph" not in self._loaded:
+            self._load_causal_graph()
+        return self._causal_graph
+    
+    @causal_graph.setter
+    def causal_graph(self, value: nx.DiGraph):
+        self._causal_graph = value
+        self._loaded.add("causal_graph")
+    
+    def _load_statements(self):
+        with self._connect() as conn:
+            rows = conn.execute('SELECT * FROM statements').fetchall()
+        self.statements = {row[0]: self._statement_from_row(row) for row in rows}
+        logger.info(f"Wczytano {len(rows)} stwierdzeń z {self.db_path}")
+    
+    def _load_rules(self):
+        with self._connect() as conn:
+            rows = conn.execute('SELECT * FROM rules').fetchall()
+        self.rules = {row[0]: self._rule_from_row(row) for row in rows}
+        logger.info(f"Wczytano {len(rows)} reguł z {self.db_path}")
+    
+    def _load_concepts(self):
+        with self._connect() as conn:
+            rows = conn.execute('SELECT name, parent FROM concepts').fetchall()
+        self.concepts = {name: self._concept_entry(parent) for name, parent in rows}
+    
+    def _load_hierarchies(self):
+        hierarchies = defaultdict(set)
+        with self._connect() as conn:
+            for parent, child in conn.execute('SELECT parent, child FROM hierarchy_edges'):
+                hierarchies[parent].add(child)
+        self.hierarchies = hierarchies
+    
+    def _load_causal_graph(self):
+        graph = CausalGraph()
+        with self._connect() as conn:
+            for cause, effect, strength, delay, confidence, evidence in conn.execute('SELECT * FROM causal_edges'):
+                graph.add_edge(cause, effect, weight=strength, delay=delay,
+                               confidence=confidence, evidence=evidence)
+        self.causal_graph = graph
+        self.invalidate_causal_index()
+        logger.info(f"Wczytano {graph.number_of_edges()} relacji przyczynowych z {self.db_path}")
+    
+    # Serializacja
+    
+    @staticmethod
+    def _statement_to_dict(statement: LogicalStatement) -> Dict[str, Any]:
+        return {
+            "id": statement.id,
+            "content": statement.content,
+            "variables": statement.variables,
+            "predicates": statement.predicates,
+            "truth_value": statement.truth_value,
+            "confidence": statement.confidence,
+            "source": statement.source,
+            "timestamp": statement.timestamp.isoformat()
+        }
+    
+    @staticmethod
+    def _statement_from_dict(data: Dict[str, Any]) -> LogicalStatement:
+        return LogicalStatement(
+            id=data["id"],
+            content=data["content"],
+            variables=data["variables"],
+            predicates=data["predicates"],
+            truth_value=data["truth_value"],
+            confidence=data["confidence"],
+            source=data["source"],
+            timestamp=datetime.fromisoformat(data["timestamp"])
+        )
+    
+    @staticmethod
+    def _statement_from_row(row: Tuple) -> LogicalStatement:
+        return LogicalStatement(
+            id=row[0],
+            content=row[1],
+            variables=json.loads(row[2]),
+            predicates=json.loads(row[3]),
+            truth_value=None if row[4] is None else bool(row[4]),
+            confidence=row[5],
+            source=row[6],
+            timestamp=datetime.fromisoformat(row[7])
+        )
+    
+    def _rule_from_row(self, row: Tuple) -> ReasoningRule:
+        return ReasoningRule(
+            rule_id=row[0],
+            rule_type=ReasoningType(row[1]),
+            premises=[self._statement_from_dict(premise) for premise in json.loads(row[2])],
+            conclusion=self._statement_from_dict(json.loads(row[3])),
+            confidence=row[4],
+            usage_count=row[5],
+            success_rate=row[6]
+        )
+    
+    @staticmethod
+    def _concept_entry(parent: Optional[str]) -> Dict[str, Any]:
+        if parent is None:
+            return {"instances": set(), "properties": set(), "relations": set()}
+        return {"parent": parent, "properties": set(), "instances": set()}
+    
+    # Zapis write-through
+    
+    def add_statement(self, statement: LogicalStatement) -> str:
+        """Dodaje stwierdzenie do bazy wiedzy (i od razu zapisuje je na dysk)"""
+        with self._connect() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO statements
+                (id, content, variables, predicates, truth_value, confidence, source, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                statement.id,
+                statement.content,
+                json.dumps(statement.variables),
+                json.dumps(statement.predicates),
+                None if statement.truth_value is None else int(statement.truth_value),
+                statement.confidence,
+                statement.source,
+                statement.timestamp.isoformat()
+            ))
+            conn.execute('DELETE FROM statement_predicates WHERE statement_id = ?', (statement.id,))
+            conn.executemany('INSERT OR IGNORE INTO statement_predicates (statement_id, predicate) VALUES (?, ?)',
+                             [(statement.id, predicate) for predicate in statement.predicates])
+            conn.executemany('INSERT OR IGNORE INTO concepts (name, parent) VALUES (?, NULL)',
+                             [(predicate,) for predicate in statement.predicates])
+        
+        # Sekcje jeszcze niezaładowane wczytają nowy fakt z bazy
+        if "statements" in self._loaded:
+            self._statements[statement.id] = statement
+        if "concepts" in self._loaded:
+            for predicate in statement.predicates:
+                if predicate not in self._concepts:
+                    self._concepts[predicate] = self._concept_entry(None)
+        statement.parsed
+        return statement.id
+    
+    def add_rule(self, rule: ReasoningRule) -> str:
+        """Dodaje regułę rozumowania (write-through)"""
+        with self._connect() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO rules
+                (rule_id, rule_type, premises, conclusion, confidence, usage_count, success_rate)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                rule.rule_id,
+                rule.rule_type.value,
+                json.dumps([self._statement_to_dict(premise) for premise in rule.premises]),
+                json.dumps(self._statement_to_dict(rule.conclusion)),
+                rule.confidence,
+                rule.usage_count,
+                rule.success_rate
+            ))
+        
+        if "rules" in self._loaded:
+            self._rules[rule.rule_id] = rule
+        return rule.rule_id
+    
+    def add_causal_relation(self, relation: CausalRelation):
+        """Dodaje relację przyczynowo-skutkową (write-through)"""
+        with self._connect() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO causal_edges (cause, effect, strength, delay, confidence, evidence)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (relation.cause, relation.effect, relation.strength, relation.delay,
+                  relation.confidence, relation.evidence_count))
+        
+        if "causal_graph" in self._loaded:
+            self._causal_graph.add_edge(
+                relation.cause,
+                relation.effect,
+                weight=relation.strength,
+                delay=relation.delay,
+                confidence=relation.confidence,
+                evidence=relation.evidence_count
+            )
+        self.invalidate_causal_index()
+    
+    def create_concept_hierarchy(self, parent: str, children: List[str]):
+        """Tworzy hierarchię konceptów (write-through)"""
+        with self._connect() as conn:
+            conn.executemany('INSERT OR IGNORE INTO hierarchy_edges (parent, child) VALUES (?, ?)',
+                             [(parent, child) for child in children])
+            conn.executemany('INSERT OR IGNORE INTO concepts (name, parent) VALUES (?, ?)',
+                             [(child, parent) for child in children])
+        
+        if "hierarchies" in self._loaded:
+            self._hierarchies[parent].update(children)
+        if "concepts" in self._loaded:
+            for child in children:
+                if child not in self._concepts:
+                    self._concepts[child] = self._concept_entry(parent)
+    
+    # Zapytania bezpośrednio do bazy (bez ładowania sekcji do pamięci)
+    
+    def query_statement(self, statement_id: str) -> Optional[LogicalStatement]:
+        """Zwraca stwierdzenie o danym id"""
+        if "statements" in self._loaded:
+            return self._statements.get(statement_id)
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM statements WHERE id = ?', (statement_id,)).fetchone()
+        return self._statement_from_row(row) if row else None
+    
+    def query_statements_by_predicate(self, predicate: str) -> List[LogicalStatement]:
+        """Zwraca stwierdzenia z danym predykatem (indeks predykatów)"""
+        with self._connect() as conn:
+            rows = conn.execute('''
+                SELECT s.* FROM statement_predicates p JOIN statements s ON s.id = p.statement_id
+                WHERE p.predicate = ?
+            ''', (predicate,)).fetchall()
+        return [self._statement_from_row(row) for row in rows]
+    
+    def query_causal_effects(self, cause: str) -> List[Tuple[str, float]]:
+        """Zwraca (skutek, siła) bezpośrednich skutków przyczyny"""
+        with self._connect() as conn:
+            return conn.execute('SELECT effect, strength FROM causal_edges WHERE cause = ?', (cause,)).fetchall()
+    
+    def query_causal_causes(self, effect: str) -> List[Tuple[str, float]]:
+        """Zwraca (przyczyna, siła) bezpośrednich przyczyn skutku"""
+        with self._connect() as conn:
+            return conn.execute('SELECT cause, strength FROM causal_edges WHERE effect = ?', (effect,)).fetchall()
+    
+    def query_children(self, parent: str) -> Set[str]:
+        """Zwraca bezpośrednie podkoncepty konceptu"""
+        with self._connect() as conn:
+            return {child for (child,) in conn.execute('SELECT child FROM hierarchy_edges WHERE parent = ?', (parent,))}
+
+def parse_implication(content: str) -> Optional[Tuple[str, str]]:
+    """Parsuje implikację 'A → B' / 'A implies B' do (antecedent, consequent)"""
+    if "→" in content or "implies" in content:
+        parts = content.replace("→", "implies").split("implies")
+        if len(parts) == 2:
+            return parts[0].strip(), parts[1].strip()
+    return None
+
+def parse_categorical(content: str) -> Optional[Tuple[str, str]]:
+    """Parsuje zdanie kategoryczne 'All X are Y' / 'Every X are Y' do (X, Y)"""
+    lowered = content.lower()
+    if "all" in lowered or "every" in lowered:
+        parts = lowered.replace("all ", "").replace("every ", "").split(" are ")
+        if len(parts) == 2:
+            return parts[0].strip(), parts[1].strip()
+    return None
+
+def parse_membership(content: str) -> Optional[Tuple[str, str]]:
+    """Parsuje zdanie 'C is A' do (C, A)"""
+    lowered = content.lower()
+    if "is" in lowered:
+        parts = lowered.split(" is ")
+        if len(parts) == 2:
+            return parts[0].strip(), parts[1].strip()
+    return None
+
+@dataclass(frozen=True)
+class ParsedStatement:
+    """Sparsowana postać treści stwierdzenia (wspólna dla wszystkich stwierdzeń o tej samej treści)"""
+    lowered: str
+    antecedent: Optional[str] = None
+    consequent: Optional[str] = None
+    antecedent_lower: Optional[str] = None
+    consequent_lower: Optional[str] = None
+    category_subject: Optional[str] = None
+    category_predicate: Optional[str] = None
+    member: Optional[str] = None
+    member_category: Optional[str] = None
+    
+    @property
+    def is_implication(self) -> bool:
+        return self.antecedent is not None
+    
+    @property
+    def is_categorical(self) -> bool:
+        return self.category_subject is not None
+    
+    @property
+    def is_negation(self) -> bool:
+        return "not" in self.lowered
+
+@functools.lru_cache(maxsize=65536)
+def parse_statement(content: str) -> ParsedStatement:
+    """Parsuje treść stwierdzenia raz - wyniki współdzielone przez cache LRU kluczowany treścią"""
+    implication = parse_implication(content)
+    categorical = parse_categorical(content)
+    membership = parse_membership(content)
+    return ParsedStatement(
+        lowered=content.lower(),
+        antecedent=implication[0] if implication else None,
+        consequent=implication[1] if implication else None,
+        antecedent_lower=implication[0].lower() if implication else None,
+        consequent_lower=implication[1].lower() if implication else None,
+        category_subject=categorical[0] if categorical else None,
+        category_predicate=categorical[1] if categorical else None,
+        member=membership[0] if membership else None,
+        member_category=membership[1] if membership else None
+    )
+
 class DeductiveReasoning:
     """Silnik rozumowania dedukcyjnego"""
     
@@ -169,6 +787,7 @@ class DeductiveReasoning:
         self.kb = knowledge_base
         self.modus_ponens_count = 0
         self.modus_tollens_count = 0
+        self._stats_lock = threading.Lock()  # multi_strategy_reasoning uruchamia silniki na wątkach
     
     def modus_ponens(self, major_premise: LogicalStatement, 
                     minor_premise: LogicalStatement) -> Optional[LogicalStatement]:
@@ -177,26 +796,24 @@ class DeductiveReasoning:
         """
         try:
             # Sprawdź czy major_premise ma formę implikacji
-            if "→" in major_premise.content or "implies" in major_premise.content:
-                # Parsuj implikację (uproszczone)
-                parts = major_premise.content.replace("→", "implies").split("implies")
-                if len(parts) == 2:
-                    antecedent = parts[0].strip()
-                    consequent = parts[1].strip()
+            major = major_premise.parsed
+            if major.is_implication:
+                antecedent, consequent = major.antecedent, major.consequent
+                
+                # Sprawdź czy minor_premise potwierdza antecedent
+                if major.antecedent_lower in minor_premise.parsed.lowered:
+                    conclusion = LogicalStatement(
+                        id=str(uuid.uuid4()),
+                        content=consequent,
+                        confidence=min(major_premise.confidence, minor_premise.confidence) * 0.9,
+                        source="modus_ponens",
+                        predicates=[consequent]
+                    )
                     
-                    # Sprawdź czy minor_premise potwierdza antecedent
-                    if antecedent.lower() in minor_premise.content.lower():
-                        conclusion = LogicalStatement(
-                            id=str(uuid.uuid4()),
-                            content=consequent,
-                            confidence=min(major_premise.confidence, minor_premise.confidence) * 0.9,
-                            source="modus_ponens",
-                            predicates=[consequent]
-                        )
-                        
+                    with self._stats_lock:
                         self.modus_ponens_count += 1
-                        logger.info(f"Modus Ponens: {antecedent} + {minor_premise.content} → {consequent}")
-                        return conclusion
+                    logger.info(f"Modus Ponens: {antecedent} + {minor_premise.content} → {consequent}")
+                    return conclusion
             
             return None
             
@@ -210,27 +827,26 @@ class DeductiveReasoning:
         Modus Tollens: Jeśli A → B i ¬B, to ¬A
         """
         try:
-            if "→" in major_premise.content or "implies" in major_premise.content:
-                parts = major_premise.content.replace("→", "implies").split("implies")
-                if len(parts) == 2:
-                    antecedent = parts[0].strip()
-                    consequent = parts[1].strip()
+            major = major_premise.parsed
+            if major.is_implication:
+                antecedent, consequent = major.antecedent, major.consequent
+                
+                # Sprawdź czy minor_premise neguje consequent
+                minor = minor_premise.parsed
+                if minor.is_negation and major.consequent_lower in minor.lowered:
                     
-                    # Sprawdź czy minor_premise neguje consequent
-                    if ("not" in minor_premise.content.lower() and 
-                        consequent.lower() in minor_premise.content.lower()):
-                        
-                        conclusion = LogicalStatement(
-                            id=str(uuid.uuid4()),
-                            content=f"not {antecedent}",
-                            confidence=min(major_premise.confidence, minor_premise.confidence) * 0.85,
-                            source="modus_tollens",
-                            predicates=[f"¬{antecedent}"]
-                        )
-                        
+                    conclusion = LogicalStatement(
+                        id=str(uuid.uuid4()),
+                        content=f"not {antecedent}",
+                        confidence=min(major_premise.confidence, minor_premise.confidence) * 0.85,
+                        source="modus_tollens",
+                        predicates=[f"¬{antecedent}"]
+                    )
+                    
+                    with self._stats_lock:
                         self.modus_tollens_count += 1
-                        logger.info(f"Modus Tollens: ¬{consequent} → ¬{antecedent}")
-                        return conclusion
+                    logger.info(f"Modus Tollens: ¬{consequent} → ¬{antecedent}")
+                    return conclusion
             
             return None
             
@@ -243,32 +859,25 @@ class DeductiveReasoning:
         Sylogizm kategoryczny: Wszyscy A są B, C jest A, więc C jest B
         """
         try:
-            # Uproszczona implementacja sylogizmu
-            if ("all" in major.content.lower() or "every" in major.content.lower()):
-                # Parse: "All X are Y"
-                major_parts = major.content.lower().replace("all ", "").replace("every ", "").split(" are ")
-                if len(major_parts) == 2:
-                    category_A = major_parts[0].strip()
-                    category_B = major_parts[1].strip()
+            # Parse: "All X are Y" oraz "C is A"
+            major_parsed = major.parsed
+            if major_parsed.is_categorical:
+                category_A, category_B = major_parsed.category_subject, major_parsed.category_predicate
+                minor_parsed = minor.parsed
+                if minor_parsed.member is not None:
+                    individual_C = minor_parsed.member
                     
-                    # Parse: "C is A"
-                    if "is" in minor.content.lower():
-                        minor_parts = minor.content.lower().split(" is ")
-                        if len(minor_parts) == 2:
-                            individual_C = minor_parts[0].strip()
-                            category_check = minor_parts[1].strip()
-                            
-                            if category_A == category_check:
-                                conclusion = LogicalStatement(
-                                    id=str(uuid.uuid4()),
-                                    content=f"{individual_C} is {category_B}",
-                                    confidence=min(major.confidence, minor.confidence) * 0.9,
-                                    source="syllogism",
-                                    predicates=[category_B, individual_C]
-                                )
-                                
-                                logger.info(f"Sylogizm: {individual_C} ∈ {category_A} ∧ {category_A} ⊆ {category_B} → {individual_C} ∈ {category_B}")
-                                return conclusion
+                    if category_A == minor_parsed.member_category:
+                        conclusion = LogicalStatement(
+                            id=str(uuid.uuid4()),
+                            content=f"{individual_C} is {category_B}",
+                            confidence=min(major.confidence, minor.confidence) * 0.9,
+                            source="syllogism",
+                            predicates=[category_B, individual_C]
+                        )
+                        
+                        logger.info(f"Sylogizm: {individual_C} ∈ {category_A} ∧ {category_A} ⊆ {category_B} → {individual_C} ∈ {category_B}")
+                        return conclusion
             
             return None
             
@@ -283,6 +892,9 @@ class InductiveReasoning:
         self.kb = knowledge_base
         self.patterns_discovered = 0
         self.generalizations_made = 0
+        self._stats_lock = threading.Lock()
+        self.pattern_miner = CooccurrenceMiner()
+        self.known_pattern_pairs: Set[Tuple[str, str]] = set()
     
     def generalize_from_examples(self, examples: List[LogicalStatement],
                                 min_confidence: float = 0.6) -> Optional[LogicalStatement]:
@@ -320,7 +932,8 @@ class InductiveReasoning:
                 predicates=list(common_predicates)
             )
             
-            self.generalizations_made += 1
+            with self._stats_lock:
+                self.generalizations_made += 1
             logger.info(f"Indukcja: Generalizacja z {len(examples)} przykładów → {pattern}")
             return generalization
         
@@ -330,58 +943,155 @@ class InductiveReasoning:
                                    threshold: float = 0.7) -> List[ReasoningRule]:
         """
         Odkrywa wzorce statystyczne w danych
+
+        Dane kodowane są raz do macierzy logicznych, a liczności zgodności
+        wszystkich par właściwości liczone są iloczynami macierzy (CooccurrenceMiner).
         """
-        patterns = []
-        
         if len(data_points) < 3:
-            return patterns
+            return []
         
-        # Znajdź korelacje między właściwościami
-        properties = set()
-        for point in data_points:
-            properties.update(point.keys())
-        
-        properties = list(properties)
-        
-        # Sprawdź korelacje parami
-        for prop1, prop2 in combinations(properties, 2):
-            correlations = []
-            for point in data_points:
-                if prop1 in point and prop2 in point:
-                    # Uproszczona korelacja (binary)
-                    val1 = 1 if point[prop1] else 0
-                    val2 = 1 if point[prop2] else 0
-                    correlations.append((val1, val2))
+        miner = CooccurrenceMiner()
+        miner.update(data_points)
+        return self._rules_from_pairs(miner.strong_pairs(threshold))
+    
+    def update_statistical_patterns(self, data_points: Iterable[Dict[str, Any]],
+                                    threshold: float = 0.7) -> List[ReasoningRule]:
+        """
+        Tryb strumieniowy: dolicza nowe punkty danych do self.pattern_miner
+        i zwraca wzorce dla wszystkich dotychczas widzianych danych
+        """
+        self.pattern_miner.update(data_points)
+        return self._rules_from_pairs(self.pattern_miner.strong_pairs(threshold),
+                                      known_pairs=self.known_pattern_pairs)
+    
+    def _rules_from_pairs(self, pairs: List[Tuple[str, str, float]],
+                          known_pairs: Optional[Set[Tuple[str, str]]] = None) -> List[ReasoningRule]:
+        """
+        Tworzy reguły indukcyjne z par skorelowanych właściwości
+
+        Jeśli podano known_pairs, licznik i log INFO dotyczą tylko par jeszcze
+        nieznanych (które są do niego dopisywane).
+        """
+        patterns = []
+        for prop1, prop2, correlation_strength in pairs:
+            rule = ReasoningRule(
+                rule_id=str(uuid.uuid4()),
+                rule_type=ReasoningType.INDUCTION,
+                premises=[LogicalStatement(
+                    id=str(uuid.uuid4()),
+                    content=f"{prop1} is true",
+                    predicates=[prop1]
+                )],
+                conclusion=LogicalStatement(
+                    id=str(uuid.uuid4()),
+                    content=f"{prop2} is likely true",
+                    predicates=[prop2],
+                    confidence=correlation_strength
+                ),
+                confidence=correlation_strength
+            )
+            patterns.append(rule)
             
-            if len(correlations) >= 3:
-                # Oblicz współczynnik korelacji (uproszczony)
-                positive_correlations = sum(1 for v1, v2 in correlations if v1 == v2)
-                correlation_strength = positive_correlations / len(correlations)
-                
-                if correlation_strength >= threshold:
-                    rule = ReasoningRule(
-                        rule_id=str(uuid.uuid4()),
-                        rule_type=ReasoningType.INDUCTION,
-                        premises=[LogicalStatement(
-                            id=str(uuid.uuid4()),
-                            content=f"{prop1} is true",
-                            predicates=[prop1]
-                        )],
-                        conclusion=LogicalStatement(
-                            id=str(uuid.uuid4()),
-                            content=f"{prop2} is likely true",
-                            predicates=[prop2],
-                            confidence=correlation_strength
-                        ),
-                        confidence=correlation_strength
-                    )
-                    patterns.append(rule)
-                    
-                    self.patterns_discovered += 1
-                    logger.info(f"Odkryto wzorzec: {prop1} → {prop2} (siła: {correlation_strength:.2f})")
+            with self._stats_lock:
+                if known_pairs is not None:
+                    if (prop1, prop2) in known_pairs:
+                        continue
+                    known_pairs.add((prop1, prop2))
+                self.patterns_discovered += 1
+            logger.info(f"Odkryto wzorzec: {prop1} → {prop2} (siła: {correlation_strength:.2f})")
         
         return patterns
 
+class CooccurrenceMiner:
+    """
+    Macierzowe zliczanie zgodności par właściwości (wersja binarna korelacji)
+
+    Każda porcja danych kodowana jest do macierzy logicznej wartości i maski obecności
+    (punkty x właściwości). Dla wszystkich par naraz:
+      both_present = Mᵀ·M,  agreements = Tᵀ·T + Fᵀ·F
+    gdzie T/F to obecne właściwości prawdziwe/fałszywe. Liczniki są przyrostowe,
+    więc kolejne porcje można dokładać strumieniowo.
+
+    Gęste macierze porcji mają najwyżej max_block_cells komórek: liczba wierszy
+    przetwarzanych naraz maleje wraz z liczbą właściwości P.
+    """
+    
+    def __init__(self, block_size: int = 65536, max_block_cells: int = 1 << 21):
+        self.block_size = block_size
+        self.max_block_cells = max_block_cells
+        self.properties: List[str] = []
+        self.property_index: Dict[str, int] = {}
+        self.rows_seen = 0
+        self.both_present = np.zeros((0, 0), dtype=np.int64)
+        self.agreements = np.zeros((0, 0), dtype=np.int64)
+    
+    def update(self, data_points: Iterable[Dict[str, Any]]):
+        """Dolicza punkty danych (przetwarzane blokami po block_size wierszy)"""
+        block = []
+        for point in data_points:
+            block.append(point)
+            if len(block) >= self.block_size:
+                self._update_block(block)
+                block = []
+        if block:
+            self._update_block(block)
+    
+    def _update_block(self, block: List[Dict[str, Any]]):
+        rows, columns, truths = [], [], []
+        property_index = self.property_index
+        for row, point in enumerate(block):
+            for key, value in point.items():
+                column = property_index.get(key)
+                if column is None:
+                    column = len(self.properties)
+                    property_index[key] = column
+                    self.properties.append(key)
+                rows.append(row)
+                columns.append(column)
+                truths.append(bool(value))
+        
+        size = len(self.properties)
+        if size > self.both_present.shape[0]:
+            grow = size - self.both_present.shape[0]
+            self.both_present = np.pad(self.both_present, ((0, grow), (0, grow)))
+            self.agreements = np.pad(self.agreements, ((0, grow), (0, grow)))
+        
+        rows = np.array(rows, dtype=np.int64)
+        columns = np.array(columns, dtype=np.int64)
+        truths = np.array(truths, dtype=bool)
+        
+        # Wiersze są posortowane, więc porcję dzielimy na zakresy wierszy
+        # tak, by gęsty blok (wiersze x P) nie przekroczył max_block_cells
+        step = max(1, self.max_block_cells // max(size, 1))
+        for start in range(0, len(block), step):
+            stop = min(start + step, len(block))
+            lo, hi = np.searchsorted(rows, [start, stop])
+            self._accumulate(rows[lo:hi] - start, columns[lo:hi], truths[lo:hi], stop - start, size)
+        self.rows_seen += len(block)
+    
+    def _accumulate(self, rows: np.ndarray, columns: np.ndarray, truths: np.ndarray,
+                    n_rows: int, size: int):
+        present = np.zeros((n_rows, size), dtype=np.float64)
+        true_values = np.zeros((n_rows, size), dtype=np.float64)
+        present[rows, columns] = 1.0
+        true_values[rows[truths], columns[truths]] = 1.0
+        false_values = present - true_values
+        
+        self.both_present += np.rint(present.T @ present).astype(np.int64)
+        self.agreements += np.rint(true_values.T @ true_values + false_values.T @ false_values).astype(np.int64)
+    
+    def strong_pairs(self, threshold: float, min_support: int = 3) -> List[Tuple[str, str, float]]:
+        """Zwraca pary (prop1, prop2, siła) z siłą zgodności >= threshold i wsparciem >= min_support"""
+        support = self.both_present
+        with np.errstate(divide='ignore', invalid='ignore'):
+            strength = self.agreements / support
+        mask = np.triu(support >= min_support, k=1) & (strength >= threshold)
+        first, second = np.nonzero(mask)
+        return [
+            (self.properties[i], self.properties[j], float(strength[i, j]))
+            for i, j in zip(first.tolist(), second.tolist())
+        ]
+
 class AbductiveReasoning:
     """Silnik rozumowania abdukcyjnego (inference to the best explanation)"""
     
@@ -389,6 +1099,7 @@ class AbductiveReasoning:
         self.kb = knowledge_base
         self.hypotheses_generated = 0
         self.explanations_ranked = 0
+        self._stats_lock = threading.Lock()
     
     def generate_hypotheses(self, observation: LogicalStatement,
                           max_hypotheses: int = 5) -> List[LogicalStatement]:
@@ -432,7 +1143,8 @@ class AbductiveReasoning:
         
         # Sortuj według pewności i zwróć najlepsze
         hypotheses.sort(key=lambda h: h.confidence, reverse=True)
-        self.hypotheses_generated += len(hypotheses[:max_hypotheses])
+        with self._stats_lock:
+            self.hypotheses_generated += len(hypotheses[:max_hypotheses])
         
         logger.info(f"Abdukcja: Wygenerowano {len(hypotheses[:max_hypotheses])} hipotez dla: {observation.content}")
         return hypotheses[:max_hypotheses]
@@ -473,7 +1185,8 @@ class AbductiveReasoning:
         # Sortuj według wyniku
         ranked_hypotheses.sort(key=lambda x: x[1], reverse=True)
         
-        self.explanations_ranked += 1
+        with self._stats_lock:
+            self.explanations_ranked += 1
         logger.info(f"Ranking: Oceniono {len(hypotheses)} hipotez")
         
         return ranked_hypotheses
@@ -485,6 +1198,7 @@ class CausalReasoning:
         self.kb = knowledge_base
         self.causal_inferences = 0
         self.interventions_simulated = 0
+        self._stats_lock = threading.Lock()
     
     def infer_causal_chain(self, cause: str, max_depth: int = 5) -> List[List[str]]:
         """
@@ -507,7 +1221,8 @@ class CausalReasoning:
         
         find_chains_recursive(cause, [cause], 0)
         
-        self.causal_inferences += len(chains)
+        with self._stats_lock:
+            self.causal_inferences += len(chains)
         logger.info(f"Znaleziono {len(chains)} łańcuchów przyczynowych od: {cause}")
         
         return chains
@@ -550,7 +1265,8 @@ class CausalReasoning:
                 if effect_strength > 0.1:
                     queue.append((successor, effect_strength))
         
-        self.interventions_simulated += 1
+        with self._stats_lock:
+            self.interventions_simulated += 1
         logger.info(f"Symulacja interwencji: {intervention_node}={intervention_value} → {len(predicted_effects)} efektów")
         
         return predicted_effects
@@ -558,23 +1274,223 @@ class CausalReasoning:
     def find_common_causes(self, effects: List[str]) -> List[str]:
         """
         Znajduje wspólne przyczyny dla listy skutków
+
+        Korzysta z zapamiętanych bitsetów przodków bazy wiedzy - zapytanie
+        to iloczyn bitowy N bitsetów zamiast N przejść grafu.
         """
         if not effects:
             return []
-        
-        # Znajdź wszystkich przodków dla każdego skutku
-        ancestors_sets = []
-        for effect in effects:
-            ancestors = set(nx.ancestors(self.kb.causal_graph, effect))
-            ancestors_sets.append(ancestors)
-        
-        # Znajdź przecięcie - wspólnych przodków
-        common_ancestors = ancestors_sets[0]
-        for ancestors in ancestors_sets[1:]:
-            common_ancestors &= ancestors
-        
-        logger.info(f"Wspólne przyczyny dla {effects}: {list(common_ancestors)}")
-        return list(common_ancestors)
+
+        # Przecięcie bitsetów przodków - wspólni przodkowie
+        common_bits = self.kb.get_ancestor_bits(effects[0])
+        for effect in effects[1:]:
+            common_bits &= self.kb.get_ancestor_bits(effect)
+
+        common_ancestors = self.kb.decode_causal_bits(common_bits)
+        logger.info(f"Wspólne przyczyny dla {effects}: {common_ancestors}")
+        return common_ancestors
+
+class CompiledPlanningDomain:
+    """
+    Skompilowana domena planowania dla A*
+
+    Zmienne stanu mają stałą kolejność, a wartości są internowane do liczb całkowitych,
+    więc stan to krotka int-ów (haszowalna bez serializacji). Brak zmiennej w stanie
+    odpowiada wartości None, tak jak state.get(key). Akcje są indeksowane po pierwszym
+    fakcie warunku wstępnego - przy ekspansji sprawdzane są tylko akcje, których
+    fakt wyzwalający występuje w stanie.
+    """
+    
+    def __init__(self, start_state: Dict[str, Any], goal_state: Dict[str, Any],
+                 actions: Dict[str, Dict[str, Any]]):
+        keys = list(start_state) + list(goal_state)
+        for action_def in actions.values():
+            keys.extend(action_def.get('preconditions', {}))
+            keys.extend(action_def.get('effects', {}))
+        self.variables: List[str] = list(dict.fromkeys(keys))
+        self.var_index = {var: i for i, var in enumerate(self.variables)}
+        self._value_ids: List[Dict[Any, int]] = [{} for _ in self.variables]
+        for i in range(len(self.variables)):
+            self._intern(i, None)
+        
+        self.start = tuple(self._intern(i, start_state.get(var)) for i, var in enumerate(self.variables))
+        self.goal = self._compile_facts(goal_state)
+        
+        self.action_names: List[str] = []
+        self.action_costs: List[float] = []
+        self.action_effects: List[Tuple[Tuple[int, int], ...]] = []
+        self.action_remaining_preconditions: List[Tuple[Tuple[int, int], ...]] = []
+        self.unconditional_actions: List[int] = []
+        self.actions_by_fact: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        
+        for action_name, action_def in actions.items():
+            action = len(self.action_names)
+            self.action_names.append(action_name)
+            self.action_costs.append(action_def.get('cost', 1))
+            self.action_effects.append(self._compile_facts(action_def.get('effects', {})))
+            preconditions = self._compile_facts(action_def.get('preconditions', {}))
+            self.action_remaining_preconditions.append(preconditions[1:])
+            if preconditions:
+                self.actions_by_fact[preconditions[0]].append(action)
+            else:
+                self.unconditional_actions.append(action)
+        self.actions_by_fact = dict(self.actions_by_fact)
+    
+    def _intern(self, var: int, value: Any) -> int:
+        """Zwraca identyfikator wartości zmiennej (wartości niehaszowalne przez JSON)"""
+        try:
+            key = (0, value)
+            hash(key)
+        except TypeError:
+            key = (1, json.dumps(value, sort_keys=True, default=str))
+        value_ids = self._value_ids[var]
+        value_id = value_ids.get(key)
+        if value_id is None:
+            value_id = len(value_ids)
+            value_ids[key] = value_id
+        return value_id
+    
+    def _compile_facts(self, facts: Dict[str, Any]) -> Tuple[Tuple[int, int], ...]:
+        """Zamienia słownik faktów na krotkę (indeks zmiennej, identyfikator wartości)"""
+        compiled = []
+        for key, value in facts.items():
+            var = self.var_index[key]
+            compiled.append((var, self._intern(var, value)))
+        return tuple(compiled)
+    
+    def heuristic(self, state: Tuple[int, ...]) -> int:
+        """Liczba faktów celu niespełnionych w stanie"""
+        return sum(1 for var, value in self.goal if state[var] != value)
+    
+    def applicable_actions(self, state: Tuple[int, ...]) -> List[int]:
+        """Zwraca akcje, których wszystkie warunki wstępne są spełnione w stanie"""
+        applicable = list(self.unconditional_actions)
+        actions_by_fact = self.actions_by_fact
+        remaining = self.action_remaining_preconditions
+        for fact in enumerate(state):
+            candidates = actions_by_fact.get(fact)
+            if candidates:
+                for action in candidates:
+                    if all(state[var] == value for var, value in remaining[action]):
+                        applicable.append(action)
+        return applicable
+    
+    def apply(self, state: Tuple[int, ...], action: int) -> Tuple[int, ...]:
+        """Zwraca stan po wykonaniu akcji"""
+        new_state = list(state)
+        for var, value in self.action_effects[action]:
+            new_state[var] = value
+        return tuple(new_state)
+
+class _HTNAction(dict):
+    """Opis akcji HTNDomain - każda zmiana podbija wersję domeny; subtasks trzymane są jako krotka"""
+    __slots__ = ('domain',)
+    
+    def __init__(self, domain: 'HTNDomain', *args, **kwargs):
+        self.domain = domain
+        super().__init__()
+        self.update(*args, **kwargs)
+    
+    @staticmethod
+    def _frozen(key, value):
+        return tuple(value) if key == 'subtasks' and value is not None else value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self._frozen(key, value))
+        self.domain.version += 1
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.domain.version += 1
+    
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            super().__setitem__(key, self._frozen(key, value))
+        self.domain.version += 1
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return super().__getitem__(key)
+    
+    def pop(self, *args):
+        self.domain.version += 1
+        return super().pop(*args)
+    
+    def popitem(self):
+        self.domain.version += 1
+        return super().popitem()
+    
+    def clear(self):
+        super().clear()
+        self.domain.version += 1
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def __reduce__(self):
+        return _HTNAction, (self.domain, dict(self))
+
+class HTNDomain(dict):
+    """
+    Domena HTN (zadanie -> opis akcji) z licznikiem wersji
+
+    Wersja rośnie przy każdej zmianie zadań i ich opisów (także bezpośrednio:
+    domain['task']['subtasks'] = [...] albo domain |= {...}), więc cache podplanów
+    HierarchicalPlanning sprawdza ważność w O(1) zamiast liczyć odcisk domeny.
+    Podzadania trzymane są jako krotki; wartości zagnieżdżone w opisach akcji
+    (poza subtasks) nie wpływają na dekompozycję i nie są śledzone.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self.version = 0
+        super().__init__()
+        self.update(*args, **kwargs)
+    
+    def _action(self, action_info: Dict[str, Any]) -> _HTNAction:
+        return _HTNAction(self, action_info)
+    
+    def __setitem__(self, task, action_info):
+        super().__setitem__(task, self._action(action_info))
+        self.version += 1
+    
+    def __delitem__(self, task):
+        super().__delitem__(task)
+        self.version += 1
+    
+    def update(self, *args, **kwargs):
+        for task, action_info in dict(*args, **kwargs).items():
+            super().__setitem__(task, self._action(action_info))
+        self.version += 1
+    
+    def setdefault(self, task, default=None):
+        if task not in self:
+            self[task] = default if default is not None else {}
+        return super().__getitem__(task)
+    
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+    
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+    
+    def clear(self):
+        super().clear()
+        self.version += 1
+    
+    def __ior__(self, other):
+        self.update(other)
+        return self
+    
+    def copy(self) -> 'HTNDomain':
+        """Niezależna kopia domeny (z własną wersją i własnymi opisami akcji)"""
+        return HTNDomain({task: dict(action_info) for task, action_info in self.items()})
+    
+    def __reduce__(self):
+        return HTNDomain, ({task: dict(action_info) for task, action_info in self.items()},)
 
 class HierarchicalPlanning:
     """System planowania wieloetapowego i hierarchicznego"""
@@ -583,100 +1499,521 @@ class HierarchicalPlanning:
         self.kb = knowledge_base
         self.plans_generated = 0
         self.hierarchical_decompositions = 0
+        self.last_search_stats: Dict[str, Any] = {}
+        
+        # Wspólny cache podplanów HTN: (zadanie, pozostała głębokość) -> plan
+        self._htn_cache: Dict[Tuple[str, int], Tuple[str, ...]] = {}
+        self._htn_domain: Optional[HTNDomain] = None  # None dla zwykłego słownika
+        self._htn_domain_key: Optional[int] = None  # wersja HTNDomain albo odcisk zwykłego słownika
     
     def hierarchical_task_network(self, goal: str, 
                                  available_actions: Dict[str, Dict[str, Any]],
-                                 max_depth: int = 5) -> Optional[List[str]]:
+                                 max_depth: int = 5,
+                                 iterative: bool = False) -> Optional[List[str]]:
         """
         Hierarchiczne planowanie zadań (HTN)
+
+        Dekompozycje są zapamiętywane po (zadanie, pozostała głębokość) we wspólnym
+        cache podplanów, ważnym dopóki nie zmieni się available_actions (zwykły
+        słownik rozpoznawany po odcisku, HTNDomain po wersji - w O(1)). Tryb
+        iterative=True dekomponuje bez rekurencji (głębokie sieci zadań).
         """
-        def decompose_task(task: str, depth: int) -> List[str]:
-            if depth >= max_depth:
-                return [task]
-            
-            # Sprawdź czy zadanie można zdekomponować
-            if task in available_actions:
-                action_info = available_actions[task]
-                subtasks = action_info.get('subtasks', [])
+        cache = self._get_htn_cache(available_actions)
+        
+        if iterative:
+            plan = self._decompose_iterative(goal, max_depth, available_actions, cache)
+        else:
+            def decompose_task(task: str, depth: int) -> Tuple[str, ...]:
+                key = (task, max_depth - depth)
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
                 
-                if subtasks:
+                subtasks = self._htn_subtasks(task, depth, max_depth, available_actions)
+                if subtasks is None:
+                    result = (task,)  # Zadanie atomowe
+                else:
                     self.hierarchical_decompositions += 1
-                    plan = []
+                    parts = []
                     for subtask in subtasks:
-                        plan.extend(decompose_task(subtask, depth + 1))
-                    return plan
-                else:
-                    return [task]  # Zadanie atomowe
+                        parts.extend(decompose_task(subtask, depth + 1))
+                    result = tuple(parts)
+                
+                cache[key] = result
+                return result
             
-            return [task]
-        
-        plan = decompose_task(goal, 0)
+            plan = decompose_task(goal, 0)
         
         if plan:
             self.plans_generated += 1
             logger.info(f"HTN Plan dla '{goal}': {len(plan)} kroków")
         
-        return plan if plan else None
+        return list(plan) if plan else None
+    
+    @staticmethod
+    def _htn_subtasks(task: str, depth: int, max_depth: int,
+                      available_actions: Dict[str, Dict[str, Any]]) -> Optional[List[str]]:
+        """Zwraca podzadania do dekompozycji lub None dla zadania atomowego"""
+        if depth >= max_depth or task not in available_actions:
+            return None
+        return available_actions[task].get('subtasks', []) or None
+    
+    def _decompose_iterative(self, goal: str, max_depth: int,
+                             available_actions: Dict[str, Dict[str, Any]],
+                             cache: Dict[Tuple[str, int], Tuple[str, ...]]) -> Tuple[str, ...]:
+        """Dekompozycja HTN z jawnym stosem zamiast rekurencji"""
+        # Ramka stosu: [zadanie, głębokość, podzadania, indeks następnego podzadania, części planu]
+        stack = []
+        result = None
+        
+        key = (goal, max_depth)
+        if key in cache:
+            return cache[key]
+        subtasks = self._htn_subtasks(goal, 0, max_depth, available_actions)
+        if subtasks is None:
+            cache[key] = (goal,)
+            return cache[key]
+        self.hierarchical_decompositions += 1
+        stack.append([goal, 0, subtasks, 0, []])
+        
+        while stack:
+            frame = stack[-1]
+            task, depth, subtasks, index, parts = frame
+            
+            if result is not None:
+                parts.extend(result)
+                result = None
+            
+            if index == len(subtasks):
+                result = tuple(parts)
+                cache[(task, max_depth - depth)] = result
+                stack.pop()
+                continue
+            
+            frame[3] = index + 1
+            subtask = subtasks[index]
+            child_depth = depth + 1
+            child_key = (subtask, max_depth - child_depth)
+            cached = cache.get(child_key)
+            if cached is not None:
+                result = cached
+                continue
+            
+            child_subtasks = self._htn_subtasks(subtask, child_depth, max_depth, available_actions)
+            if child_subtasks is None:
+                result = (subtask,)
+                cache[child_key] = result
+                continue
+            
+            self.hierarchical_decompositions += 1
+            stack.append([subtask, child_depth, child_subtasks, 0, []])
+        
+        return result
+    
+    def _get_htn_cache(self, available_actions: Dict[str, Dict[str, Any]]) -> Dict[Tuple[str, int], Tuple[str, ...]]:
+        """
+        Zwraca cache podplanów HTN dla danej domeny, wspólny dla kolejnych wywołań.
+
+        Cache jest unieważniany, gdy zmieni się domena: dla HTNDomain po zmianie
+        wersji (sprawdzenie O(1)), dla zwykłego słownika po zmianie odcisku -
+        skrótu zadań i ich podzadań liczonego raz na wywołanie.
+        """
+        if isinstance(available_actions, HTNDomain):
+            domain, key = available_actions, available_actions.version
+        else:
+            domain, key = None, hash(tuple(
+                (task, tuple(action_info.get('subtasks') or ()))
+                for task, action_info in available_actions.items()
+            ))
+        if domain is not self._htn_domain or key != self._htn_domain_key:
+            self._htn_domain = domain
+            self._htn_domain_key = key
+            self._htn_cache = {}
+        return self._htn_cache
+    
+    def invalidate_htn_cache(self):
+        """Czyści cache podplanów HTN"""
+        self._htn_domain = None
+        self._htn_domain_key = None
+        self._htn_cache = {}
     
     def a_star_planning(self, start_state: Dict[str, Any], 
                        goal_state: Dict[str, Any],
-                       actions: Dict[str, Dict[str, Any]]) -> Optional[List[str]]:
+                       actions: Dict[str, Dict[str, Any]],
+                       max_expansions: Optional[int] = None,
+                       timeout: Optional[float] = None) -> Optional[List[str]]:
         """
         Planowanie A* z heurystyką
+
+        Stany są kodowane jako krotki identyfikatorów wartości (CompiledPlanningDomain),
+        plan odtwarzany jest ze wskaźników na rodzica, a dla każdego stanu pamiętany
+        jest najlepszy koszt g. max_expansions i timeout (w sekundach) ograniczają
+        przeszukiwanie; statystyki trafiają do self.last_search_stats.
         """
-        from heapq import heappush, heappop
-        
-        def state_hash(state):
-            return hash(json.dumps(state, sort_keys=True))
-        
-        def heuristic(state):
-            # Prosta heurystyka - liczba różnic ze stanem docelowym
-            differences = 0
-            for key, target_value in goal_state.items():
-                if state.get(key) != target_value:
-                    differences += 1
-            return differences
-        
-        def apply_action(state, action_name, action_def):
-            new_state = state.copy()
-            effects = action_def.get('effects', {})
-            for key, value in effects.items():
-                new_state[key] = value
-            return new_state
-        
-        # A* search
-        open_set = [(heuristic(start_state), 0, start_state, [])]
+        search_start = time.perf_counter()
+        domain = CompiledPlanningDomain(start_state, goal_state, actions)
+        
+        start = domain.start
+        best_g = {start: 0}
+        parents: Dict[Tuple[int, ...], Tuple[Optional[Tuple[int, ...]], int]] = {start: (None, -1)}
         closed_set = set()
         
+        start_h = domain.heuristic(start)
+        counter = 0
+        open_set = [(start_h, start_h, counter, 0, start)]
+        expansions = 0
+        generated = 1
+        status = "exhausted"
+        goal = None
+        
         while open_set:
-            f_cost, g_cost, current_state, path = heappop(open_set)
+            _, h_cost, _, g_cost, state = heappop(open_set)
             
-            state_key = state_hash(current_state)
-            if state_key in closed_set:
+            if state in closed_set or g_cost > best_g[state]:
                 continue
             
-            closed_set.add(state_key)
-            
             # Sprawdź czy osiągnięto cel
-            if all(current_state.get(k) == v for k, v in goal_state.items()):
-                self.plans_generated += 1
-                logger.info(f"A* Plan: {len(path)} kroków od startu do celu")
-                return path
+            if h_cost == 0:
+                goal = state
+                status = "found"
+                break
             
-            # Ekspanduj sąsiadów
-            for action_name, action_def in actions.items():
-                # Sprawdź warunki wstępne
-                preconditions = action_def.get('preconditions', {})
-                if all(current_state.get(k) == v for k, v in preconditions.items()):
-                    new_state = apply_action(current_state, action_name, action_def)
-                    new_path = path + [action_name]
-                    new_g_cost = g_cost + action_def.get('cost', 1)
-                    new_f_cost = new_g_cost + heuristic(new_state)
-                    
-                    heappush(open_set, (new_f_cost, new_g_cost, new_state, new_path))
+            if max_expansions is not None and expansions >= max_expansions:
+                status = "expansion_budget"
+                break
+            if timeout is not None and (expansions & 0xFF) == 0 and \
+                    time.perf_counter() - search_start > timeout:
+                status = "timeout"
+                break
+            
+            closed_set.add(state)
+            expansions += 1
+            
+            # Ekspanduj sąsiadów - tylko akcje, których warunki wstępne mogą być spełnione
+            for action in domain.applicable_actions(state):
+                new_state = domain.apply(state, action)
+                if new_state in closed_set:
+                    continue
+                new_g_cost = g_cost + domain.action_costs[action]
+                if new_g_cost >= best_g.get(new_state, math.inf):
+                    continue
+                
+                best_g[new_state] = new_g_cost
+                parents[new_state] = (state, action)
+                new_h_cost = domain.heuristic(new_state)
+                counter += 1
+                generated += 1
+                heappush(open_set, (new_g_cost + new_h_cost, new_h_cost, counter, new_g_cost, new_state))
+        
+        self.last_search_stats = {
+            "status": status,
+            "expansions": expansions,
+            "generated": generated,
+            "search_time": time.perf_counter() - search_start
+        }
         
-        logger.info("A* Planning: Nie znaleziono planu")
-        return None
+        if goal is None:
+            if status == "exhausted":
+                logger.info("A* Planning: Nie znaleziono planu")
+            else:
+                logger.warning(f"A* Planning: Przerwano przeszukiwanie ({status}) po {expansions} ekspansjach")
+            return None
+        
+        # Odtwórz plan ze wskaźników na rodzica
+        path = []
+        state = goal
+        while True:
+            parent, action = parents[state]
+            if parent is None:
+                break
+            path.append(domain.action_names[action])
+            state = parent
+        path.reverse()
+        
+        self.plans_generated += 1
+        logger.info(f"A* Plan: {len(path)} kroków od startu do celu")
+        return path
+
+class UncertaintyPropagationNetwork:
+    """
+    Skompilowana sieć propagacji niepewności
+
+    Graf zależności sortowany jest topologicznie raz przy kompilacji. Zmienna jest
+    wyliczana, gdy ma rodziców i wszyscy są znani (podani lub wyliczeni wcześniej).
+    Zmienne wyliczane grupowane są w poziomy; każdy poziom to jedna wektorowa
+    operacja na tablicach średnich i wariancji (średnia średnich, suma wariancji).
+    """
+    
+    def __init__(self, dependencies: Dict[str, List[str]], known_variables: List[str]):
+        graph = nx.DiGraph()
+        graph.add_nodes_from(known_variables)
+        for var, parents in dependencies.items():
+            graph.add_node(var)
+            graph.add_edges_from((parent, var) for parent in parents)
+        try:
+            order = list(nx.topological_sort(graph))
+        except nx.NetworkXUnfeasible:
+            raise ValueError("Sieć zależności zawiera cykl")
+        
+        known = set(known_variables)
+        levels: Dict[str, int] = {}
+        for var in order:
+            parents = dependencies.get(var)
+            if parents and all(parent in known or parent in levels for parent in parents):
+                levels[var] = 1 + max(levels.get(parent, 0) for parent in parents)
+        
+        self.known_count = len(known_variables)
+        self.variables: List[str] = list(known_variables) + [var for var in order if var in levels and var not in known]
+        index = {var: i for i, var in enumerate(self.variables)}
+        self.derived_columns: List[int] = [index[var] for var in order if var in levels]
+        
+        # Dla każdego poziomu: kolumny docelowe, zebrane kolumny rodziców, przesunięcia i liczności
+        self.levels = []
+        for level in range(1, max(levels.values(), default=0) + 1):
+            targets, parent_columns, offsets, counts = [], [], [], []
+            for var in order:
+                if levels.get(var) == level:
+                    parents = dependencies[var]
+                    targets.append(index[var])
+                    offsets.append(len(parent_columns))
+                    parent_columns.extend(index[parent] for parent in parents)
+                    counts.append(len(parents))
+            self.levels.append((np.array(targets), np.array(parent_columns),
+                                np.array(offsets), np.array(counts, dtype=float)))
+    
+    def propagate(self, means: np.ndarray, stds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Propaguje średnie i odchylenia (scenariusze x zmienne znane) przez całą sieć"""
+        batch = means.shape[0]
+        all_means = np.full((batch, len(self.variables)), np.nan)
+        all_variances = np.full((batch, len(self.variables)), np.nan)
+        all_means[:, :self.known_count] = means
+        all_variances[:, :self.known_count] = stds ** 2
+        
+        for targets, parent_columns, offsets, counts in self.levels:
+            all_means[:, targets] = np.add.reduceat(all_means[:, parent_columns], offsets, axis=1) / counts
+            all_variances[:, targets] = np.add.reduceat(all_variances[:, parent_columns], offsets, axis=1)
+        
+        return all_means, np.sqrt(all_variances)
+
+class BayesianNetwork:
+    """
+    Sieć bayesowska nad grafem przyczynowym bazy wiedzy (zmienne binarne)
+
+    CPT zmiennej to tablica NumPy o kształcie (2,)*len(rodzice) + (2,), osie w kolejności
+    rodziców, ostatnia oś to sama zmienna (indeks 1 = prawda). Zmienne bez jawnie
+    ustawionej CPT dostają noisy-OR z wag krawędzi (korzenie: rozkład a priori default_prior).
+    Wnioskowanie dokładne przez eliminację zmiennych: sieć przycinana jest do przodków
+    zapytania i dowodów, kolejność eliminacji (min-fill) zapamiętywana per kształt zapytania,
+    a zapytania wsadowe eliminują zmienne ukryte raz dla wszystkich wierszy dowodów.
+    """
+    
+    def __init__(self, knowledge_base: SymbolicKnowledgeBase, default_prior: float = 0.5,
+                 leak: float = 0.0, batch_size: int = 4096):
+        self.kb = knowledge_base
+        self.default_prior = default_prior
+        self.leak = leak
+        self.batch_size = batch_size
+        self._explicit_cpts: Dict[str, Tuple[Tuple[str, ...], np.ndarray]] = {}
+        self._cpt_version = 0
+        self._factor_cache: Dict[str, Tuple[Tuple[str, ...], np.ndarray]] = {}
+        self._factor_cache_version = None
+        self._order_cache: Dict[Tuple, Tuple[Tuple[Tuple[int, Optional[int]], int], List[str], List[str]]] = {}
+    
+    def _version(self) -> Tuple[Tuple[int, Optional[int]], int]:
+        return (self.kb.causal_index_key(), self._cpt_version)
+    
+    def set_cpt(self, variable: str, table: Any, parents: Optional[List[str]] = None):
+        """
+        Ustawia CPT zmiennej. parents domyślnie to poprzednicy w grafie przyczynowym;
+        każdy rodzic musi być poprzednikiem zmiennej. table ma kształt (2,)*k + (2,)
+        (pełny rozkład) albo (2,)*k (P(zmienna=prawda | rodzice)).
+        """
+        graph = self.kb.causal_graph
+        if variable not in graph:
+            raise nx.NetworkXError(f"The node {variable} is not in the graph.")
+        parents = tuple(graph.predecessors(variable)) if parents is None else tuple(parents)
+        for parent in parents:
+            if not graph.has_edge(parent, variable):
+                raise ValueError(f"{parent} nie jest rodzicem {variable} w grafie przyczynowym")
+        
+        table = np.asarray(table, dtype=float)
+        if table.shape == (2,) * len(parents):
+            table = np.stack([1.0 - table, table], axis=-1)
+        if table.shape != (2,) * (len(parents) + 1):
+            raise ValueError(f"Niepoprawny kształt CPT dla {variable}: {table.shape}")
+        if np.any(table < 0) or not np.allclose(table.sum(axis=-1), 1.0):
+            raise ValueError(f"CPT dla {variable} nie jest rozkładem prawdopodobieństwa")
+        
+        self._explicit_cpts[variable] = (parents, table)
+        self._cpt_version += 1
+    
+    def get_cpt(self, variable: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """Zwraca (rodzice, CPT) zmiennej - jawną lub domyślną noisy-OR"""
+        if self._factor_cache_version != self._version():
+            self._factor_cache = {}
+            self._factor_cache_version = self._version()
+        
+        factor = self._factor_cache.get(variable)
+        if factor is None:
+            if variable in self._explicit_cpts:
+                parents, table = self._explicit_cpts[variable]
+                for parent in parents:
+                    if not self.kb.causal_graph.has_edge(parent, variable):
+                        raise ValueError(f"CPT dla {variable} odwołuje się do usuniętej krawędzi {parent}")
+            else:
+                parents, table = self._noisy_or_cpt(variable)
+            factor = (parents, table)
+            self._factor_cache[variable] = factor
+        return factor
+    
+    def _noisy_or_cpt(self, variable: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """CPT noisy-OR: P(X=0 | rodzice) = (1 - leak) * Π (1 - w_i) po aktywnych rodzicach"""
+        graph = self.kb.causal_graph
+        parents = tuple(graph.predecessors(variable))
+        if not parents:
+            return parents, np.array([1.0 - self.default_prior, self.default_prior])
+        
+        p_false = np.full((2,) * len(parents), 1.0 - self.leak)
+        for axis, parent in enumerate(parents):
+            weight = min(max(float(graph[parent][variable].get("weight", 1.0)), 0.0), 1.0)
+            shape = [1] * len(parents)
+            shape[axis] = 2
+            p_false = p_false * np.array([1.0, 1.0 - weight]).reshape(shape)
+        return parents, np.stack([p_false, 1.0 - p_false], axis=-1)
+    
+    def elimination_order(self, query: str, evidence_variables: List[str]) -> List[str]:
+        """Kolejność eliminacji zmiennych ukrytych (min-fill), zapamiętana per kształt zapytania"""
+        return self._prepare(query, tuple(sorted(evidence_variables)))[2]
+    
+    def _prepare(self, query: str, evidence_key: Tuple[str, ...]) -> Tuple[Tuple[int, int], List[str], List[str]]:
+        """Zwraca (wersja, zmienne istotne, kolejność eliminacji) dla kształtu zapytania"""
+        key = (query, evidence_key)
+        cached = self._order_cache.get(key)
+        if cached is not None and cached[0] == self._version():
+            return cached
+        
+        if query in evidence_key:
+            raise ValueError(f"Zmienna zapytania {query} nie może być dowodem")
+        
+        # Przycinanie: tylko zapytanie, dowody i ich przodkowie wpływają na wynik
+        bits = 0
+        for node in (query,) + evidence_key:
+            bits |= self.kb.get_ancestor_bits(node) | (1 << self.kb._causal_node_index[node])
+        relevant = self.kb.decode_causal_bits(bits)
+        relevant_set = set(relevant)
+        
+        structure = nx.DiGraph()
+        structure.add_nodes_from(relevant)
+        for variable in relevant:
+            structure.add_edges_from((parent, variable) for parent in self.get_cpt(variable)[0])
+        if not nx.is_directed_acyclic_graph(structure):
+            raise ValueError("Sieć bayesowska wymaga acyklicznego grafu przyczynowego")
+        
+        # Graf interakcji po podstawieniu dowodów (moralizacja rodzin)
+        evidence_set = set(evidence_key)
+        neighbors: Dict[str, Set[str]] = {variable: set() for variable in relevant if variable not in evidence_set}
+        for variable in relevant:
+            family = [node for node in self.get_cpt(variable)[0] + (variable,)
+                      if node in relevant_set and node not in evidence_set]
+            for node in family:
+                neighbors[node].update(other for other in family if other != node)
+        
+        order = []
+        hidden = {variable for variable in neighbors if variable != query}
+        while hidden:
+            best, best_score = None, None
+            for variable in hidden:
+                adjacent = list(neighbors[variable])
+                fill = sum(1 for i, a in enumerate(adjacent) for b in adjacent[i + 1:]
+                           if b not in neighbors[a])
+                score = (fill, len(adjacent), str(variable))
+                if best_score is None or score < best_score:
+                    best, best_score = variable, score
+            adjacent = neighbors.pop(best)
+            for node in adjacent:
+                neighbors[node].discard(best)
+                neighbors[node].update(other for other in adjacent if other != node)
+            hidden.discard(best)
+            order.append(best)
+        
+        if len(self._order_cache) >= 128:
+            self._order_cache.clear()
+        cached = (self._version(), relevant, order)
+        self._order_cache[key] = cached
+        return cached
+    
+    def posterior(self, query: str, evidence: Optional[Dict[str, bool]] = None) -> float:
+        """P(query = prawda | evidence)"""
+        evidence = evidence or {}
+        variables = list(evidence)
+        rows = np.array([[int(bool(evidence[var])) for var in variables]], dtype=np.intp)
+        return float(self.posterior_batch(query, variables, rows)[0])
+    
+    def posterior_batch(self, query: str, evidence_variables: List[str], evidence_rows: Any) -> np.ndarray:
+        """
+        Wsadowe P(query = prawda | dowody) dla wielu wierszy dowodów.
+        evidence_rows: tablica (wiersze x len(evidence_variables)) wartości 0/1.
+        Wiersze o zerowym prawdopodobieństwie dowodów dają NaN.
+        """
+        evidence_key = tuple(sorted(evidence_variables))
+        _, relevant, order = self._prepare(query, evidence_key)
+        
+        rows = np.atleast_2d(np.asarray(evidence_rows, dtype=np.intp))
+        columns = [list(evidence_variables).index(var) for var in evidence_key]
+        rows = rows[:, columns]
+        
+        results = np.empty(rows.shape[0])
+        for start in range(0, max(rows.shape[0], 1), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            if chunk.shape[0]:
+                results[start:start + chunk.shape[0]] = self._eliminate(query, evidence_key, chunk, relevant, order)
+        return results
+    
+    def _eliminate(self, query: str, evidence_key: Tuple[str, ...], rows: np.ndarray,
+                   relevant: List[str], order: List[str]) -> np.ndarray:
+        """Eliminacja zmiennych dla bloku wierszy dowodów (oś 0 czynników wsadowych = wiersz)"""
+        evidence_column = {var: i for i, var in enumerate(evidence_key)}
+        
+        # Czynniki: (zmienne, tablica, czy_wsadowy); dowody podstawiane indeksowaniem per wiersz
+        factors = []
+        for variable in relevant:
+            parents, table = self.get_cpt(variable)
+            scope = parents + (variable,)
+            observed = [axis for axis, node in enumerate(scope) if node in evidence_column]
+            if observed:
+                free = [axis for axis in range(len(scope)) if axis not in observed]
+                table = np.transpose(table, observed + free)[tuple(rows[:, evidence_column[scope[axis]]] for axis in observed)]
+                factors.append((tuple(scope[axis] for axis in free), table, True))
+            else:
+                factors.append((scope, table, False))
+        
+        for variable in order + [None]:
+            if variable is None:
+                involved, factors = factors, []
+                output_variables = (query,)
+            else:
+                involved = [factor for factor in factors if variable in factor[0]]
+                factors = [factor for factor in factors if variable not in factor[0]]
+                output_variables = tuple(dict.fromkeys(
+                    node for factor in involved for node in factor[0] if node != variable))
+            
+            labels = {node: i + 1 for i, node in enumerate(dict.fromkeys(
+                node for factor in involved for node in factor[0]))}
+            if len(labels) >= 52:
+                raise ValueError("Zbyt duża szerokość drzewa dla eliminacji zmiennych")
+            batched = any(factor[2] for factor in involved)
+            
+            operands = []
+            for scope, table, is_batched in involved:
+                operands.extend([table, ([0] if is_batched else []) + [labels[node] for node in scope]])
+            output = ([0] if batched else []) + [labels[node] for node in output_variables]
+            factors.append((output_variables, np.einsum(*operands, output), batched))
+        
+        joint = factors[-1][1]
+        if not factors[-1][2]:
+            joint = np.broadcast_to(joint, (rows.shape[0], 2))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return joint[:, 1] / joint.sum(axis=1)
 
 class ProbabilisticReasoning:
     """Silnik rozumowania probabilistycznego"""
@@ -685,6 +2022,8 @@ class ProbabilisticReasoning:
         self.kb = knowledge_base
         self.bayesian_inferences = 0
         self.uncertainty_calculations = 0
+        self._propagation_networks: Dict[Tuple, 'UncertaintyPropagationNetwork'] = {}
+        self.bayesian_network = BayesianNetwork(knowledge_base)
     
     def bayesian_inference(self, hypothesis: str, evidence: str,
                           prior_prob: float, likelihood: float,
@@ -706,81 +2045,247 @@ class ProbabilisticReasoning:
         
         return posterior
     
+    def causal_posterior(self, query: str, evidence: Dict[str, bool]) -> Optional[float]:
+        """
+        Dokładne P(query | evidence) w sieci bayesowskiej zbudowanej na grafie przyczynowym
+        """
+        try:
+            posterior = self.bayesian_network.posterior(query, evidence)
+        except (nx.NetworkXError, ValueError) as e:
+            logger.error(f"Błąd wnioskowania w sieci bayesowskiej: {e}")
+            return None
+        
+        self.bayesian_inferences += 1
+        logger.info(f"Sieć bayesowska: P({query}|{evidence}) = {posterior:.3f}")
+        return posterior
+    
+    def causal_posterior_batch(self, query: str, evidence_variables: List[str],
+                               evidence_rows: Any) -> Optional[np.ndarray]:
+        """
+        Wsadowe P(query | dowody) dla wielu wierszy dowodów (wiersze x evidence_variables, 0/1)
+        """
+        try:
+            posteriors = self.bayesian_network.posterior_batch(query, evidence_variables, evidence_rows)
+        except (nx.NetworkXError, ValueError) as e:
+            logger.error(f"Błąd wnioskowania w sieci bayesowskiej: {e}")
+            return None
+        
+        self.bayesian_inferences += len(posteriors)
+        logger.info(f"Sieć bayesowska: {len(posteriors)} zapytań o {query}")
+        return posteriors
+    
     def uncertainty_propagation(self, beliefs: Dict[str, Tuple[float, float]],
                                dependencies: Dict[str, List[str]]) -> Dict[str, Tuple[float, float]]:
         """
         Propagacja niepewności przez sieć zależności
         beliefs: {variable: (mean, std_dev)}
         dependencies: {variable: [parent_variables]}
+
+        Zmienne przeliczane są w kolejności topologicznej, więc rodzice mogą być
+        wcześniej wyliczonymi zmiennymi (sieci wielopoziomowe w jednym wywołaniu).
         """
-        updated_beliefs = beliefs.copy()
+        variables = list(beliefs)
+        means = np.array([[beliefs[var][0] for var in variables]], dtype=float)
+        stds = np.array([[beliefs[var][1] for var in variables]], dtype=float)
         
-        # Prosta propagacja niepewności (linearyzacja)
-        for var, parents in dependencies.items():
-            if parents and all(parent in beliefs for parent in parents):
-                # Suma wariancji (dla niezależnych zmiennych)
-                total_variance = sum(beliefs[parent][1]**2 for parent in parents)
-                total_mean = sum(beliefs[parent][0] for parent in parents) / len(parents)
-                
-                updated_beliefs[var] = (total_mean, math.sqrt(total_variance))
-                
-                self.uncertainty_calculations += 1
+        all_variables, new_means, new_stds = self.propagate_uncertainty_batch(
+            variables, means, stds, dependencies)
+        
+        updated_beliefs = beliefs.copy()
+        for i in self._get_propagation_network(dependencies, variables).derived_columns:
+            updated_beliefs[all_variables[i]] = (float(new_means[0, i]), float(new_stds[0, i]))
         
         logger.info(f"Propagacja niepewności: zaktualizowano {len(updated_beliefs)} przekonań")
         return updated_beliefs
     
+    def propagate_uncertainty_batch(self, variables: List[str], means: np.ndarray, stds: np.ndarray,
+                                    dependencies: Dict[str, List[str]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Wsadowa propagacja niepewności dla wielu scenariuszy naraz.
+        means/stds: tablice (scenariusze x len(variables)) lub 1-D dla jednego scenariusza.
+        Zwraca (zmienne, średnie, odchylenia) - kolumny to variables oraz zmienne
+        wyliczone spoza variables; zmienne bez kompletu rodziców pozostają bez zmian.
+        """
+        network = self._get_propagation_network(dependencies, variables)
+        means = np.atleast_2d(np.asarray(means, dtype=float))
+        stds = np.atleast_2d(np.asarray(stds, dtype=float))
+        
+        new_means, new_stds = network.propagate(means, stds)
+        self.uncertainty_calculations += len(network.derived_columns) * means.shape[0]
+        return network.variables, new_means, new_stds
+    
+    def _get_propagation_network(self, dependencies: Dict[str, List[str]],
+                                 variables: List[str]) -> 'UncertaintyPropagationNetwork':
+        """Zwraca skompilowaną (i zapamiętaną) sieć dla danego kształtu zależności"""
+        key = (
+            tuple((var, tuple(parents)) for var, parents in dependencies.items()),
+            tuple(variables)
+        )
+        network = self._propagation_networks.get(key)
+        if network is None:
+            if len(self._propagation_networks) >= 128:
+                self._propagation_networks.clear()
+            network = UncertaintyPropagationNetwork(dependencies, variables)
+            self._propagation_networks[key] = network
+        return network
+    
     def monte_carlo_simulation(self, variables: Dict[str, Dict[str, float]],
                               relationships: List[Dict[str, Any]],
-                              num_samples: int = 1000) -> Dict[str, Dict[str, float]]:
+                              num_samples: int = 1000,
+                              seed: Optional[int] = None,
+                              chunk_size: int = 262144,
+                              n_workers: Optional[int] = None,
+                              max_quantile_samples: int = 1000000) -> Dict[str, Dict[str, float]]:
         """
         Symulacja Monte Carlo dla złożonych modeli probabilistycznych
+
+        Próbki każdej zmiennej losowane są jako tablice numpy.random.Generator w
+        porcjach po chunk_size, a relacje liniowe liczone są wektorowo w kolejności
+        topologicznej. Średnia i odchylenie są dokładne; kwantyle liczone są z
+        jednolitej podpróbki co najwyżej max_quantile_samples wartości (dokładne,
+        gdy num_samples jej nie przekracza). n_workers > 1 rozdziela próbki na pulę
+        procesów z niezależnymi strumieniami SeedSequence(seed).spawn().
+        Dla num_samples <= 0 zgłaszany jest ValueError.
         """
-        results = {var: [] for var in variables.keys()}
-        
-        for _ in range(num_samples):
-            # Próbkuj wartości zmiennych
-            sample = {}
-            for var, params in variables.items():
-                if params['distribution'] == 'normal':
-                    sample[var] = np.random.normal(params['mean'], params['std'])
-                elif params['distribution'] == 'uniform':
-                    sample[var] = np.random.uniform(params['min'], params['max'])
-                elif params['distribution'] == 'bernoulli':
-                    sample[var] = np.random.bernoulli(params['p'])
-            
-            # Zastosuj relacje
-            for relationship in relationships:
-                if relationship['type'] == 'linear':
-                    var = relationship['target']
-                    sources = relationship['sources']
-                    weights = relationship['weights']
-                    
-                    sample[var] = sum(sample[src] * weight 
-                                    for src, weight in zip(sources, weights))
-            
-            # Zapisz wyniki
-            for var, value in sample.items():
-                results[var].append(value)
+        if num_samples <= 0:
+            raise ValueError(f"Liczba próbek Monte Carlo musi być dodatnia: {num_samples}")
+        ordered_relationships = order_linear_relationships(relationships)
+        sample_fraction = min(1.0, max_quantile_samples / max(num_samples, 1))
+        
+        workers = max(1, n_workers or 1)
+        streams = np.random.SeedSequence(seed).spawn(workers)
+        shares = [num_samples // workers + (1 if i < num_samples % workers else 0) for i in range(workers)]
+        
+        if workers == 1:
+            accumulator = _monte_carlo_worker(variables, ordered_relationships, num_samples,
+                                              streams[0], chunk_size, sample_fraction)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_monte_carlo_worker, variables, ordered_relationships, share,
+                                stream, chunk_size, sample_fraction)
+                    for share, stream in zip(shares, streams) if share > 0
+                ]
+                accumulator = MonteCarloAccumulator()
+                for future in futures:
+                    accumulator.merge(future.result())
+        
+        statistics = accumulator.statistics()
         
-        # Oblicz statystyki
+        logger.info(f"Monte Carlo: {num_samples} próbek dla {len(variables)} zmiennych")
+        return statistics
+
+def order_linear_relationships(relationships: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Porządkuje relacje liniowe topologicznie według grafu źródło → cel"""
+    linear = [relationship for relationship in relationships if relationship['type'] == 'linear']
+    graph = nx.DiGraph()
+    for relationship in linear:
+        for source in relationship['sources']:
+            graph.add_edge(source, relationship['target'])
+    try:
+        order = {node: i for i, node in enumerate(nx.topological_sort(graph))}
+    except nx.NetworkXUnfeasible:
+        raise ValueError("Relacje Monte Carlo zawierają cykl")
+    return sorted(linear, key=lambda relationship: order[relationship['target']])
+
+def sample_monte_carlo_chunk(rng: np.random.Generator, variables: Dict[str, Dict[str, float]],
+                             ordered_relationships: List[Dict[str, Any]], size: int) -> Dict[str, np.ndarray]:
+    """Losuje porcję próbek wszystkich zmiennych i wylicza relacje liniowe wektorowo"""
+    sample = {}
+    for var, params in variables.items():
+        distribution = params['distribution']
+        if distribution == 'normal':
+            sample[var] = rng.normal(params['mean'], params['std'], size)
+        elif distribution == 'uniform':
+            sample[var] = rng.uniform(params['min'], params['max'], size)
+        elif distribution == 'bernoulli':
+            sample[var] = (rng.random(size) < params['p']).astype(np.float64)
+        else:
+            raise ValueError(f"Nieznany rozkład zmiennej {var}: {distribution}")
+    
+    for relationship in ordered_relationships:
+        total = np.zeros(size)
+        for source, weight in zip(relationship['sources'], relationship['weights']):
+            total += sample[source] * weight
+        sample[relationship['target']] = total
+    
+    return sample
+
+class MonteCarloAccumulator:
+    """
+    Strumieniowe statystyki próbek Monte Carlo: średnia i wariancja łączone
+    algorytmem Chana oraz ograniczona podpróbka do kwantyli
+    """
+    
+    def __init__(self, sample_fraction: float = 1.0):
+        self.sample_fraction = sample_fraction
+        self.count: Dict[str, int] = {}
+        self.mean: Dict[str, float] = {}
+        self.m2: Dict[str, float] = {}
+        self.subsamples: Dict[str, List[np.ndarray]] = defaultdict(list)
+    
+    def _combine(self, var: str, count: int, mean: float, m2: float):
+        if var not in self.count:
+            self.count[var], self.mean[var], self.m2[var] = count, mean, m2
+            return
+        total = self.count[var] + count
+        delta = mean - self.mean[var]
+        self.mean[var] += delta * count / total
+        self.m2[var] += m2 + delta * delta * self.count[var] * count / total
+        self.count[var] = total
+    
+    def update(self, sample: Dict[str, np.ndarray]):
+        """Dodaje porcję próbek"""
+        for var, values in sample.items():
+            chunk_mean = float(values.mean())
+            centered = values - chunk_mean
+            self._combine(var, values.size, chunk_mean, float(np.dot(centered, centered)))
+            
+            # Próbki w porcji są i.i.d., więc jej prefiks jest jednolitą podpróbką
+            keep = values.size if self.sample_fraction >= 1.0 else math.ceil(values.size * self.sample_fraction)
+            self.subsamples[var].append(values[:keep].copy())
+    
+    def merge(self, other: 'MonteCarloAccumulator'):
+        """Łączy statystyki z innego akumulatora (np. z procesu roboczego)"""
+        for var in other.count:
+            self._combine(var, other.count[var], other.mean[var], other.m2[var])
+            self.subsamples[var].extend(other.subsamples[var])
+    
+    def statistics(self) -> Dict[str, Dict[str, float]]:
+        """Zwraca statystyki dla każdej zmiennej"""
         statistics = {}
-        for var, values in results.items():
+        for var, count in self.count.items():
+            values = np.concatenate(self.subsamples[var])
+            median, q25, q75 = np.percentile(values, [50, 25, 75])
             statistics[var] = {
-                'mean': np.mean(values),
-                'std': np.std(values),
-                'median': np.median(values),
-                'q25': np.percentile(values, 25),
-                'q75': np.percentile(values, 75)
+                'mean': self.mean[var],
+                'std': math.sqrt(self.m2[var] / count),
+                'median': float(median),
+                'q25': float(q25),
+                'q75': float(q75)
             }
-        
-        logger.info(f"Monte Carlo: {num_samples} próbek dla {len(variables)} zmiennych")
         return statistics
 
+def _monte_carlo_worker(variables: Dict[str, Dict[str, float]],
+                        ordered_relationships: List[Dict[str, Any]],
+                        num_samples: int, seed_sequence: np.random.SeedSequence,
+                        chunk_size: int, sample_fraction: float) -> MonteCarloAccumulator:
+    """Losuje num_samples próbek w porcjach z własnego strumienia (także w procesie roboczym)"""
+    rng = np.random.default_rng(seed_sequence)
+    accumulator = MonteCarloAccumulator(sample_fraction)
+    remaining = num_samples
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        accumulator.update(sample_monte_carlo_chunk(rng, variables, ordered_relationships, size))
+        remaining -= size
+    return accumulator
+
 class AbstractReasoningEngine:
     """Główny silnik rozumowania abstrakcyjnego"""
     
-    def __init__(self):
-        self.knowledge_base = SymbolicKnowledgeBase()
+    def __init__(self, trace_retention: Optional[int] = 10000,
+                 knowledge_base: Optional[SymbolicKnowledgeBase] = None):
+        self.knowledge_base = knowledge_base if knowledge_base is not None else SymbolicKnowledgeBase()
         self.deductive_engine = DeductiveReasoning(self.knowledge_base)
         self.inductive_engine = InductiveReasoning(self.knowledge_base)
         self.abductive_engine = AbductiveReasoning(self.knowledge_base)
@@ -788,13 +2293,19 @@ class AbstractReasoningEngine:
         self.planning_engine = HierarchicalPlanning(self.knowledge_base)
         self.probabilistic_engine = ProbabilisticReasoning(self.knowledge_base)
         
-        self.reasoning_traces: List[ReasoningTrace] = []
+        # Bufor cykliczny ostatnich śladów (trace_retention=None - bez limitu)
+        self.trace_retention = trace_retention
+        self.reasoning_traces: deque = deque(maxlen=trace_retention)
         self.performance_metrics = {
             "total_inferences": 0,
             "successful_inferences": 0,
             "average_confidence": 0.0,
             "reasoning_types_used": set()
         }
+        # Agregaty per typ rozumowania, aktualizowane przyrostowo
+        self.type_statistics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+        self._executors: Dict[str, Executor] = {}
         
         logger.info("Zainicjalizowano Advanced Abstract Reasoning Engine")
     
@@ -804,6 +2315,14 @@ class AbstractReasoningEngine:
         """
         Główna metoda rozumowania - wybiera odpowiedni silnik i wykonuje wnioskowanie
         """
+        trace = self._execute_reasoning(premises, reasoning_type, context)
+        self._record_trace(trace)
+        return trace
+    
+    def _execute_reasoning(self, premises: List[LogicalStatement],
+                           reasoning_type: ReasoningType,
+                           context: Dict[str, Any] = None) -> ReasoningTrace:
+        """Wykonuje wnioskowanie i zwraca ślad bez zapisywania go w metrykach"""
         start_time = datetime.now()
         trace_id = str(uuid.uuid4())
         
@@ -872,34 +2391,376 @@ class AbstractReasoningEngine:
             execution_time=execution_time,
             success=success
         )
-        
-        self.reasoning_traces.append(trace)
-        self._update_performance_metrics(trace)
-        
-        logger.info(f"Rozumowanie {reasoning_type.value}: {'sukces' if success else 'niepowodzenie'} "
-                   f"(pewność: {final_confidence:.2f}, czas: {execution_time:.3f}s)")
-        
         return trace
     
+    def _record_trace(self, trace: ReasoningTrace):
+        """Zapisuje ślad i aktualizuje metryki (bezpieczne wątkowo)"""
+        with self._metrics_lock:
+            self.reasoning_traces.append(trace)
+            self._update_performance_metrics(trace)
+        
+        logger.info(f"Rozumowanie {trace.reasoning_type.value}: {'sukces' if trace.success else 'niepowodzenie'} "
+                   f"(pewność: {trace.confidence:.2f}, czas: {trace.execution_time:.3f}s)")
+    
     def multi_strategy_reasoning(self, premises: List[LogicalStatement],
-                               strategies: List[ReasoningType] = None) -> List[ReasoningTrace]:
+                               strategies: List[ReasoningType] = None,
+                               executor: Union[None, str, Executor, Dict[ReasoningType, Union[str, Executor]]] = None,
+                               timeout: Union[None, float, Dict[ReasoningType, float]] = None,
+                               confidence_threshold: Optional[float] = None,
+                               context: Dict[str, Any] = None) -> List[ReasoningTrace]:
         """
         Rozumowanie wykorzystujące wiele strategii równolegle
+
+        executor: None - strategie po kolei; "thread" - pula wątków; "process" - pula
+        procesów (baza wiedzy przesyłana do procesu z każdym zadaniem, liczniki
+        silników potomnych nie wracają do tego silnika); instancja Executor; albo
+        słownik {ReasoningType: wykonawca} (domyślnie "thread") dla mieszanych strategii.
+        timeout: limit czasu w sekundach (wspólny lub per strategia) - strategia, która
+        go przekroczy, daje nieudany ślad. Przy executor=None strategie z limitem
+        wykonywane są po kolei na puli wątków, a limit liczony jest od startu strategii
+        (przerwanej strategii nie da się zatrzymać - kończy się w tle, jej wynik jest
+        odrzucany). confidence_threshold: zakończ po pierwszym udanym wniosku
+        o pewności >= progu (pozostałe strategie są anulowane).
         """
         if strategies is None:
             strategies = [ReasoningType.DEDUCTION, ReasoningType.INDUCTION, ReasoningType.ABDUCTION]
         
-        traces = []
-        for strategy in strategies:
-            trace = self.reason(premises, strategy)
-            traces.append(trace)
+        if executor is None:
+            traces = []
+            for strategy in strategies:
+                limit = timeout.get(strategy) if isinstance(timeout, dict) else timeout
+                if limit is None:
+                    trace = self.reason(premises, strategy, context)
+                else:
+                    trace = self._reason_with_timeout(premises, strategy, context, limit)
+                traces.append(trace)
+                if self._meets_threshold(trace, confidence_threshold):
+                    break
+        else:
+            traces = self._run_strategies_concurrently(premises, strategies, executor,
+                                                       timeout, confidence_threshold, context)
         
         # Sortuj według pewności
         traces.sort(key=lambda t: t.confidence, reverse=True)
         
-        logger.info(f"Multi-strategy reasoning: {len(traces)} strategii, najlepsza pewność: {traces[0].confidence:.2f}")
+        best_confidence = traces[0].confidence if traces else 0.0
+        logger.info(f"Multi-strategy reasoning: {len(traces)} strategii, najlepsza pewność: {best_confidence:.2f}")
+        return traces
+    
+    def _reason_with_timeout(self, premises: List[LogicalStatement], strategy: ReasoningType,
+                             context: Dict[str, Any], limit: float) -> ReasoningTrace:
+        """Jedna strategia na puli wątków z limitem czasu - jak reason(), ale z nieudanym śladem po przekroczeniu"""
+        started = time.monotonic()
+        future = self._submit_strategy(strategy, premises, "thread", context)
+        try:
+            trace = future.result(timeout=limit)
+        except FutureTimeoutError:
+            future.cancel()
+            logger.warning(f"Strategia {strategy.value} przekroczyła limit czasu")
+            trace = self._failed_trace(premises, strategy, "Timeout", time.monotonic() - started)
+        except Exception as e:
+            trace = self._failed_trace(premises, strategy, f"Error: {e}", time.monotonic() - started)
+        self._record_trace(trace)
+        return trace
+    
+    async def multi_strategy_reasoning_async(self, premises: List[LogicalStatement],
+                                             strategies: List[ReasoningType] = None,
+                                             executor: Union[str, Executor, Dict[ReasoningType, Union[str, Executor]]] = "thread",
+                                             timeout: Union[None, float, Dict[ReasoningType, float]] = None,
+                                             confidence_threshold: Optional[float] = None,
+                                             context: Dict[str, Any] = None) -> List[ReasoningTrace]:
+        """
+        Wersja multi_strategy_reasoning dla asyncio - nie blokuje pętli zdarzeń
+
+        Każda strategia planowana jest osobno na swoim wykonawcy (executor=None oznacza
+        "thread"), limit czasu pilnowany jest przez asyncio.wait_for, a po osiągnięciu
+        confidence_threshold pozostałe strategie są anulowane.
+        """
+        if strategies is None:
+            strategies = [ReasoningType.DEDUCTION, ReasoningType.INDUCTION, ReasoningType.ABDUCTION]
+        if executor is None:
+            executor = "thread"
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        async def run_strategy(strategy: ReasoningType) -> ReasoningTrace:
+            pool, call = self._strategy_call(strategy, premises, executor, context)
+            limit = timeout.get(strategy) if isinstance(timeout, dict) else timeout
+            try:
+                trace = await asyncio.wait_for(loop.run_in_executor(pool, call), limit)
+            except asyncio.TimeoutError:
+                logger.warning(f"Strategia {strategy.value} przekroczyła limit czasu")
+                trace = self._failed_trace(premises, strategy, "Timeout", loop.time() - started)
+            except Exception as e:
+                trace = self._failed_trace(premises, strategy, f"Error: {e}", loop.time() - started)
+            self._record_trace(trace)
+            return trace
+        
+        tasks = [asyncio.ensure_future(run_strategy(strategy)) for strategy in strategies]
+        traces = []
+        try:
+            for next_trace in asyncio.as_completed(tasks):
+                trace = await next_trace
+                traces.append(trace)
+                if self._meets_threshold(trace, confidence_threshold):
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        traces.sort(key=lambda t: t.confidence, reverse=True)
+        best_confidence = traces[0].confidence if traces else 0.0
+        logger.info(f"Multi-strategy reasoning: {len(traces)} strategii, najlepsza pewność: {best_confidence:.2f}")
+        return traces
+    
+    @staticmethod
+    def _meets_threshold(trace: ReasoningTrace, confidence_threshold: Optional[float]) -> bool:
+        return (confidence_threshold is not None and trace.success
+                and trace.confidence >= confidence_threshold)
+    
+    def _run_strategies_concurrently(self, premises: List[LogicalStatement],
+                                     strategies: List[ReasoningType], executor,
+                                     timeout, confidence_threshold: Optional[float],
+                                     context: Dict[str, Any]) -> List[ReasoningTrace]:
+        """Uruchamia strategie na wykonawcach i zbiera ślady z limitami czasu"""
+        started = time.monotonic()
+        futures: Dict[Future, ReasoningType] = {}
+        deadlines: Dict[Future, float] = {}
+        for strategy in strategies:
+            future = self._submit_strategy(strategy, premises, executor, context)
+            futures[future] = strategy
+            limit = timeout.get(strategy) if isinstance(timeout, dict) else timeout
+            deadlines[future] = started + limit if limit is not None else math.inf
+        
+        traces = []
+        pending = set(futures)
+        while pending:
+            next_deadline = min(deadlines[future] for future in pending)
+            wait_time = None if next_deadline == math.inf else max(0.0, next_deadline - time.monotonic())
+            done, pending = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                strategy = futures[future]
+                try:
+                    trace = future.result()
+                except Exception as e:
+                    trace = self._failed_trace(premises, strategy, f"Error: {e}", time.monotonic() - started)
+                self._record_trace(trace)
+                traces.append(trace)
+            
+            if any(self._meets_threshold(trace, confidence_threshold) for trace in traces):
+                for future in pending:
+                    future.cancel()
+                break
+            
+            now = time.monotonic()
+            for future in [future for future in pending if deadlines[future] <= now]:
+                future.cancel()
+                pending.discard(future)
+                strategy = futures[future]
+                logger.warning(f"Strategia {strategy.value} przekroczyła limit czasu")
+                trace = self._failed_trace(premises, strategy, "Timeout", now - started)
+                self._record_trace(trace)
+                traces.append(trace)
+        
         return traces
     
+    def _strategy_call(self, strategy: ReasoningType, premises: List[LogicalStatement],
+                       executor, context: Dict[str, Any]) -> Tuple[Executor, Callable[[], ReasoningTrace]]:
+        """Wybiera wykonawcę strategii i wywołanie, które ma na nim wykonać"""
+        spec = executor.get(strategy, "thread") if isinstance(executor, dict) else executor
+        if isinstance(spec, str):
+            if spec not in self._executors:
+                if spec == "thread":
+                    self._executors[spec] = ThreadPoolExecutor(thread_name_prefix="reasoning")
+                elif spec == "process":
+                    self._executors[spec] = ProcessPoolExecutor()
+                else:
+                    raise ValueError(f"Nieznany wykonawca: {spec}")
+            spec = self._executors[spec]
+        
+        if isinstance(spec, ProcessPoolExecutor):
+            return spec, functools.partial(_reason_in_worker, self.knowledge_base, premises, strategy, context)
+        return spec, functools.partial(self._execute_reasoning, premises, strategy, context)
+    
+    def _submit_strategy(self, strategy: ReasoningType, premises: List[LogicalStatement],
+                         executor, context: Dict[str, Any]) -> Future:
+        """Przekazuje strategię do odpowiedniego wykonawcy"""
+        pool, call = self._strategy_call(strategy, premises, executor, context)
+        return pool.submit(call)
+    
+    def _failed_trace(self, premises: List[LogicalStatement], strategy: ReasoningType,
+                      reason: str, execution_time: float) -> ReasoningTrace:
+        return ReasoningTrace(
+            trace_id=str(uuid.uuid4()),
+            reasoning_type=strategy,
+            input_premises=premises,
+            reasoning_steps=[reason],
+            final_conclusion=None,
+            confidence=0.0,
+            execution_time=execution_time,
+            success=False
+        )
+    
+    def reason_many(self, premise_sets: List[List[LogicalStatement]],
+                    reasoning_type: ReasoningType = ReasoningType.DEDUCTION,
+                    record_traces: bool = False) -> List[CompactInference]:
+        """
+        Wsadowe rozumowanie dla wielu zestawów przesłanek
+
+        Dla dedukcji treść przesłanek parsowana jest raz na cały wsad, zestawy
+        grupowane są według kształtu przesłanki głównej (implikacja / sylogizm / inne)
+        i oceniane w ciasnej pętli, bez UUID, znaczników czasu i logów per wniosek.
+        Wyniki są takie jak z reason(). Metryki aktualizowane są raz na wsad, a pełne
+        ślady zapisywane tylko przy record_traces=True. Inne typy rozumowania
+        wykonywane są przez _execute_reasoning dla każdego zestawu.
+        """
+        start_time = time.perf_counter()
+        
+        if reasoning_type == ReasoningType.DEDUCTION:
+            # Wsad alokuje setki tysięcy małych obiektów wyników; cykliczny GC
+            # przeglądałby przy tym wielokrotnie całą (dużą) stertę przesłanek
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                results = self._deduce_many(premise_sets)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+        else:
+            results = []
+            for premises in premise_sets:
+                trace = self._execute_reasoning(premises, reasoning_type)
+                conclusion = trace.final_conclusion
+                results.append(CompactInference(
+                    success=trace.success,
+                    conclusion=conclusion.content if conclusion else None,
+                    confidence=trace.confidence,
+                    source=conclusion.source if conclusion else None,
+                    predicates=conclusion.predicates if conclusion else []
+                ))
+        
+        execution_time = time.perf_counter() - start_time
+        self._record_batch(premise_sets, reasoning_type, results, record_traces,
+                           execution_time / max(len(results), 1))
+        
+        successes = sum(1 for result in results if result.success)
+        logger.info(f"Rozumowanie wsadowe {reasoning_type.value}: {successes}/{len(results)} sukcesów "
+                   f"(czas: {execution_time:.3f}s)")
+        return results
+    
+    def _deduce_many(self, premise_sets: List[List[LogicalStatement]]) -> List[CompactInference]:
+        """
+        Dedukcja wsadowa: modus ponens, a gdy nie zadziała - sylogizm
+
+        Każda unikalna treść przesłanki parsowana jest raz, a wynik reguły (bez
+        pewności) zapamiętywany dla każdej unikalnej pary treści - w pętli zostaje
+        odczyt słownika i zbudowanie wyniku.
+        """
+        parsed_by_content: Dict[str, ParsedStatement] = {}
+        outcomes: Dict[Tuple[str, str], Optional[Tuple[str, str, List[str]]]] = {}
+        results = []
+        append = results.append
+        make = CompactInference
+        modus_ponens_hits = 0
+        
+        for premises in premise_sets:
+            if len(premises) < 2:
+                append(make(False))
+                continue
+            major, minor = premises[0], premises[1]
+            pair = (major.content, minor.content)
+            try:
+                outcome = outcomes[pair]
+            except KeyError:
+                for content in pair:
+                    if content not in parsed_by_content:
+                        parsed_by_content[content] = parse_statement(content)
+                outcome = outcomes[pair] = self._deduction_outcome(parsed_by_content[pair[0]],
+                                                                   parsed_by_content[pair[1]])
+            if outcome is None:
+                append(make(False))
+                continue
+            source, conclusion, predicates = outcome
+            if source == "modus_ponens":
+                modus_ponens_hits += 1
+            major_confidence, minor_confidence = major.confidence, minor.confidence
+            confidence = major_confidence if major_confidence < minor_confidence else minor_confidence
+            # Argumenty pozycyjne: (success, conclusion, confidence, source, predicates)
+            append(make(True, conclusion, confidence * 0.9, source, predicates.copy()))
+        
+        if modus_ponens_hits:
+            deductive_engine = self.deductive_engine
+            with deductive_engine._stats_lock:
+                deductive_engine.modus_ponens_count += modus_ponens_hits
+        return results
+    
+    @staticmethod
+    def _deduction_outcome(major_parsed: "ParsedStatement",
+                           minor_parsed: "ParsedStatement") -> Optional[Tuple[str, str, List[str]]]:
+        """(źródło, wniosek, predykaty) dedukcji z pary przesłanek albo None"""
+        if major_parsed.is_implication and major_parsed.antecedent_lower in minor_parsed.lowered:
+            consequent = major_parsed.consequent
+            return "modus_ponens", consequent, [consequent]
+        if (major_parsed.is_categorical and minor_parsed.member is not None
+                and minor_parsed.member_category == major_parsed.category_subject):
+            individual_C, category_B = minor_parsed.member, major_parsed.category_predicate
+            return "syllogism", f"{individual_C} is {category_B}", [category_B, individual_C]
+        return None
+    
+    def _record_batch(self, premise_sets: List[List[LogicalStatement]], reasoning_type: ReasoningType,
+                      results: List[CompactInference], record_traces: bool, execution_time: float):
+        """Aktualizuje metryki raz na wsad (opcjonalnie zapisuje pełne ślady)"""
+        if not results:
+            return
+        successes = sum(1 for result in results if result.success)
+        confidence_sum = sum(result.confidence for result in results)
+        
+        with self._metrics_lock:
+            metrics = self.performance_metrics
+            previous_total = metrics["total_inferences"]
+            metrics["total_inferences"] += len(results)
+            metrics["successful_inferences"] += successes
+            metrics["average_confidence"] = (
+                metrics["average_confidence"] * previous_total + confidence_sum
+            ) / metrics["total_inferences"]
+            metrics["reasoning_types_used"].add(reasoning_type.value)
+            
+            type_stats = self.type_statistics.setdefault(
+                reasoning_type.value, {"count": 0, "successes": 0, "confidence_sum": 0.0})
+            type_stats["count"] += len(results)
+            type_stats["successes"] += successes
+            type_stats["confidence_sum"] += confidence_sum
+            
+            if record_traces:
+                for premises, result in zip(premise_sets, results):
+                    conclusion = None
+                    if result.success:
+                        conclusion = LogicalStatement(
+                            id=str(uuid.uuid4()),
+                            content=result.conclusion,
+                            confidence=result.confidence,
+                            source=result.source,
+                            predicates=list(result.predicates)
+                        )
+                    self.reasoning_traces.append(ReasoningTrace(
+                        trace_id=str(uuid.uuid4()),
+                        reasoning_type=reasoning_type,
+                        input_premises=premises,
+                        reasoning_steps=["Applied batch reasoning"],
+                        final_conclusion=conclusion,
+                        confidence=result.confidence,
+                        execution_time=execution_time,
+                        success=result.success
+                    ))
+    
+    def shutdown_executors(self):
+        """Zamyka pule wątków/procesów utworzone przez multi_strategy_reasoning"""
+        for pool in self._executors.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._executors = {}
+    
     def _update_performance_metrics(self, trace: ReasoningTrace):
         """Aktualizuje metryki wydajności"""
         self.performance_metrics["total_inferences"] += 1
@@ -913,35 +2774,37 @@ class AbstractReasoningEngine:
         self.performance_metrics["average_confidence"] = new_avg
         
         self.performance_metrics["reasoning_types_used"].add(trace.reasoning_type.value)
+        
+        type_stats = self.type_statistics.setdefault(
+            trace.reasoning_type.value, {"count": 0, "successes": 0, "confidence_sum": 0.0})
+        type_stats["count"] += 1
+        if trace.success:
+            type_stats["successes"] += 1
+        type_stats["confidence_sum"] += trace.confidence
     
     def get_reasoning_statistics(self) -> Dict[str, Any]:
-        """Zwraca statystyki rozumowania"""
-        total_traces = len(self.reasoning_traces)
+        """Zwraca statystyki rozumowania (O(1) - z agregatów przyrostowych)"""
+        total_traces = self.performance_metrics["total_inferences"]
         if total_traces == 0:
             return {"message": "Brak danych o rozumowaniu"}
         
         # Statystyki według typu rozumowania
-        type_stats = defaultdict(lambda: {"count": 0, "success_rate": 0.0, "avg_confidence": 0.0})
-        
-        for trace in self.reasoning_traces:
-            type_key = trace.reasoning_type.value
-            type_stats[type_key]["count"] += 1
-            if trace.success:
-                type_stats[type_key]["success_rate"] += 1
-            type_stats[type_key]["avg_confidence"] += trace.confidence
-        
-        # Normalizuj statystyki
-        for type_key, stats in type_stats.items():
+        type_stats = {}
+        for type_key, stats in self.type_statistics.items():
             count = stats["count"]
-            stats["success_rate"] = stats["success_rate"] / count if count > 0 else 0
-            stats["avg_confidence"] = stats["avg_confidence"] / count if count > 0 else 0
+            type_stats[type_key] = {
+                "count": count,
+                "success_rate": stats["successes"] / count if count > 0 else 0,
+                "avg_confidence": stats["confidence_sum"] / count if count > 0 else 0
+            }
         
         return {
             "total_reasoning_traces": total_traces,
             "overall_success_rate": self.performance_metrics["successful_inferences"] / self.performance_metrics["total_inferences"],
             "average_confidence": self.performance_metrics["average_confidence"],
             "reasoning_types_used": list(self.performance_metrics["reasoning_types_used"]),
-            "detailed_statistics": dict(type_stats),
+            "detailed_statistics": type_stats,
+            "retained_traces": len(self.reasoning_traces),
             "knowledge_base_size": {
                 "statements": len(self.knowledge_base.statements),
                 "rules": len(self.knowledge_base.rules),
@@ -950,6 +2813,12 @@ class AbstractReasoningEngine:
             }
         }
 
+def _reason_in_worker(knowledge_base: SymbolicKnowledgeBase, premises: List[LogicalStatement],
+                      reasoning_type: ReasoningType, context: Dict[str, Any]) -> ReasoningTrace:
+    """Wykonuje jedną strategię rozumowania w procesie roboczym"""
+    engine = AbstractReasoningEngine(trace_retention=0, knowledge_base=knowledge_base)
+    return engine._execute_reasoning(premises, reasoning_type, context)
+
 def demonstrate_abstract_reasoning():
     """Demonstracja modułu rozumowania abstrakcyjnego"""
     print("=" * 70)
@@ -6,7 +6,7 @@ Poprawiona implementacja z lepszym parserem logicznym i heurystykami
 """
 
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Set, Iterable
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
@@ -14,70 +14,112 @@ import uuid
 import numpy as np
 import json
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import networkx as nx
 import re
 
 logger = logging.getLogger('ImprovedReasoning')
 logging.basicConfig(level=logging.INFO)
 
+# Wzorce struktur zdaniowych w kolejności priorytetu: (nazwa, wzorzec)
+SUBJECT_PREDICATE_PATTERNS = [
+    ("all_are", r"all (\w+) are (\w+)"),    # All X are Y
+    ("every_is", r"every (\w+) is (\w+)"),  # Every X is Y
+    ("is", r"(\w+) is (\w+)"),              # X is Y
+    ("are", r"(\w+) are (\w+)"),            # X are Y
+    ("if_then", r"if (.+) then (.+)"),       # If X then Y
+    ("if_comma", r"if (.+), (.+)"),          # If X, Y
+]
+
+# Formy implikacji w kolejności priorytetu
+IMPLICATION_PATTERNS = [
+    ("if_then", r"if (.+) then (.+)"),
+    ("if_comma", r"if (.+), (.+)"),
+    ("implies", r"(.+) implies (.+)"),
+    ("arrow", r"(.+) → (.+)"),
+]
+
+# Fragmenty dosłowne, z których co najmniej jeden występuje w każdym dopasowaniu wzorców
+SUBJECT_PREDICATE_MARKERS = (" is ", " are ", "if ")
+IMPLICATION_MARKERS = ("if ", " implies ", " → ")
+
+STOP_WORDS = frozenset({"is", "are", "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+                        "if", "then", "all", "every"})
+
+KEYWORD_PATTERN = re.compile(r'\w{3,}')  # całe słowa dłuższe niż 2 znaki
+
+PARSE_CACHE_SIZE = 65536
+
+DEFAULT_CAUSAL_WEIGHT = 0.5  # siła krawędzi przyczynowej bez atrybutu weight
+
+def _combine_patterns(patterns: List[Tuple[str, str]]) -> re.Pattern:
+    """
+    Łączy wzorce w jedno wyrażenie zachowujące kolejność priorytetu: alternatywa i
+    odpowiada re.search(wzorzec_i) i jest próbowana tylko, gdy wcześniejsze nie pasują
+    nigdzie w zdaniu. lastgroup wskazuje nazwę dopasowanego wzorca.
+    """
+    alternatives = []
+    for name, pattern in patterns:
+        groups = iter(range(1, pattern.count("(") + 1))
+        named = re.sub(r"\((?!\?)", lambda _: f"(?P<{name}_{next(groups)}>", pattern)
+        alternatives.append(f"[\\s\\S]*?(?P<{name}>{named})")
+    return re.compile("^(?:" + "|".join(alternatives) + ")")
+
+SUBJECT_PREDICATE_REGEX = _combine_patterns(SUBJECT_PREDICATE_PATTERNS)
+IMPLICATION_REGEX = _combine_patterns(IMPLICATION_PATTERNS)
+
+def match_pattern(regex: re.Pattern, sentence: str,
+                  markers: Tuple[str, ...] = ()) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Zwraca (nazwa wzorca, grupa 1, grupa 2) pierwszego pasującego wzorca"""
+    if markers and not any(marker in sentence for marker in markers):
+        return None, None, None
+    match = regex.match(sentence)
+    if not match:
+        return None, None, None
+    name = match.lastgroup
+    return name, match.group(f"{name}_1"), match.group(f"{name}_2")
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_subject_predicate(sentence: str) -> Tuple[Optional[str], Optional[str]]:
+    """Podmiot i orzeczenie zdania (cache LRU kluczowany zdaniem)"""
+    name, subject, predicate = match_pattern(SUBJECT_PREDICATE_REGEX, sentence.lower().strip(),
+                                             SUBJECT_PREDICATE_MARKERS)
+    if name is None:
+        return None, None
+    return subject.strip(), predicate.strip()
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_implication(sentence: str) -> Tuple[bool, Optional[str], Optional[str]]:
+    """Części implikacji zdania (cache LRU kluczowany zdaniem)"""
+    name, antecedent, consequent = match_pattern(IMPLICATION_REGEX, sentence.lower().strip(),
+                                                   IMPLICATION_MARKERS)
+    if name is None:
+        return False, None, None
+    return True, antecedent.strip().rstrip(','), consequent.strip()
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_keywords(sentence: str) -> Tuple[str, ...]:
+    """Słowa kluczowe zdania (cache LRU kluczowany zdaniem)"""
+    return tuple(word for word in KEYWORD_PATTERN.findall(sentence.lower()) if word not in STOP_WORDS)
+
 class SimpleLogicalParser:
     """Uproszczony parser logiczny"""
     
     @staticmethod
     def extract_subject_predicate(sentence: str) -> Tuple[Optional[str], Optional[str]]:
         """Wyciąga podmiot i orzeczenie z prostego zdania"""
-        sentence = sentence.lower().strip()
-        
-        # Wzorce dla różnych struktur zdaniowych
-        patterns = [
-            r"all (\w+) are (\w+)",  # All X are Y
-            r"every (\w+) is (\w+)",  # Every X is Y  
-            r"(\w+) is (\w+)",       # X is Y
-            r"(\w+) are (\w+)",      # X are Y
-            r"if (.+) then (.+)",    # If X then Y
-            r"if (.+), (.+)",        # If X, Y
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, sentence)
-            if match:
-                return match.group(1).strip(), match.group(2).strip()
-        
-        return None, None
+        return parse_subject_predicate(sentence)
     
     @staticmethod
     def is_implication(sentence: str) -> Tuple[bool, Optional[str], Optional[str]]:
         """Sprawdza czy zdanie to implikacja i wyciąga części"""
-        sentence = sentence.lower().strip()
-        
-        # Różne formy implikacji
-        if_then_patterns = [
-            r"if (.+) then (.+)",
-            r"if (.+), (.+)",
-            r"(.+) implies (.+)",
-            r"(.+) → (.+)",
-        ]
-        
-        for pattern in if_then_patterns:
-            match = re.search(pattern, sentence)
-            if match:
-                antecedent = match.group(1).strip().rstrip(',')
-                consequent = match.group(2).strip()
-                return True, antecedent, consequent
-        
-        return False, None, None
+        return parse_implication(sentence)
     
     @staticmethod
     def extract_keywords(sentence: str) -> List[str]:
         """Wyciąga kluczowe słowa z zdania"""
-        # Usuń znaki interpunkcyjne i rozdiel na słowa
-        words = re.findall(r'\w+', sentence.lower())
-        
-        # Usuń stop words
-        stop_words = {"is", "are", "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "if", "then", "all", "every"}
-        keywords = [word for word in words if word not in stop_words and len(word) > 2]
-        
-        return keywords
+        return list(parse_keywords(sentence))
 
 class ImprovedDeductiveReasoning:
     """Ulepszone rozumowanie dedukcyjne z lepszym parserem"""
@@ -165,19 +207,82 @@ class ImprovedInductiveReasoning:
         
         return None
 
+class KnowledgeIndex:
+    """
+    Indeks faktów bazy wiedzy dla abdukcji
+
+    Każdy fakt parsowany jest raz przy dodaniu do rekordu implikacji (słowa kluczowe
+    następnika, wyjaśnienie z poprzednika) albo zwykłego faktu. Odwrócony indeks
+    słowo kluczowe -> rekordy pozwala oceniać tylko fakty dzielące słowa z obserwacją.
+    """
+    
+    def __init__(self):
+        self.records: List[Tuple[bool, str]] = []  # (czy implikacja, poprzednik lub fakt) w kolejności dodania
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def add(self, fact: str):
+        """Dodaje fakt do indeksu"""
+        # Każdy fakt indeksowany jest raz - parsowanie z pominięciem cache LRU, by go nie wypłukiwać
+        is_impl, antecedent, consequent = parse_implication.__wrapped__(fact)
+        keywords = set(KEYWORD_PATTERN.findall((consequent if is_impl else fact).lower()))
+        keywords -= STOP_WORDS
+        
+        record_id = len(self.records)
+        self.records.append((is_impl, antecedent if is_impl else fact))
+        postings = self.postings
+        for keyword in keywords:
+            postings[keyword].append(record_id)
+    
+    def add_many(self, facts: List[str]):
+        """Dodaje wiele faktów do indeksu"""
+        for fact in facts:
+            self.add(fact)
+    
+    def best_explanation(self, observation_keywords: Set[str]) -> Tuple[Optional[str], float]:
+        """
+        Najlepsze wyjaśnienie dla słów kluczowych obserwacji: ocena jak w pełnym
+        przeszukiwaniu bazy, a przy równych wynikach wygrywa fakt dodany wcześniej
+        """
+        overlaps: Dict[int, int] = defaultdict(int)
+        for keyword in observation_keywords:
+            for record_id in self.postings.get(keyword, ()):
+                overlaps[record_id] += 1
+        
+        best_id, best_score = None, 0.0
+        for record_id, overlap in overlaps.items():
+            if self.records[record_id][0]:
+                score = overlap / len(observation_keywords)
+            else:
+                score = overlap / len(observation_keywords) * 0.6  # Niższy priorytet dla bezpośrednich faktów
+            if score > best_score or (score == best_score and record_id < best_id):
+                best_id, best_score = record_id, score
+        
+        if best_id is None:
+            return None, 0.0
+        is_impl, text = self.records[best_id]
+        return (f"Likely because: {text}" if is_impl else f"Related to: {text}"), best_score
+
 class ImprovedAbductiveReasoning:
     """Ulepszone rozumowanie abdukcyjne"""
     
     def __init__(self):
         self.hypotheses_created = 0
     
-    def generate_explanation(self, observation: str, knowledge: List[str]) -> Optional[Tuple[str, float]]:
-        """Generuje najlepsze wyjaśnienie obserwacji"""
+    def generate_explanation(self, observation: str, knowledge: List[str],
+                             index: Optional[KnowledgeIndex] = None) -> Optional[Tuple[str, float]]:
+        """Generuje najlepsze wyjaśnienie obserwacji (z indeksem: tylko fakty o wspólnych słowach)"""
         
         observation_keywords = set(SimpleLogicalParser.extract_keywords(observation))
         best_explanation = None
         best_score = 0.0
         
+        if index is not None:
+            best_explanation, best_score = index.best_explanation(observation_keywords)
+            knowledge = []
+        
         # Przeszukaj bazę wiedzy w poszukiwaniu wyjaśnień
         for fact in knowledge:
             # Sprawdź czy to implikacja, która może wyjaśnić obserwację
@@ -210,6 +315,86 @@ class ImprovedAbductiveReasoning:
         
         return None
 
+class _EdgeData(dict):
+    """Atrybuty krawędzi CausalGraph - każda zmiana podbija wersję grafu"""
+    __slots__ = ('graph',)
+    
+    def __init__(self, graph: 'CausalGraph', *args, **kwargs):
+        self.graph = graph
+        super().__init__(*args, **kwargs)
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.graph.version += 1
+    
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.graph.version += 1
+    
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.graph.version += 1
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.graph.version += 1
+        return super().setdefault(key, default)
+    
+    def pop(self, *args):
+        self.graph.version += 1
+        return super().pop(*args)
+    
+    def popitem(self):
+        self.graph.version += 1
+        return super().popitem()
+    
+    def clear(self):
+        super().clear()
+        self.graph.version += 1
+    
+    def __reduce__(self):
+        return _EdgeData, (self.graph, dict(self))
+
+class CausalGraph(nx.DiGraph):
+    """
+    Graf przyczynowy z licznikiem wersji
+
+    Wersja rośnie przy każdej zmianie krawędzi - dodaniu, usunięciu i zmianie
+    atrybutów (także bezpośrednio: graph[a][b]['weight'] = x) - więc tablica
+    najsilniejszych skutków wykrywa zmiany wprowadzone z pominięciem silnika.
+    """
+    
+    def __init__(self, incoming_graph_data=None, **attr):
+        self.version = 0
+        super().__init__(incoming_graph_data, **attr)
+    
+    def edge_attr_dict_factory(self) -> _EdgeData:
+        return _EdgeData(self)
+    
+    def remove_edge(self, u, v):
+        super().remove_edge(u, v)
+        self.version += 1
+    
+    def remove_edges_from(self, ebunch):
+        super().remove_edges_from(ebunch)
+        self.version += 1
+    
+    def remove_node(self, n):
+        super().remove_node(n)
+        self.version += 1
+    
+    def remove_nodes_from(self, nodes):
+        super().remove_nodes_from(nodes)
+        self.version += 1
+    
+    def clear_edges(self):
+        super().clear_edges()
+        self.version += 1
+    
+    def clear(self):
+        super().clear()
+        self.version += 1
+
 class EnhancedReasoningEngine:
     """Ulepsony silnik rozumowania"""
     
@@ -219,9 +404,17 @@ class EnhancedReasoningEngine:
         self.abductive = ImprovedAbductiveReasoning()
         
         self.knowledge_base = []
-        self.causal_graph = nx.DiGraph()
+        self.knowledge_facts = set()  # szybkie sprawdzanie duplikatów, kolejność trzyma knowledge_base
+        self.knowledge_index = KnowledgeIndex()
+        self._synced_base = self.knowledge_base  # lista i jej długość, które odzwierciedlają knowledge_facts/index
+        self._synced_length = 0
+        self.causal_graph = CausalGraph()
         self.reasoning_history = []
         
+        # Tablica najsilniejszych skutków: przyczyna -> (skutek, siła) albo None
+        self._causal_effects: Dict[str, Optional[Tuple[str, float]]] = {}
+        self._causal_graph_version = 0
+        
         # Dodaj podstawową wiedzę
         self._initialize_basic_knowledge()
         
@@ -239,8 +432,7 @@ class EnhancedReasoningEngine:
             "All mammals are warm-blooded"
         ]
         
-        for fact in basic_facts:
-            self.add_knowledge(fact)
+        self.add_knowledge_bulk(basic_facts)
         
         # Dodaj relacje przyczynowe
         causal_relations = [
@@ -252,13 +444,99 @@ class EnhancedReasoningEngine:
         ]
         
         for cause, effect, strength in causal_relations:
-            self.causal_graph.add_edge(cause, effect, weight=strength)
+            self.add_causal_relation(cause, effect, strength)
     
     def add_knowledge(self, fact: str):
         """Dodaje fakt do bazy wiedzy"""
-        if fact not in self.knowledge_base:
+        self._sync_knowledge_indexes()
+        if fact not in self.knowledge_facts:
             self.knowledge_base.append(fact)
-            logger.info(f"Dodano do bazy wiedzy: {fact}")
+            self.knowledge_facts.add(fact)
+            self.knowledge_index.add(fact)
+            self._synced_length = len(self.knowledge_base)
+            logger.debug(f"Dodano do bazy wiedzy: {fact}")
+    
+    def add_knowledge_bulk(self, facts: Iterable[str]) -> int:
+        """Dodaje wiele faktów naraz (deduplikacja w jednym przebiegu); zwraca liczbę nowych faktów"""
+        self._sync_knowledge_indexes()
+        new_facts = []
+        for fact in facts:
+            if fact not in self.knowledge_facts:
+                self.knowledge_facts.add(fact)
+                new_facts.append(fact)
+        
+        self.knowledge_base.extend(new_facts)
+        self.knowledge_index.add_many(new_facts)
+        self._synced_length = len(self.knowledge_base)
+        logger.info(f"Dodano do bazy wiedzy {len(new_facts)} faktów (rozmiar: {len(self.knowledge_base)})")
+        return len(new_facts)
+    
+    def _sync_knowledge_indexes(self):
+        """
+        Uzgadnia zbiór i indeks faktów z knowledge_base zmienioną z pominięciem add_knowledge
+
+        Porównywana jest długość listy (nie rozmiar zbioru, który przy duplikatach
+        jest mniejszy): fakty dopisane na końcu są doindeksowywane, a skrócona lub
+        podmieniona lista jest indeksowana od nowa.
+        """
+        knowledge_base = self.knowledge_base
+        length = len(knowledge_base)
+        if knowledge_base is self._synced_base and length == self._synced_length:
+            return
+        if knowledge_base is self._synced_base and length > self._synced_length:
+            appended = knowledge_base[self._synced_length:]
+            self.knowledge_facts.update(appended)
+            self.knowledge_index.add_many(appended)
+        else:
+            self.knowledge_facts = set(knowledge_base)
+            self.knowledge_index = KnowledgeIndex()
+            self.knowledge_index.add_many(knowledge_base)
+        self._synced_base = knowledge_base
+        self._synced_length = length
+    
+    def add_causal_relation(self, cause: str, effect: str, strength: float):
+        """Dodaje relację przyczynową i unieważnia wpis tablicy skutków przyczyny"""
+        self._causal_effects.pop(cause, None)
+        self.causal_graph.add_edge(cause, effect, weight=strength)
+        self._causal_graph_version = getattr(self.causal_graph, 'version', None)
+    
+    def precompute_causal_effects(self):
+        """Wypełnia tablicę najsilniejszych skutków dla wszystkich przyczyn"""
+        for cause in self.causal_graph.nodes:
+            self.strongest_effect(cause)
+    
+    def strongest_effect(self, cause: str) -> Optional[Tuple[str, float]]:
+        """
+        Najsilniejszy skutek przyczyny: (skutek, siła), wyniki trzymane są w tablicy
+
+        Siła łańcucha to iloczyn wag krawędzi z przedziału (0, 1], więc żaden
+        łańcuch nie jest silniejszy od swojej pierwszej krawędzi - najsilniejszy
+        skutek to zawsze najsilniejszy bezpośredni następnik.
+        """
+        version = getattr(self.causal_graph, 'version', None)
+        if version is None or version != self._causal_graph_version:
+            # Graf zmieniony z pominięciem add_causal_relation (albo podmieniony na graf bez wersji)
+            self._causal_effects.clear()
+            self._causal_graph_version = version
+        
+        if cause not in self._causal_effects:
+            self._causal_effects[cause] = self._compute_strongest_effect(cause)
+        return self._causal_effects[cause]
+    
+    def _compute_strongest_effect(self, cause: str) -> Optional[Tuple[str, float]]:
+        """Najsilniejszy bezpośredni następnik (przy remisie - pierwszy w kolejności następników)"""
+        graph = self.causal_graph
+        if cause not in graph:
+            return None
+        
+        effect, strength = None, 0.0
+        for successor, edge in graph[cause].items():
+            if successor == cause:
+                continue  # Przyczyna nie jest swoim własnym skutkiem (pętle)
+            weight = edge.get('weight', DEFAULT_CAUSAL_WEIGHT)
+            if effect is None or weight > strength:
+                effect, strength = successor, weight
+        return (effect, strength) if effect is not None else None
     
     def deductive_reasoning(self, premises: List[str]) -> Optional[Tuple[str, float, List[str]]]:
         """Rozumowanie dedukcyjne"""
@@ -305,7 +583,9 @@ class EnhancedReasoningEngine:
         """Rozumowanie abdukcyjne"""
         steps = ["Started abductive reasoning", f"Finding explanation for: '{observation}'"]
         
-        result = self.abductive.generate_explanation(observation, self.knowledge_base)
+        self._sync_knowledge_indexes()
+        
+        result = self.abductive.generate_explanation(observation, self.knowledge_base, self.knowledge_index)
         if result:
             explanation, confidence = result
             steps.append(f"Generated explanation: '{explanation}'")
@@ -314,24 +594,51 @@ class EnhancedReasoningEngine:
         return None
     
     def causal_reasoning(self, cause: str) -> Optional[Tuple[str, float, List[str]]]:
-        """Rozumowanie przyczynowe"""
+        """Rozumowanie przyczynowe (najsilniejszy skutek z tablicy skutków)"""
         steps = ["Started causal reasoning", f"Tracing effects of: '{cause}'"]
         
-        if cause in self.causal_graph:
-            # Znajdź bezpośrednie skutki
-            effects = list(self.causal_graph.successors(cause))
-            if effects:
-                strongest_effect = max(effects, 
-                    key=lambda e: self.causal_graph[cause][e].get('weight', 0))
-                strength = self.causal_graph[cause][strongest_effect].get('weight', 0.5)
-                
-                conclusion = f"If {cause}, then likely {strongest_effect}"
-                steps.append(f"Found causal link: {cause} → {strongest_effect} (strength: {strength})")
-                
-                return conclusion, strength, steps
+        result = self.strongest_effect(cause)
+        if result:
+            strongest_effect, strength = result
+            
+            conclusion = f"If {cause}, then likely {strongest_effect}"
+            steps.append(f"Found causal link: {cause} → {strongest_effect} (strength: {strength})")
+            
+            return conclusion, strength, steps
         
         return None
     
+    def multi_strategy_reasoning_batch(self, list_of_inputs: List[List[str]], n_workers: Optional[int] = None,
+                                       chunk_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rozumowanie wielostrategiczne dla wielu list wejściowych naraz
+
+        Słowa kluczowe zdań brane są ze wspólnego cache LRU parse_keywords. Przy
+        n_workers > 1 porcje wejść rozdzielane są na ProcessPoolExecutor (silnik trafia do
+        każdego procesu raz), a liczniki strategii z procesów są sumowane, więc wyniki
+        i statystyki są takie same jak przy kolejnych wywołaniach multi_strategy_reasoning.
+        """
+        if not n_workers or n_workers <= 1 or len(list_of_inputs) < 2:
+            results = [self.multi_strategy_reasoning(input_data) for input_data in list_of_inputs]
+            logger.info(f"Rozumowanie wsadowe: {len(results)} wejść")
+            return results
+        
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(list_of_inputs) // (n_workers * 4)))
+        chunks = [list_of_inputs[i:i + chunk_size] for i in range(0, len(list_of_inputs), chunk_size)]
+        
+        results = []
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_batch_worker,
+                                 initargs=(self,)) as executor:
+            for chunk_results, counters in executor.map(_reason_batch_chunk, chunks):
+                results.extend(chunk_results)
+                self.deductive.successful_inferences += counters[0]
+                self.inductive.patterns_found += counters[1]
+                self.abductive.hypotheses_created += counters[2]
+        
+        logger.info(f"Rozumowanie wsadowe: {len(results)} wejść w {len(chunks)} porcjach ({n_workers} procesów)")
+        return results
+    
     def multi_strategy_reasoning(self, input_data: List[str]) -> Dict[str, Any]:
         """Rozumowanie wielostrategiczne"""
         results = {}
@@ -371,8 +678,7 @@ class EnhancedReasoningEngine:
         
         # Przyczynowe (jeśli możemy wyciągnąć przyczyny)
         for item in input_data:
-            keywords = SimpleLogicalParser.extract_keywords(item)
-            for keyword in keywords:
+            for keyword in parse_keywords(item):
                 causal_result = self.causal_reasoning(keyword)
                 if causal_result:
                     conclusion, confidence, steps = causal_result
@@ -398,6 +704,23 @@ class EnhancedReasoningEngine:
             'reasoning_sessions': len(self.reasoning_history)
         }
 
+# Silnik procesu roboczego dla multi_strategy_reasoning_batch (ustawiany raz na proces)
+_batch_engine: Optional[EnhancedReasoningEngine] = None
+
+def _init_batch_worker(engine: EnhancedReasoningEngine):
+    global _batch_engine
+    _batch_engine = engine
+
+def _reason_batch_chunk(chunk: List[List[str]]) -> Tuple[List[Dict[str, Any]], Tuple[int, int, int]]:
+    """Przetwarza porcję wejść w procesie roboczym; zwraca wyniki i przyrosty liczników strategii"""
+    engine = _batch_engine
+    before = (engine.deductive.successful_inferences, engine.inductive.patterns_found,
+              engine.abductive.hypotheses_created)
+    results = engine.multi_strategy_reasoning_batch(chunk)
+    after = (engine.deductive.successful_inferences, engine.inductive.patterns_found,
+             engine.abductive.hypotheses_created)
+    return results, tuple(a - b for a, b in zip(after, before))
+
 def demonstrate_enhanced_reasoning():
     """Demonstracja ulepszonego modułu rozumowania"""
     print("=" * 70)
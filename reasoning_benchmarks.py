@@ -0,0 +1,155 @@
+"""
+⏱️ BENCHMARKI MODUŁU ROZUMOWANIA ABSTRAKCYJNEGO
+==============================================
+
+Syntetyczne obciążenia do pomiaru wydajności silników z abstract_reasoning_engine.py.
+
+Uruchomienie:
+    python reasoning_benchmarks.py            # skala domyślna (~10^5 ekspansji)
+    python reasoning_benchmarks.py --large    # skala ~10^6 ekspansji
+"""
+
+import argparse
+import logging
+import time
+from typing import Any, Dict, Tuple
+
+from abstract_reasoning_engine import (AbstractReasoningEngine, HierarchicalPlanning, LogicalStatement,
+                                       ProbabilisticReasoning, SymbolicKnowledgeBase)
+
+logger = logging.getLogger('ReasoningBenchmarks')
+
+def build_grid_domain(dimensions: int, size: int) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Buduje syntetyczną domenę "kratownicy": zmienne d0..dN przyjmują wartości 0..size-1,
+    akcje zwiększają lub zmniejszają jedną współrzędną o 1. Cel leży w przeciwległym
+    rogu, a heurystyka liczby niespełnionych faktów jest słaba, więc A* odwiedza
+    praktycznie całą przestrzeń size^dimensions stanów.
+    """
+    actions = {}
+    for d in range(dimensions):
+        var = f"d{d}"
+        for value in range(size - 1):
+            actions[f"inc_{var}_{value}"] = {
+                "preconditions": {var: value},
+                "effects": {var: value + 1},
+                "cost": 1
+            }
+            actions[f"dec_{var}_{value + 1}"] = {
+                "preconditions": {var: value + 1},
+                "effects": {var: value},
+                "cost": 1
+            }
+
+    start_state = {f"d{d}": 0 for d in range(dimensions)}
+    goal_state = {f"d{d}": size - 1 for d in range(dimensions)}
+    return start_state, goal_state, actions
+
+def benchmark_a_star_planning(dimensions: int = 3, size: int = 47,
+                              max_expansions: int = None, timeout: float = None) -> Dict[str, Any]:
+    """Mierzy przepustowość planera A* na domenie kratownicy"""
+    start_state, goal_state, actions = build_grid_domain(dimensions, size)
+    planner = HierarchicalPlanning(SymbolicKnowledgeBase())
+
+    started = time.perf_counter()
+    plan = planner.a_star_planning(start_state, goal_state, actions,
+                                   max_expansions=max_expansions, timeout=timeout)
+    elapsed = time.perf_counter() - started
+
+    stats = dict(planner.last_search_stats)
+    stats.update({
+        "domain": f"grid {dimensions}D x {size}",
+        "actions": len(actions),
+        "plan_length": len(plan) if plan else None,
+        "total_time": elapsed,
+        "expansions_per_second": stats["expansions"] / elapsed if elapsed > 0 else 0.0
+    })
+    return stats
+
+def benchmark_monte_carlo(num_samples: int = 10000000, n_workers: int = None) -> Dict[str, Any]:
+    """Mierzy czas wektorowej symulacji Monte Carlo na modelu z relacjami dwupoziomowymi"""
+    variables = {
+        "demand": {"distribution": "normal", "mean": 100.0, "std": 15.0},
+        "price": {"distribution": "uniform", "min": 8.0, "max": 12.0},
+        "promotion": {"distribution": "bernoulli", "p": 0.25},
+        "revenue": {"distribution": "normal", "mean": 0.0, "std": 1.0},
+        "profit": {"distribution": "normal", "mean": 0.0, "std": 1.0}
+    }
+    relationships = [
+        {"type": "linear", "target": "profit", "sources": ["revenue", "promotion"], "weights": [0.3, -50.0]},
+        {"type": "linear", "target": "revenue", "sources": ["demand", "price"], "weights": [10.0, 25.0]}
+    ]
+    engine = ProbabilisticReasoning(SymbolicKnowledgeBase())
+
+    started = time.perf_counter()
+    statistics = engine.monte_carlo_simulation(variables, relationships, num_samples,
+                                               seed=42, n_workers=n_workers)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "samples": num_samples,
+        "workers": n_workers or 1,
+        "total_time": elapsed,
+        "samples_per_second": num_samples / elapsed if elapsed > 0 else 0.0,
+        "profit_mean": statistics["profit"]["mean"]
+    }
+
+def benchmark_batch_deduction(num_pairs: int = 100000) -> Dict[str, Any]:
+    """Porównuje reason() w pętli z wsadowym reason_many() na parach przesłanek"""
+    premise_sets = []
+    for i in range(num_pairs):
+        if i % 2:
+            premise_sets.append([
+                LogicalStatement("major", "rain implies wet streets", confidence=0.9),
+                LogicalStatement("minor", f"there is rain in city {i % 100}", confidence=0.8)
+            ])
+        else:
+            premise_sets.append([
+                LogicalStatement("major", "All humans are mortal", confidence=0.95),
+                LogicalStatement("minor", f"person{i % 50} is humans", confidence=0.9)
+            ])
+
+    started = time.perf_counter()
+    engine = AbstractReasoningEngine()
+    for premises in premise_sets:
+        engine.reason(premises)
+    loop_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = AbstractReasoningEngine().reason_many(premise_sets)
+    batch_time = time.perf_counter() - started
+
+    return {
+        "pairs": num_pairs,
+        "successes": sum(1 for result in results if result.success),
+        "reason_loop_time": loop_time,
+        "reason_many_time": batch_time,
+        "speedup": loop_time / batch_time if batch_time > 0 else 0.0
+    }
+
+def print_results(name: str, results: Dict[str, Any]):
+    """Wypisuje wyniki benchmarku"""
+    print(f"\n{name}")
+    print("-" * 50)
+    for key, value in results.items():
+        if isinstance(value, float):
+            print(f"   {key}: {value:,.3f}")
+        else:
+            print(f"   {key}: {value}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarki modułu rozumowania abstrakcyjnego")
+    parser.add_argument("--large", action="store_true", help="skala ~10^6 ekspansji")
+    args = parser.parse_args()
+
+    logging.getLogger('AbstractReasoning').setLevel(logging.WARNING)
+
+    print("=" * 70)
+    print("⏱️ BENCHMARKI MODUŁU ROZUMOWANIA ABSTRAKCYJNEGO")
+    print("=" * 70)
+
+    size = 100 if args.large else 47
+    print_results("1. 🎯 PLANOWANIE A* (domena kratownicy)",
+                  benchmark_a_star_planning(dimensions=3, size=size))
+    print_results("2. 🎲 MONTE CARLO (10^7 próbek)", benchmark_monte_carlo())
+    print_results("3. 📦 DEDUKCJA WSADOWA (10^5 par przesłanek)", benchmark_batch_deduction())
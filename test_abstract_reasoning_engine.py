@@ -0,0 +1,193 @@
+"""
+🧪 TESTY ZACHOWANIA MODUŁU ROZUMOWANIA ABSTRAKCYJNEGO
+====================================================
+
+Uruchomienie:
+    python -m pytest -q test_abstract_reasoning_engine.py
+"""
+
+import logging
+
+import numpy as np
+import pytest
+
+from abstract_reasoning_engine import (HierarchicalPlanning, HTNDomain, MonteCarloAccumulator,
+                                       ProbabilisticReasoning, SymbolicKnowledgeBase)
+
+logging.getLogger('AbstractReasoning').setLevel(logging.WARNING)
+
+# ----------------------------------------------------------------------------
+# HTN: wspólny cache podplanów (user-028)
+# ----------------------------------------------------------------------------
+
+def make_htn_actions():
+    return {
+        "build_house": {"subtasks": ["foundation", "walls", "roof"]},
+        "walls": {"subtasks": ["frame", "bricks"]},
+        "roof": {"subtasks": ["frame", "tiles"]}
+    }
+
+@pytest.fixture
+def planner():
+    return HierarchicalPlanning(SymbolicKnowledgeBase())
+
+def test_htn_plain_dict_cache_survives_between_calls(planner):
+    actions = make_htn_actions()
+    first = planner.hierarchical_task_network("build_house", actions)
+    decompositions = planner.hierarchical_decompositions
+
+    assert planner.hierarchical_task_network("build_house", actions) == first
+    assert planner.hierarchical_decompositions == decompositions
+
+def test_htn_plain_dict_in_place_edit_invalidates_cache(planner):
+    actions = make_htn_actions()
+    planner.hierarchical_task_network("build_house", actions)
+
+    actions["walls"]["subtasks"].append("plaster")
+
+    assert planner.hierarchical_task_network("build_house", actions) == [
+        "foundation", "frame", "bricks", "plaster", "frame", "tiles"]
+
+@pytest.mark.parametrize("mutate", [
+    lambda domain: domain["walls"].__setitem__("subtasks", ["plaster"]),
+    lambda domain: domain["walls"].update(subtasks=["plaster"]),
+    lambda domain: domain.__ior__({"walls": {"subtasks": ["plaster"]}}),
+    lambda domain: domain.__setitem__("walls", {"subtasks": ["plaster"]})
+])
+def test_htn_domain_mutations_bump_version_and_invalidate_cache(planner, mutate):
+    domain = HTNDomain(make_htn_actions())
+    planner.hierarchical_task_network("build_house", domain)
+    version = domain.version
+
+    mutate(domain)
+
+    assert domain.version > version
+    assert planner.hierarchical_task_network("build_house", domain) == [
+        "foundation", "plaster", "frame", "tiles"]
+
+def test_htn_domain_subtasks_cannot_change_in_place():
+    domain = HTNDomain(make_htn_actions())
+    with pytest.raises(AttributeError):
+        domain["walls"]["subtasks"].append("plaster")
+
+def test_htn_domain_copy_is_independent():
+    domain = HTNDomain(make_htn_actions())
+    copied = domain.copy()
+
+    copied["walls"]["subtasks"] = ["plaster"]
+
+    assert isinstance(copied, HTNDomain)
+    assert domain["walls"]["subtasks"] == ("frame", "bricks")
+
+def test_htn_iterative_matches_recursive(planner):
+    actions = make_htn_actions()
+    recursive = planner.hierarchical_task_network("build_house", actions, max_depth=2)
+    planner.invalidate_htn_cache()
+
+    assert planner.hierarchical_task_network("build_house", actions, max_depth=2, iterative=True) == recursive
+
+def test_htn_iterative_handles_networks_deeper_than_recursion_limit(planner):
+    depth = 5000
+    actions = {f"task{i}": {"subtasks": [f"task{i + 1}"]} for i in range(depth)}
+
+    plan = planner.hierarchical_task_network("task0", actions, max_depth=depth + 1, iterative=True)
+
+    assert plan == [f"task{depth}"]
+
+# ----------------------------------------------------------------------------
+# Monte Carlo: łączenie statystyk algorytmem Chana (user-029)
+# ----------------------------------------------------------------------------
+
+def test_chan_merge_matches_single_pass_statistics():
+    rng = np.random.default_rng(7)
+    values = rng.normal(1e6, 3.0, 100003)  # duża średnia, mała wariancja - wrażliwe numerycznie
+
+    merged = MonteCarloAccumulator()
+    for part in np.array_split(values, 7):
+        worker = MonteCarloAccumulator()
+        for chunk in np.array_split(part, 3):
+            worker.update({"x": chunk})
+        merged.merge(worker)
+
+    statistics = merged.statistics()["x"]
+    assert merged.count["x"] == values.size
+    assert statistics["mean"] == pytest.approx(values.mean(), rel=1e-12)
+    assert statistics["std"] == pytest.approx(values.std(), rel=1e-9)
+    assert statistics["median"] == pytest.approx(np.median(values))
+
+def test_monte_carlo_is_reproducible_and_rejects_empty_runs():
+    engine = ProbabilisticReasoning(SymbolicKnowledgeBase())
+    variables = {"a": {"distribution": "normal", "mean": 2.0, "std": 1.0},
+                 "b": {"distribution": "uniform", "min": 0.0, "max": 1.0}}
+    relationships = [{"type": "linear", "sources": ["a", "b"], "weights": [0.5, 2.0], "target": "c"}]
+
+    first = engine.monte_carlo_simulation(variables, relationships, num_samples=20000, seed=3, chunk_size=4096)
+    second = engine.monte_carlo_simulation(variables, relationships, num_samples=20000, seed=3, chunk_size=4096)
+
+    assert first == second
+    assert first["c"]["mean"] == pytest.approx(0.5 * 2.0 + 2.0 * 0.5, abs=0.05)
+    with pytest.raises(ValueError):
+        engine.monte_carlo_simulation(variables, relationships, num_samples=0)
+
+# ----------------------------------------------------------------------------
+# Propagacja niepewności w kolejności topologicznej (user-030)
+# ----------------------------------------------------------------------------
+
+UNCERTAINTY_DEPENDENCIES = {
+    "risk": ["exposure", "severity"],  # poziom 2 - podany przed swoimi rodzicami
+    "exposure": ["traffic", "weather"],
+    "severity": ["speed"]
+}
+
+def reference_propagation(beliefs, dependencies):
+    """Przeliczanie do skutku, zmienna po zmiennej: średnia średnich, suma wariancji rodziców"""
+    beliefs = dict(beliefs)
+    pending = dict(dependencies)
+    while pending:
+        ready = [var for var, parents in pending.items() if all(parent in beliefs for parent in parents)]
+        assert ready
+        for var in ready:
+            parents = pending.pop(var)
+            mean = sum(beliefs[parent][0] for parent in parents) / len(parents)
+            std = sum(beliefs[parent][1] ** 2 for parent in parents) ** 0.5
+            beliefs[var] = (mean, std)
+    return beliefs
+
+@pytest.fixture
+def probabilistic():
+    return ProbabilisticReasoning(SymbolicKnowledgeBase())
+
+def test_uncertainty_propagation_resolves_multi_level_networks_in_one_call(probabilistic):
+    beliefs = {"traffic": (0.6, 0.1), "weather": (0.2, 0.3), "speed": (0.9, 0.2)}
+
+    updated = probabilistic.uncertainty_propagation(beliefs, UNCERTAINTY_DEPENDENCIES)
+
+    expected = reference_propagation(beliefs, UNCERTAINTY_DEPENDENCIES)
+    assert set(updated) == set(expected)
+    for var, (mean, std) in expected.items():
+        assert updated[var] == pytest.approx((mean, std))
+
+def test_uncertainty_batch_matches_single_scenarios(probabilistic):
+    variables = ["traffic", "weather", "speed"]
+    rng = np.random.default_rng(11)
+    means = rng.random((64, 3))
+    stds = rng.random((64, 3))
+
+    names, batch_means, batch_stds = probabilistic.propagate_uncertainty_batch(
+        variables, means, stds, UNCERTAINTY_DEPENDENCIES)
+
+    for row in (0, 31, 63):
+        beliefs = {var: (means[row, i], stds[row, i]) for i, var in enumerate(variables)}
+        expected = reference_propagation(beliefs, UNCERTAINTY_DEPENDENCIES)
+        for column, var in enumerate(names):
+            assert (batch_means[row, column], batch_stds[row, column]) == pytest.approx(expected[var])
+
+def test_uncertainty_network_is_compiled_once_per_shape(probabilistic):
+    variables = ["traffic", "weather", "speed"]
+    first = probabilistic._get_propagation_network(UNCERTAINTY_DEPENDENCIES, variables)
+
+    assert probabilistic._get_propagation_network(dict(UNCERTAINTY_DEPENDENCIES), list(variables)) is first
+
+def test_uncertainty_propagation_rejects_cycles(probabilistic):
+    with pytest.raises(ValueError):
+        probabilistic.uncertainty_propagation({"a": (0.5, 0.1)}, {"b": ["c"], "c": ["b"]})
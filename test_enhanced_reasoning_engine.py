@@ -0,0 +1,87 @@
+"""
+🧪 TESTY ZACHOWANIA ULEPSZONEGO MODUŁU ROZUMOWANIA
+=================================================
+
+Uruchomienie:
+    python -m pytest -q test_enhanced_reasoning_engine.py
+"""
+
+import logging
+import pickle
+
+import pytest
+
+from enhanced_reasoning_engine import DEFAULT_CAUSAL_WEIGHT, CausalGraph, EnhancedReasoningEngine
+
+logging.getLogger('ImprovedReasoning').setLevel(logging.WARNING)
+
+# ----------------------------------------------------------------------------
+# Graf przyczynowy z wersją i tablica najsilniejszych skutków (user-041)
+# ----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("mutate", [
+    lambda graph: graph.add_edge("a", "c", weight=0.1),
+    lambda graph: graph["a"]["b"].__setitem__("weight", 0.2),
+    lambda graph: graph["a"]["b"].update(weight=0.2),
+    lambda graph: graph["a"]["b"].pop("weight"),
+    lambda graph: graph.remove_edge("a", "b"),
+    lambda graph: graph.remove_node("b"),
+    lambda graph: graph.clear_edges(),
+    lambda graph: graph.clear()
+])
+def test_causal_graph_mutations_bump_version(mutate):
+    graph = CausalGraph()
+    graph.add_edge("a", "b", weight=0.9)
+    version = graph.version
+
+    mutate(graph)
+
+    assert graph.version > version
+
+def test_causal_graph_pickles_with_versioned_edge_data():
+    graph = CausalGraph()
+    graph.add_edge("a", "b", weight=0.9)
+
+    restored = pickle.loads(pickle.dumps(graph))
+    version = restored.version
+    restored["a"]["b"]["weight"] = 0.1
+
+    assert restored.version > version
+    assert graph["a"]["b"]["weight"] == 0.9
+
+@pytest.fixture
+def engine():
+    return EnhancedReasoningEngine()
+
+def test_strongest_effect_is_the_strongest_direct_successor(engine):
+    engine.add_causal_relation("storm", "wind", 0.4)
+    engine.add_causal_relation("storm", "flood", 0.7)
+    engine.add_causal_relation("flood", "damage", 1.0)
+
+    assert engine.strongest_effect("storm") == ("flood", 0.7)
+
+def test_strongest_effect_sees_direct_graph_edits(engine):
+    assert engine.strongest_effect("rain") == ("wet_streets", 0.9)
+
+    engine.causal_graph["rain"]["wet_streets"]["weight"] = 0.2
+    engine.causal_graph.add_edge("rain", "puddles", weight=0.5)
+
+    assert engine.strongest_effect("rain") == ("puddles", 0.5)
+
+def test_cause_is_never_its_own_effect(engine):
+    engine.causal_graph.add_edge("rain", "rain", weight=1.0)
+
+    assert engine.strongest_effect("rain") == ("wet_streets", 0.9)
+
+def test_missing_weight_uses_the_default_for_choice_and_strength(engine):
+    engine.causal_graph.add_edge("noise", "stress")
+    engine.causal_graph.add_edge("noise", "headache", weight=DEFAULT_CAUSAL_WEIGHT - 0.1)
+
+    assert engine.strongest_effect("noise") == ("stress", DEFAULT_CAUSAL_WEIGHT)
+    conclusion, strength, _ = engine.causal_reasoning("noise")
+    assert conclusion == "If noise, then likely stress"
+    assert strength == DEFAULT_CAUSAL_WEIGHT
+
+def test_unknown_cause_has_no_effect(engine):
+    assert engine.strongest_effect("unknown") is None
+    assert engine.causal_reasoning("unknown") is None